@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 import sys
 import os
 
@@ -7,9 +7,18 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from app.core.test_case_generator import TestCaseGenerator
 from app.core.test_executor import TestExecutor
+from app.core.load_generator import LoadGenerator
 from app.core.report_generator import ReportGenerator
+from app.core.run_statistics import RunStatistics
+from app.core.config import config
 from app.core.enhanced_doc_parser import EnhancedDocParser
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.spec_diff import SpecDiff
+from app.core.batch_importer import BatchImporter
 from app.core.test_case_manager import TestCaseManager
+from app.core.test_case_store import TestCaseStore
+from app.core.test_case_journal import TestCaseJournal
+from app.utils.common_utils import get_file_extension
 import json
 import threading
 import time
@@ -28,6 +37,11 @@ class ApiServer:
         # 注册路由
         self._register_routes()
     
+    @staticmethod
+    def _endpoint_filters(data: dict) -> dict:
+        """从请求参数中提取接口筛选条件"""
+        return {key: data[key] for key in ('method', 'path', 'tag', 'prefix') if data.get(key)}
+    
     def _register_routes(self):
         """注册API路由"""
         # 健康检查
@@ -44,13 +58,15 @@ class ApiServer:
                     return jsonify({"error": "缺少必要参数: file_path"}), 400
                 
                 file_path = data['file_path']
-                doc = EnhancedDocParser.parse_doc(file_path)
-                endpoints = EnhancedDocParser.extract_endpoints(doc)
+                # 可选筛选条件：method、path、tag、prefix（如 /orders/*）
+                catalog = EnhancedDocParser.load_catalog(file_path)
+                endpoints = list(catalog.query(**self._endpoint_filters(data)))
                 
                 return jsonify({
                     "success": True,
-                    "message": f"成功解析文档，共发现 {len(endpoints)} 个接口",
-                    "data": endpoints
+                    "message": f"成功解析文档，共发现 {len(catalog)} 个接口，符合条件 {len(endpoints)} 个",
+                    "data": endpoints,
+                    "tags": catalog.tags()
                 })
             except Exception as e:
                 logger.error(f"解析文档失败: {str(e)}")
@@ -61,10 +77,20 @@ class ApiServer:
         def generate_test_cases():
             try:
                 data = request.json
-                if not data or 'endpoints' not in data:
-                    return jsonify({"error": "缺少必要参数: endpoints"}), 400
+                if not data or ('endpoints' not in data and 'file_path' not in data):
+                    return jsonify({"error": "缺少必要参数: endpoints 或 file_path"}), 400
                 
-                endpoints = data['endpoints']
+                if 'endpoints' in data:
+                    endpoints = data['endpoints']
+                elif data.get('stream'):
+                    # 流式读取超大JSON文档，边读取边生成，不在内存中保留整个文档
+                    filters = self._endpoint_filters(data)
+                    endpoints = (endpoint for endpoint in EnhancedDocParser.stream_endpoints(data['file_path'])
+                                 if EndpointCatalog.matches(endpoint, **filters))
+                else:
+                    # 直接从文档中按条件选取接口，只构建选中的接口
+                    catalog = EnhancedDocParser.load_catalog(data['file_path'])
+                    endpoints = catalog.query(**self._endpoint_filters(data))
                 test_cases = TestCaseGenerator.generate_test_cases(endpoints)
                 
                 return jsonify({
@@ -76,29 +102,128 @@ class ApiServer:
                 logger.error(f"生成测试用例失败: {str(e)}")
                 return jsonify({"success": False, "error": str(e)}), 500
         
+        # 批量导入多个文档
+        @self.app.route('/api/batch-import', methods=['POST'])
+        def batch_import():
+            try:
+                data = request.json
+                if not data or not data.get('sources'):
+                    return jsonify({"error": "缺少必要参数: sources"}), 400
+                
+                # sources 为文档路径/URL列表，或 服务名 -> 文档路径 的字典
+                result = BatchImporter.import_documents(data['sources'])
+                endpoints = list(result.query(service=data.get('service'), **self._endpoint_filters(data)))
+                
+                return jsonify({
+                    "success": True,
+                    "message": f"成功导入 {len(result.catalogs)} 个文档，失败 {len(result.errors)} 个，共 {len(result)} 个接口，耗时 {result.elapsed:.2f}s",
+                    "data": endpoints,
+                    "services": result.services(),
+                    "documents": result.documents,
+                    "errors": result.errors
+                })
+            except Exception as e:
+                logger.error(f"批量导入文档失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
+        
+        # 按新版本文档增量更新测试用例
+        @self.app.route('/api/update-test-cases', methods=['POST'])
+        def update_test_cases():
+            try:
+                data = request.json
+                if not data or 'file_path' not in data or 'test_cases' not in data:
+                    return jsonify({"error": "缺少必要参数: file_path, test_cases"}), 400
+                
+                catalog = EnhancedDocParser.load_catalog(data['file_path'])
+                test_cases, report = SpecDiff.update_test_cases(data['test_cases'], catalog)
+                
+                return jsonify({
+                    "success": True,
+                    "message": f"新增接口 {len(report['added'])} 个，变化 {len(report['changed'])} 个，删除 {len(report['removed'])} 个",
+                    "data": test_cases,
+                    "report": report
+                })
+            except Exception as e:
+                logger.error(f"增量更新测试用例失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
+        
         # 执行测试
         @self.app.route('/api/execute-tests', methods=['POST'])
         def execute_tests():
             try:
                 data = request.json
-                if not data or 'test_cases' not in data or 'base_url' not in data:
-                    return jsonify({"error": "缺少必要参数: test_cases, base_url"}), 400
+                if not data or ('test_cases' not in data and 'file_path' not in data) or 'base_url' not in data:
+                    return jsonify({"error": "缺少必要参数: test_cases 或 file_path, base_url"}), 400
                 
-                test_cases = data['test_cases']
+                if 'test_cases' in data:
+                    test_cases = data['test_cases']
+                else:
+                    # 从文件逐个读取用例（.jsonl逐行读取，读到第一个用例即开始执行）
+                    test_cases = TestCaseManager.iter_test_cases(data['file_path'])
                 base_url = data['base_url']
+                # 可选：结果逐个追加写入的JSON Lines文件
+                results_path = data.get('results_path')
                 
                 executor = TestExecutor(base_url)
-                results = executor.execute_test_cases(test_cases)
+                
+                def iter_results():
+                    if not results_path:
+                        yield from executor.iter_test_cases(test_cases)
+                        return
+                    with open(results_path, 'a', encoding='utf-8') as f:
+                        for result in executor.iter_test_cases(test_cases):
+                            ReportGenerator.write_jsonl_results([result], f)
+                            yield result
+                
+                # 流式返回：每完成一个用例输出一行JSON（NDJSON），不在内存中累积全部结果
+                if data.get('stream'):
+                    def generate():
+                        for result in iter_results():
+                            yield json.dumps(result, ensure_ascii=False) + '\n'
+                    return Response(generate(), mimetype='application/x-ndjson')
+                
+                results = []
+                statistics = RunStatistics()
+                for result in iter_results():
+                    results.append(result)
+                    statistics.add(result)
                 
                 return jsonify({
                     "success": True,
                     "message": f"测试执行完成，共执行 {len(results)} 个用例",
-                    "data": results
+                    "data": results,
+                    "statistics": statistics.to_dict(),
+                    "summary": dict(statistics.summary(), latency=statistics.latency_summary()['overall'])
                 })
             except Exception as e:
                 logger.error(f"执行测试失败: {str(e)}")
                 return jsonify({"success": False, "error": str(e)}), 500
         
+        # 压测
+        @self.app.route('/api/load-test', methods=['POST'])
+        def load_test():
+            try:
+                data = request.json
+                if not data or 'test_cases' not in data or 'base_url' not in data:
+                    return jsonify({"error": "缺少必要参数: test_cases, base_url"}), 400
+                
+                generator = LoadGenerator(
+                    data['base_url'],
+                    target_rps=data.get('rps'),
+                    duration=data.get('duration'),
+                    seed=data.get('seed')
+                )
+                summary = generator.run(data['test_cases'], data.get('weights'))
+                
+                return jsonify({
+                    "success": True,
+                    "message": f"压测完成，实际吞吐 {summary['achieved_rps']:.2f} RPS",
+                    "data": summary
+                })
+            except Exception as e:
+                logger.error(f"压测失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
+        
         # 生成测试报告
         @self.app.route('/api/generate-report', methods=['POST'])
         def generate_report():
@@ -109,11 +234,34 @@ class ApiServer:
                 
                 results = data['results']
                 format_type = data['format']
+                # 可选：分片执行时由调用方合并好的统计
+                statistics = RunStatistics.from_dict(data['statistics']) if data.get('statistics') else None
+                
+                # 可选：是否生成离线报告，默认读取 REPORT_OFFLINE_ASSETS
+                offline = data.get('offline')
                 
                 if format_type == 'html':
-                    report = ReportGenerator.generate_html_report(results)
+                    report = ReportGenerator.generate_html_report(results, statistics, offline)
                 elif format_type == 'json':
-                    report = ReportGenerator.generate_json_report(results)
+                    report = ReportGenerator.generate_json_report(results, statistics)
+                elif format_type == 'jsonl':
+                    # 结果逐行写入文件，返回文件路径
+                    output_path = data.get('output_path') or os.path.join(config.get('REPORT_DIR', 'reports'), 'results.jsonl')
+                    dir_path = os.path.dirname(output_path)
+                    if dir_path:
+                        os.makedirs(dir_path, exist_ok=True)
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        ReportGenerator.write_jsonl_results(results, f)
+                    report = output_path
+                elif format_type == 'binary':
+                    # 紧凑二进制报告写入文件（压缩方式由扩展名决定），返回文件路径
+                    output_path = data.get('output_path') or os.path.join(config.get('REPORT_DIR', 'reports'), 'report.pack.gz')
+                    ReportGenerator.write_binary_report(results, output_path, statistics)
+                    report = output_path
+                elif format_type == 'paged':
+                    # 分页报告写入目录，返回index.html路径
+                    output_dir = data.get('output_dir') or config.get('REPORT_DIR', 'reports')
+                    report = ReportGenerator.write_paged_html_report(results, output_dir, statistics, offline=offline)
                 else:
                     return jsonify({"error": "不支持的报告格式: " + format_type}), 400
                 
@@ -126,6 +274,28 @@ class ApiServer:
                 logger.error(f"生成报告失败: {str(e)}")
                 return jsonify({"success": False, "error": str(e)}), 500
         
+        # 合并多个分片的运行统计
+        @self.app.route('/api/merge-statistics', methods=['POST'])
+        def merge_statistics():
+            try:
+                data = request.json
+                if not data or 'statistics' not in data:
+                    return jsonify({"error": "缺少必要参数: statistics"}), 400
+                
+                merged = RunStatistics()
+                for item in data['statistics']:
+                    merged.merge(RunStatistics.from_dict(item))
+                
+                return jsonify({
+                    "success": True,
+                    "message": f"成功合并 {len(data['statistics'])} 份统计",
+                    "data": merged.to_dict(),
+                    "summary": dict(merged.summary(), latency=merged.latency_summary())
+                })
+            except Exception as e:
+                logger.error(f"合并统计失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
+        
         # 导入测试用例
         @self.app.route('/api/import-test-cases', methods=['POST'])
         def import_test_cases():
@@ -168,6 +338,66 @@ class ApiServer:
             except Exception as e:
                 logger.error(f"导出测试用例失败: {str(e)}")
                 return jsonify({"success": False, "error": str(e)}), 500
+        
+        # 按条件查询用例库（SQLite）中的测试用例
+        @self.app.route('/api/query-test-cases', methods=['POST'])
+        def query_test_cases():
+            try:
+                data = request.json
+                if not data or 'file_path' not in data:
+                    return jsonify({"error": "缺少必要参数: file_path"}), 400
+                
+                # 可选筛选条件：method、path、tag、prefix（如 /orders/*）
+                with TestCaseStore(data['file_path']) as store:
+                    test_cases = list(store.query(**self._endpoint_filters(data)))
+                    total = len(store)
+                
+                return jsonify({
+                    "success": True,
+                    "message": f"用例库共 {total} 个测试用例，符合条件 {len(test_cases)} 个",
+                    "data": test_cases
+                })
+            except Exception as e:
+                logger.error(f"查询测试用例失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
+        
+        # 添加、修改或删除单个测试用例：用例库（SQLite）只写入该用例，其他格式追加到预写日志
+        @self.app.route('/api/edit-test-case', methods=['POST'])
+        def edit_test_case():
+            try:
+                data = request.json
+                if not data or 'file_path' not in data or 'action' not in data:
+                    return jsonify({"error": "缺少必要参数: file_path, action"}), 400
+                
+                action = data['action']
+                if action not in ('add', 'update', 'delete'):
+                    return jsonify({"error": f"不支持的操作: {action}，应为 add、update 或 delete"}), 400
+                
+                file_path = data['file_path']
+                found = True
+                if get_file_extension(file_path) in TestCaseManager.STORE_EXTENSIONS:
+                    with TestCaseStore(file_path) as store:
+                        if action == 'add':
+                            store.add(data['test_case'])
+                        elif action == 'update':
+                            found = store.update(data.get('id') or data['test_case']['id'], data['test_case'])
+                        else:
+                            found = store.delete(data['id'])
+                else:
+                    journal = TestCaseJournal(file_path)
+                    if action == 'add':
+                        journal.add(data['test_case'])
+                    elif action == 'update':
+                        found = journal.update(data.get('id') or data['test_case']['id'], data['test_case'])
+                    else:
+                        found = journal.delete(data['id'])
+                
+                if not found:
+                    return jsonify({"success": False, "error": "测试用例不存在"}), 404
+                return jsonify({"success": True, "message": "测试用例已保存"})
+            except Exception as e:
+                logger.error(f"编辑测试用例失败: {str(e)}")
+                return jsonify({"success": False, "error": str(e)}), 500
     
     def start(self):
         """启动API服务器"""
@@ -205,4 +435,4 @@ class ApiServer:
         return self.is_running and self.server_thread and self.server_thread.is_alive()
 
 # 全局API服务器实例
-api_server = ApiServer()
\ No newline at end of file
+api_server = ApiServer()
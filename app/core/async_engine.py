@@ -0,0 +1,219 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Callable, Awaitable
+from app.core.config import config
+from app.core.body_spool import BodySpool
+from app.core.exceptions import create_error
+from app.utils.logger import logger
+
+class AsyncEngine:
+    """基于asyncio的测试执行引擎，在单个事件循环内维持大量并发请求"""
+    
+    def __init__(self, executor, max_in_flight: Optional[int] = None):
+        """
+        初始化异步执行引擎
+        
+        Args:
+            executor: TestExecutor实例，复用其请求构建、结果格式、超时与重试配置
+            max_in_flight: 最大并发请求数，默认读取 ASYNC_MAX_IN_FLIGHT
+        """
+        self.executor = executor
+        self.max_in_flight = max_in_flight or config.get('ASYNC_MAX_IN_FLIGHT', 1000)
+        self.logger = logger
+    
+    @staticmethod
+    def _import_aiohttp():
+        """导入aiohttp（可选依赖）"""
+        try:
+            import aiohttp
+            return aiohttp
+        except ImportError:
+            error = create_error('TEST_EXECUTION_FAILED', '异步执行引擎需要安装aiohttp: pip install aiohttp')
+            raise error
+    
+    async def execute_test_case(self, session, test_case: Dict[str, Any], template=None) -> Dict[str, Any]:
+        """
+        执行单个测试用例（重试与超时行为与TestExecutor.execute_test_case一致）
+        
+        Args:
+            session: aiohttp.ClientSession
+            test_case: 测试用例
+            template: 已编译的请求模板（RequestTemplate），为空时编译一次，重试时复用
+        
+        Returns:
+            Dict[str, Any]: 测试结果
+        """
+        executor = self.executor
+        retry_count = executor.retry_count
+        test_case_id = test_case.get('id', 'unknown')
+        
+        self.logger.info(f"开始执行测试用例: {test_case_id} - {test_case.get('name')}")
+        
+        while retry_count >= 0:
+            try:
+                if template is None:
+                    template = executor.compile_request(test_case)
+                
+                self.logger.debug(f"请求URL: {template.method} {template.url}")
+                
+                # 发送请求，响应时间与requests一致：从发送到收到响应头
+                start = time.perf_counter()
+                async with session.request(template.method, template.url, **template.kwargs()) as response:
+                    response_time = time.perf_counter() - start
+                    # 响应体以流的方式读取，超过上限时转存到磁盘
+                    writer = executor.body_spool.writer()
+                    try:
+                        async for chunk in response.content.iter_chunked(BodySpool.CHUNK_SIZE):
+                            writer.write(chunk)
+                    except BaseException:
+                        writer.abort()
+                        raise
+                    body, response_text, body_info = executor.finish_body(writer, response.charset)
+                
+                response_json = {}
+                if body is not None:
+                    response_text = body.decode(response.charset or 'utf-8', errors='replace')
+                    try:
+                        response_json = json.loads(response_text)
+                    except:
+                        pass
+                
+                result = executor.build_result(test_case, response.status, response_time,
+                                               response_text, response_json, executor.retry_count - retry_count, body_info)
+                
+                self.logger.info(f"测试用例执行完成: {test_case_id} - 状态码: {result['status_code']} - 耗时: {result['response_time']:.3f}s - 结果: {'成功' if result['success'] else '失败'}")
+                
+                return result
+            
+            except Exception as e:
+                error_message = str(e) or e.__class__.__name__
+                self.logger.warning(f"测试用例执行失败 (重试 {executor.retry_count - retry_count}/{executor.retry_count}): {test_case_id} - {error_message}")
+                retry_count -= 1
+                if retry_count < 0:
+                    self.logger.error(f"测试用例执行最终失败: {test_case_id} - {error_message}")
+                    return executor.build_error_result(error_message, executor.retry_count)
+        
+        # 理论上不会执行到这里
+        self.logger.error(f"测试用例执行异常: {test_case_id} - Unknown error")
+        return executor.build_error_result('Unknown error', executor.retry_count)
+    
+    async def _run(self, test_cases: Iterable[Dict[str, Any]], emit: Callable[[Dict[str, Any]], Awaitable[None]],
+                   stop: Optional[threading.Event] = None):
+        """
+        以固定数量的协程消费测试用例，限制同时在途的请求数
+        
+        Args:
+            test_cases: 测试用例（可以是惰性迭代器）
+            emit: 每得到一个结果时调用的协程函数
+            stop: 停止信号，置位后不再取新的用例
+        """
+        aiohttp = self._import_aiohttp()
+        total = len(test_cases) if hasattr(test_cases, '__len__') else None
+        pending: Iterator[Dict[str, Any]] = iter(test_cases)
+        completed = 0
+        
+        # requests的timeout为连接/读取超时，这里保持相同语义
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.executor.timeout, sock_read=self.executor.timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=0)
+        
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            async def worker():
+                nonlocal completed
+                for test_case in pending:
+                    try:
+                        result = await self.execute_test_case(session, test_case)
+                    except Exception as e:
+                        self.logger.error(f"测试用例执行异常: {test_case.get('id', 'unknown')} - {str(e)}")
+                        result = self.executor.build_error_result(str(e), 0)
+                    result['test_case'] = test_case
+                    
+                    # 记录进度
+                    completed += 1
+                    if completed % 10 == 0 or completed == total:
+                        self.logger.info(f"测试执行进度: {completed}/{total if total is not None else '?'}")
+                    
+                    await emit(result)
+                    if stop is not None and stop.is_set():
+                        break
+            
+            workers = min(self.max_in_flight, total) if total is not None else self.max_in_flight
+            await asyncio.gather(*(worker() for _ in range(workers or 1)))
+    
+    def execute_test_cases(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        执行多个测试用例
+        
+        Args:
+            test_cases: 测试用例列表
+        
+        Returns:
+            List[Dict[str, Any]]: 测试结果列表，格式与TestExecutor.execute_test_cases一致
+        """
+        results = []
+        
+        async def emit(result: Dict[str, Any]):
+            results.append(result)
+        
+        asyncio.run(self._run(test_cases, emit))
+        return results
+    
+    def iter_test_cases(self, test_cases: Iterable[Dict[str, Any]], max_in_flight: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        执行多个测试用例，按完成顺序逐个产出结果
+        
+        事件循环运行在后台线程中，结果经有界队列交给调用方；调用方消费变慢时，协程会暂停取新用例。
+        
+        Args:
+            test_cases: 测试用例（可以是惰性迭代器）
+            max_in_flight: 结果队列容量，默认与最大并发请求数相同
+        
+        Yields:
+            Dict[str, Any]: 测试结果
+        """
+        results: queue.Queue = queue.Queue(maxsize=max_in_flight or self.max_in_flight)
+        stop = threading.Event()
+        finished = object()
+        errors = []
+        
+        async def emit(result: Dict[str, Any]):
+            # 队列满时让出事件循环，等待调用方取走结果
+            while True:
+                try:
+                    results.put_nowait(result)
+                    return
+                except queue.Full:
+                    if stop.is_set():
+                        return
+                    await asyncio.sleep(0.005)
+        
+        def run_loop():
+            try:
+                asyncio.run(self._run(test_cases, emit, stop))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                while True:
+                    try:
+                        results.put(finished, timeout=0.1)
+                        break
+                    except queue.Full:
+                        if stop.is_set():
+                            break
+        
+        thread = threading.Thread(target=run_loop, name='async-engine', daemon=True)
+        thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is finished:
+                    break
+                yield result
+            if errors:
+                raise errors[0]
+        finally:
+            # 调用方提前停止迭代时，通知协程停止并等待在途请求结束
+            stop.set()
+            thread.join()
@@ -0,0 +1,215 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Iterator, Union
+from urllib.parse import urlparse
+from app.core.config import config
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.enhanced_doc_parser import EnhancedDocParser
+from app.utils.logger import logger
+
+def _load_document(doc_path: str) -> Dict[str, Any]:
+    """在工作进程中读取并解析本地文档（使用磁盘缓存）"""
+    return EnhancedDocParser._load_entry(doc_path)
+
+def _parse_content(doc_content: str, doc_path: str) -> Dict[str, Any]:
+    """在工作进程中解析已下载的文档内容"""
+    return EnhancedDocParser._parse_entry(doc_content, doc_path)
+
+class BatchImportResult:
+    """
+    批量导入结果
+    
+    各服务的接口目录合并在一起查询，接口信息带有service字段标明来源服务；导入失败的文档记录在errors中，
+    不影响其他文档。
+    """
+    
+    def __init__(self):
+        self.catalogs: Dict[str, EndpointCatalog] = {}
+        self.documents: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.elapsed = 0.0
+    
+    def add(self, document: Dict[str, Any]):
+        """
+        记录一个文档的导入结果
+        
+        Args:
+            document: BatchImporter.iter_import 产出的文档导入结果
+        """
+        summary = {key: value for key, value in document.items() if key != 'catalog'}
+        self.documents.append(summary)
+        if document['catalog'] is not None:
+            self.catalogs[document['service']] = document['catalog']
+        else:
+            self.errors.append(summary)
+    
+    def __len__(self) -> int:
+        return sum(len(catalog) for catalog in self.catalogs.values())
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for catalog in self.catalogs.values():
+            yield from catalog
+    
+    def services(self) -> List[str]:
+        """导入成功的服务"""
+        return list(self.catalogs)
+    
+    def tags(self) -> List[str]:
+        """所有服务文档中出现的标签"""
+        tags = {}
+        for catalog in self.catalogs.values():
+            tags.update(dict.fromkeys(catalog.tags()))
+        return list(tags)
+    
+    def query(self, service: Optional[str] = None, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        按条件筛选接口
+        
+        Args:
+            service: 来源服务，为空时查询所有服务
+            **filters: 传给 EndpointCatalog.query 的筛选条件（method、path、tag、prefix）
+        
+        Yields:
+            Dict[str, Any]: 接口信息
+        """
+        if service:
+            catalogs = [self.catalogs[service]] if service in self.catalogs else []
+        else:
+            catalogs = self.catalogs.values()
+        for catalog in catalogs:
+            yield from catalog.query(**filters)
+
+class BatchImporter:
+    """
+    批量导入接口文档
+    
+    URL文档由线程池并发下载，本地文档和下载后的内容交给进程池解析（YAML解析是CPU密集型的，多线程无法并行）；
+    文档缓存在各进程之间通过磁盘共享。导入多个文档的总耗时接近其中最慢的一个。
+    工作进程以spawn方式启动，重新导入模块，配置项取自默认值和环境变量。
+    """
+    
+    @staticmethod
+    def service_name(doc_path: str) -> str:
+        """
+        根据文档路径推断服务名：URL取主机名（含端口），本地文件取不含扩展名的文件名
+        
+        Args:
+            doc_path: 文档路径或URL
+        
+        Returns:
+            str: 服务名
+        """
+        if doc_path.startswith('http'):
+            return urlparse(doc_path).netloc or doc_path
+        return os.path.splitext(os.path.basename(doc_path))[0]
+    
+    @staticmethod
+    def _normalize_sources(sources: Union[List[str], Dict[str, str]]) -> Dict[str, str]:
+        """统一为 服务名 -> 文档路径，推断出的服务名重复时追加序号"""
+        if isinstance(sources, dict):
+            return dict(sources)
+        named = {}
+        for doc_path in sources:
+            service = base = BatchImporter.service_name(doc_path)
+            index = 2
+            while service in named:
+                service = f"{base}-{index}"
+                index += 1
+            named[service] = doc_path
+        return named
+    
+    @staticmethod
+    def iter_import(sources: Union[List[str], Dict[str, str]], processes: Optional[int] = None,
+                    fetch_threads: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        并行导入多个文档，按完成顺序逐个产出导入结果
+        
+        Args:
+            sources: 文档路径或URL列表，或 服务名 -> 文档路径 的字典
+            processes: 解析文档的进程数，默认读取 BATCH_IMPORT_PROCESSES（为空时为CPU核数）
+            fetch_threads: 下载URL文档的线程数，默认读取 BATCH_IMPORT_FETCH_THREADS
+        
+        Yields:
+            Dict[str, Any]: service、source、catalog（失败时为None）、endpoint_count、elapsed，
+                失败时还有error和solution
+        """
+        sources = BatchImporter._normalize_sources(sources)
+        if not sources:
+            return
+        urls = {service: path for service, path in sources.items() if path.startswith('http')}
+        processes = processes or config.get('BATCH_IMPORT_PROCESSES') or os.cpu_count() or 1
+        fetch_threads = fetch_threads or config.get('BATCH_IMPORT_FETCH_THREADS', 16)
+        
+        start = time.perf_counter()
+        # 工作进程以spawn方式启动，不使用fork：下载线程、GUI和API服务的线程可能正在运行，
+        # fork会把它们持有的锁原样复制到子进程中，子进程可能因此死锁
+        with ProcessPoolExecutor(max_workers=min(processes, len(sources)),
+                                 mp_context=multiprocessing.get_context('spawn')) as process_pool, \
+                ThreadPoolExecutor(max_workers=max(1, min(fetch_threads, len(urls)))) as fetch_pool:
+            
+            def parse_remote(doc_content: str, doc_path: str) -> Dict[str, Any]:
+                # 下载线程中等待进程池解析，缓存命中时不会调用
+                return process_pool.submit(_parse_content, doc_content, doc_path).result()
+            
+            futures = {}
+            for service, doc_path in sources.items():
+                if service not in urls:
+                    futures[process_pool.submit(_load_document, doc_path)] = service
+            for service, doc_path in urls.items():
+                futures[fetch_pool.submit(EnhancedDocParser._load_entry, doc_path, parse_remote)] = service
+            
+            for future in as_completed(futures):
+                service = futures[future]
+                document = {
+                    'service': service,
+                    'source': sources[service],
+                    'catalog': None,
+                    'endpoint_count': 0,
+                    'elapsed': time.perf_counter() - start
+                }
+                try:
+                    document['catalog'] = BatchImporter._build_catalog(service, future.result())
+                    document['endpoint_count'] = len(document['catalog'])
+                    logger.info(f"导入文档成功: {service}（{sources[service]}），共 {document['endpoint_count']} 个接口")
+                except Exception as e:
+                    document['error'] = str(e)
+                    document['solution'] = getattr(e, 'solution', None)
+                    logger.error(f"导入文档失败: {service}（{sources[service]}） - {str(e)}")
+                yield document
+    
+    @staticmethod
+    def import_documents(sources: Union[List[str], Dict[str, str]], processes: Optional[int] = None,
+                         fetch_threads: Optional[int] = None) -> BatchImportResult:
+        """
+        并行导入多个文档并合并接口目录
+        
+        Args:
+            sources: 文档路径或URL列表，或 服务名 -> 文档路径 的字典
+            processes: 解析文档的进程数
+            fetch_threads: 下载URL文档的线程数
+        
+        Returns:
+            BatchImportResult: 导入结果
+        """
+        start = time.perf_counter()
+        result = BatchImportResult()
+        for document in BatchImporter.iter_import(sources, processes, fetch_threads):
+            result.add(document)
+        result.elapsed = time.perf_counter() - start
+        logger.info(f"批量导入完成: 成功 {len(result.catalogs)} 个，失败 {len(result.errors)} 个，"
+                    f"共 {len(result)} 个接口，耗时 {result.elapsed:.2f}s")
+        return result
+    
+    @staticmethod
+    def _build_catalog(service: str, entry: Dict[str, Any]) -> EndpointCatalog:
+        """由解析结果创建接口目录，接口信息标明来源服务"""
+        if entry['endpoints'] is None:
+            # 解析时提取接口失败，重新提取以抛出原始错误
+            EnhancedDocParser.extract_endpoints(entry['doc'])
+        catalog = EndpointCatalog(entry['doc'])
+        for endpoint in entry['endpoints']:
+            endpoint['service'] = service
+        catalog.preload(entry['endpoints'])
+        return catalog
@@ -0,0 +1,126 @@
+import os
+import codecs
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional, Tuple
+from app.core.config import config
+from app.utils.common_utils import ensure_dir_exists
+
+class SpoolWriter:
+    """响应体增量写入器：未超过上限时保存在内存，超过后转存到磁盘"""
+    
+    def __init__(self, spool: 'BodySpool'):
+        self.spool = spool
+        self.size = 0
+        self._buffer = bytearray()
+        self._preview = b''
+        self._file = None
+        self._hash = hashlib.sha256()
+    
+    def write(self, chunk: bytes):
+        """写入一段响应体"""
+        if not chunk:
+            return
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+        
+        self._buffer.extend(chunk)
+        if len(self._buffer) > self.spool.body_limit:
+            # 超过上限，后续内容直接写入磁盘，内存中只保留预览
+            ensure_dir_exists(self.spool.directory)
+            self._file = tempfile.NamedTemporaryFile(dir=self.spool.directory, prefix='.tmp-', delete=False)
+            self._file.write(self._buffer)
+            self._preview = bytes(self._buffer[:self.spool.preview_size * 4])
+            self._buffer = None
+    
+    def finish(self) -> Tuple[bytes, Optional[str]]:
+        """
+        结束写入
+        
+        Returns:
+            Tuple[bytes, Optional[str]]: (完整响应体或预览, 转存文件路径)；未转存时路径为None
+        """
+        if self._file is None:
+            return bytes(self._buffer), None
+        
+        self._file.close()
+        path = self.spool.path_for(self._hash.hexdigest())
+        if os.path.exists(path):
+            # 内容相同的响应体已经存在，直接复用
+            os.remove(self._file.name)
+        else:
+            ensure_dir_exists(os.path.dirname(path))
+            os.replace(self._file.name, path)
+        return self._preview, path
+    
+    def abort(self):
+        """放弃写入，删除临时文件"""
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.remove(self._file.name)
+            except OSError:
+                pass
+            self._file = None
+
+class BodySpool:
+    """响应体转存目录，按内容哈希存放超过大小上限的响应体"""
+    
+    # 读取响应体时的分块大小
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, directory: Optional[str] = None, body_limit: Optional[int] = None, preview_size: Optional[int] = None):
+        """
+        初始化响应体转存
+        
+        Args:
+            directory: 转存目录，默认读取 RESPONSE_SPOOL_DIR
+            body_limit: 内存中保留完整响应体的上限（字节），默认读取 RESPONSE_BODY_LIMIT
+            preview_size: 转存后内存中保留的预览长度（字符），默认读取 RESPONSE_PREVIEW_SIZE
+        """
+        self.directory = os.path.abspath(directory or config.get('RESPONSE_SPOOL_DIR', '.response_spool'))
+        self.body_limit = body_limit if body_limit is not None else config.get('RESPONSE_BODY_LIMIT', 1024 * 1024)
+        self.preview_size = preview_size if preview_size is not None else config.get('RESPONSE_PREVIEW_SIZE', 1000)
+    
+    def writer(self) -> SpoolWriter:
+        """创建一个响应体写入器"""
+        return SpoolWriter(self)
+    
+    def path_for(self, digest: str) -> str:
+        """根据内容哈希计算转存文件路径"""
+        return os.path.join(self.directory, digest[:2], digest)
+    
+    def decode_preview(self, preview: bytes, encoding: Optional[str]) -> str:
+        """将预览字节解码为不超过预览长度的文本（丢弃被截断的多字节字符）"""
+        try:
+            decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        return decoder.decode(preview, final=False)[:self.preview_size]
+
+def load_response_text(result: Dict[str, Any]) -> str:
+    """
+    获取测试结果的完整响应文本
+    
+    响应体被转存到磁盘时从转存文件读取，否则直接返回结果中的响应文本。
+    
+    Args:
+        result: 测试结果
+    
+    Returns:
+        str: 完整响应文本
+    """
+    body_ref = result.get('response_body_ref')
+    if not body_ref:
+        return result.get('response_text', '')
+    
+    with open(body_ref, 'rb') as f:
+        body = f.read()
+    try:
+        return body.decode(result.get('response_encoding') or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
@@ -22,10 +22,28 @@ class Config:
         'DEFAULT_BASE_URL': '',
         'DEFAULT_EXPECTED_STATUS': 200,
         'TEST_CONCURRENCY': 5,
+        'SESSION_POOL_SIZE': None,  # 为空时跟随 TEST_CONCURRENCY
+        'EXECUTION_ENGINE': 'thread',  # thread: 线程池; async: asyncio事件循环（需要aiohttp）
+        'ASYNC_MAX_IN_FLIGHT': 1000,
+        'MAX_IN_FLIGHT': None,  # 流式执行时最多在途的用例数，为空时为并发数的2倍
+        'TEST_CASE_JOURNAL_COMPACT_OPS': 1000,  # 用例预写日志的操作数达到该值时写回用例文件
+        
+        # 响应体配置
+        'RESPONSE_BODY_LIMIT': 1024 * 1024,  # 超过该大小（字节）的响应体转存到磁盘
+        'RESPONSE_PREVIEW_SIZE': 1000,  # 转存后内存中保留的预览长度（字符）
+        'RESPONSE_SPOOL_DIR': '.response_spool',
+        
+        # 压测配置
+        'LOAD_TARGET_RPS': 10,
+        'LOAD_DURATION': 60,  # 秒
+        'LOAD_MAX_WORKERS': 200,
+        'LOAD_RETRY_COUNT': 0,
         
         # 报告配置
         'REPORT_DIR': 'reports',
         'HTML_REPORT_TEMPLATE': None,
+        'REPORT_PAGE_SIZE': 100,  # 分页HTML报告每页的结果数
+        'REPORT_OFFLINE_ASSETS': False,  # 内联随包附带的样式和图表脚本，打开报告不需要网络
         
         # 日志配置
         'LOG_LEVEL': 'INFO',
@@ -34,6 +52,17 @@ class Config:
         # 文档解析配置
         'SUPPORTED_DOC_FORMATS': ['swagger', 'openapi', 'postman', 'rap', 'yapi'],
         'SWAGGER_VERSION_SUPPORT': ['2.0', '3.0'],
+        'REF_MAX_DEPTH': 1,  # 循环$ref在一条展开路径上最多展开的次数，超过后截断
+        'DOC_CACHE_ENABLED': True,  # 按内容哈希缓存文档解析结果
+        # 缓存目录位于用户目录下，仅当前用户可读写
+        'DOC_CACHE_DIR': os.path.join(os.path.expanduser('~'), '.api_automation', 'doc_cache'),
+        'DOC_CACHE_MEMORY_ENTRIES': 8,  # 进程内缓存的文档数
+        'DOC_CACHE_DISK_ENTRIES': 64,  # 磁盘缓存的文档数，超过后删除最久未使用的
+        'HTTP_CACHE_ENABLED': True,  # 远程文档使用条件请求（ETag/Last-Modified），304时使用磁盘上缓存的内容
+        'HTTP_CACHE_DIR': '.http_cache',
+        'HTTP_CACHE_MAX_ENTRIES': 256,  # 缓存的响应数，超过后删除最久未使用的
+        'BATCH_IMPORT_PROCESSES': None,  # 批量导入时解析文档的进程数，为空时为CPU核数
+        'BATCH_IMPORT_FETCH_THREADS': 16,  # 批量导入时并发下载URL文档的线程数
         
         # 界面配置
         'WINDOW_WIDTH': 1200,
@@ -62,10 +91,64 @@ class Config:
             self._config['DEFAULT_EXPECTED_STATUS'] = int(os.getenv('DEFAULT_EXPECTED_STATUS'))
         if os.getenv('TEST_CONCURRENCY'):
             self._config['TEST_CONCURRENCY'] = int(os.getenv('TEST_CONCURRENCY'))
+        if os.getenv('SESSION_POOL_SIZE'):
+            self._config['SESSION_POOL_SIZE'] = int(os.getenv('SESSION_POOL_SIZE'))
+        if os.getenv('EXECUTION_ENGINE'):
+            self._config['EXECUTION_ENGINE'] = os.getenv('EXECUTION_ENGINE').lower()
+        if os.getenv('ASYNC_MAX_IN_FLIGHT'):
+            self._config['ASYNC_MAX_IN_FLIGHT'] = int(os.getenv('ASYNC_MAX_IN_FLIGHT'))
+        if os.getenv('MAX_IN_FLIGHT'):
+            self._config['MAX_IN_FLIGHT'] = int(os.getenv('MAX_IN_FLIGHT'))
+        if os.getenv('TEST_CASE_JOURNAL_COMPACT_OPS'):
+            self._config['TEST_CASE_JOURNAL_COMPACT_OPS'] = int(os.getenv('TEST_CASE_JOURNAL_COMPACT_OPS'))
+        
+        # 响应体配置
+        if os.getenv('RESPONSE_BODY_LIMIT'):
+            self._config['RESPONSE_BODY_LIMIT'] = int(os.getenv('RESPONSE_BODY_LIMIT'))
+        if os.getenv('RESPONSE_PREVIEW_SIZE'):
+            self._config['RESPONSE_PREVIEW_SIZE'] = int(os.getenv('RESPONSE_PREVIEW_SIZE'))
+        if os.getenv('RESPONSE_SPOOL_DIR'):
+            self._config['RESPONSE_SPOOL_DIR'] = os.getenv('RESPONSE_SPOOL_DIR')
+        
+        # 压测配置
+        if os.getenv('LOAD_TARGET_RPS'):
+            self._config['LOAD_TARGET_RPS'] = float(os.getenv('LOAD_TARGET_RPS'))
+        if os.getenv('LOAD_DURATION'):
+            self._config['LOAD_DURATION'] = float(os.getenv('LOAD_DURATION'))
+        if os.getenv('LOAD_MAX_WORKERS'):
+            self._config['LOAD_MAX_WORKERS'] = int(os.getenv('LOAD_MAX_WORKERS'))
+        if os.getenv('LOAD_RETRY_COUNT'):
+            self._config['LOAD_RETRY_COUNT'] = int(os.getenv('LOAD_RETRY_COUNT'))
         
         # 报告配置
         if os.getenv('REPORT_DIR'):
             self._config['REPORT_DIR'] = os.getenv('REPORT_DIR')
+        if os.getenv('REPORT_PAGE_SIZE'):
+            self._config['REPORT_PAGE_SIZE'] = int(os.getenv('REPORT_PAGE_SIZE'))
+        if os.getenv('REPORT_OFFLINE_ASSETS'):
+            self._config['REPORT_OFFLINE_ASSETS'] = os.getenv('REPORT_OFFLINE_ASSETS').lower() in ('1', 'true', 'yes')
+        
+        # 文档解析配置
+        if os.getenv('REF_MAX_DEPTH'):
+            self._config['REF_MAX_DEPTH'] = int(os.getenv('REF_MAX_DEPTH'))
+        if os.getenv('DOC_CACHE_ENABLED'):
+            self._config['DOC_CACHE_ENABLED'] = os.getenv('DOC_CACHE_ENABLED').lower() in ('1', 'true', 'yes')
+        if os.getenv('DOC_CACHE_DIR'):
+            self._config['DOC_CACHE_DIR'] = os.getenv('DOC_CACHE_DIR')
+        if os.getenv('DOC_CACHE_MEMORY_ENTRIES'):
+            self._config['DOC_CACHE_MEMORY_ENTRIES'] = int(os.getenv('DOC_CACHE_MEMORY_ENTRIES'))
+        if os.getenv('DOC_CACHE_DISK_ENTRIES'):
+            self._config['DOC_CACHE_DISK_ENTRIES'] = int(os.getenv('DOC_CACHE_DISK_ENTRIES'))
+        if os.getenv('HTTP_CACHE_ENABLED'):
+            self._config['HTTP_CACHE_ENABLED'] = os.getenv('HTTP_CACHE_ENABLED').lower() in ('1', 'true', 'yes')
+        if os.getenv('HTTP_CACHE_DIR'):
+            self._config['HTTP_CACHE_DIR'] = os.getenv('HTTP_CACHE_DIR')
+        if os.getenv('HTTP_CACHE_MAX_ENTRIES'):
+            self._config['HTTP_CACHE_MAX_ENTRIES'] = int(os.getenv('HTTP_CACHE_MAX_ENTRIES'))
+        if os.getenv('BATCH_IMPORT_PROCESSES'):
+            self._config['BATCH_IMPORT_PROCESSES'] = int(os.getenv('BATCH_IMPORT_PROCESSES'))
+        if os.getenv('BATCH_IMPORT_FETCH_THREADS'):
+            self._config['BATCH_IMPORT_FETCH_THREADS'] = int(os.getenv('BATCH_IMPORT_FETCH_THREADS'))
         
         # 日志配置
         if os.getenv('LOG_LEVEL'):
@@ -92,9 +175,9 @@ class Config:
     def load_from_file(self, file_path: str):
         """从配置文件加载配置"""
         try:
-            import yaml
+            from app.utils import yaml_io
             with open(file_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml_io.safe_load(f)
                 if config:
                     self.update(config)
         except Exception as e:
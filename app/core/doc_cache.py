@@ -0,0 +1,247 @@
+import os
+import json
+import hashlib
+import datetime
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+from app.core.config import config
+from app.core.exceptions import create_error
+from app.core.http_cache import http_cache
+from app.utils.common_utils import get_file_extension
+from app.utils.logger import logger
+
+# YAML文档中JSON无法直接表示的值（非字符串的键，如未加引号的响应码 200:；日期）编码为带标记的对象，
+# 标记以NUL字符开头，不会与文档中的键冲突
+_ITEMS_MARK = '\0items'
+_DATETIME_MARK = '\0datetime'
+_DATE_MARK = '\0date'
+
+def _encode_json(value: Any) -> Any:
+    """将解析结果转换为可原样还原的JSON对象"""
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _encode_json(item) for key, item in value.items()}
+        return {_ITEMS_MARK: [[_encode_json(key), _encode_json(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_encode_json(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return {_DATETIME_MARK: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_DATE_MARK: value.isoformat()}
+    return value
+
+def _decode_json(obj: Dict[str, Any]) -> Any:
+    """json.loads的object_hook，还原 _encode_json 编码的值"""
+    if len(obj) == 1:
+        if _ITEMS_MARK in obj:
+            return {key: item for key, item in obj[_ITEMS_MARK]}
+        if _DATETIME_MARK in obj:
+            return datetime.datetime.fromisoformat(obj[_DATETIME_MARK])
+        if _DATE_MARK in obj:
+            return datetime.date.fromisoformat(obj[_DATE_MARK])
+    return obj
+
+class DocCache:
+    """
+    文档解析结果缓存（进程内LRU + 磁盘）
+    
+    缓存键为文档内容的sha256，内容变化后自动使用新的缓存项；URL文档的内容经过HTTP缓存（http_cache）获取，
+    未变化时服务端返回304，不需要重新下载。缓存项以JSON字节保存，每次读取都得到新的对象，
+    调用方修改返回的文档不会影响缓存。
+    
+    磁盘缓存只保存JSON（读取时不会执行任何代码），缓存目录仅当前用户可读写。
+    """
+    
+    # 解析逻辑或缓存格式变化时递增，使旧的缓存项失效
+    VERSION = 4
+    
+    def __init__(self, directory: Optional[str] = None, memory_entries: Optional[int] = None, disk_entries: Optional[int] = None):
+        """
+        初始化文档缓存
+        
+        Args:
+            directory: 磁盘缓存目录，默认读取 DOC_CACHE_DIR
+            memory_entries: 进程内缓存的文档数，默认读取 DOC_CACHE_MEMORY_ENTRIES
+            disk_entries: 磁盘缓存的文档数，超过后删除最久未使用的，默认读取 DOC_CACHE_DISK_ENTRIES
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory or config.get('DOC_CACHE_DIR')))
+        self.memory_entries = memory_entries or config.get('DOC_CACHE_MEMORY_ENTRIES', 8)
+        self.disk_entries = disk_entries or config.get('DOC_CACHE_DISK_ENTRIES', 64)
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def content_key(self, doc_content: str, doc_path: str) -> str:
+        """
+        计算缓存键
+        
+        文件扩展名会影响解析方式（YAML/JSON），因此也计入缓存键。
+        """
+        digest = hashlib.sha256(f"{self.VERSION}\0{get_file_extension(doc_path)}\0".encode('utf-8'))
+        digest.update(doc_content.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, 'entries', f'{key}.json')
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存项
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            Optional[Dict[str, Any]]: 缓存的解析结果，不存在或已损坏时返回None
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        
+        if data is None:
+            path = self._entry_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                # 更新修改时间，磁盘清理时按最近使用时间淘汰
+                os.utime(path, None)
+            except OSError:
+                return None
+            self._remember(key, data)
+        
+        try:
+            return json.loads(data, object_hook=_decode_json)
+        except Exception as e:
+            logger.warning(f"文档缓存项已损坏，将重新解析: {key} - {str(e)}")
+            self.discard(key)
+            return None
+    
+    def put(self, key: str, entry: Dict[str, Any]):
+        """
+        写入缓存项（写磁盘失败时只保留在内存中）
+        
+        Args:
+            key: 缓存键
+            entry: 解析结果
+        """
+        try:
+            data = json.dumps(_encode_json(entry), ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            logger.info(f"文档解析结果无法保存为JSON，不缓存: {key} - {str(e)}")
+            return
+        self._remember(key, data)
+        try:
+            self._write_atomic(self._entry_path(key), data)
+            self._prune_disk()
+        except OSError as e:
+            logger.warning(f"写入文档缓存失败: {str(e)}")
+    
+    def discard(self, key: str):
+        """删除缓存项"""
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+    
+    def clear(self):
+        """清空内存和磁盘缓存"""
+        with self._lock:
+            self._memory.clear()
+        path = os.path.join(self.directory, 'entries')
+        if not os.path.isdir(path):
+            return
+        for name in os.listdir(path):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+    
+    def _remember(self, key: str, data: bytes):
+        """放入进程内LRU"""
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+    
+    def _write_atomic(self, path: str, data: bytes):
+        """先写临时文件再替换，避免并发读取到写了一半的文件（mkstemp创建的文件仅当前用户可读写）"""
+        self._ensure_private_dir(os.path.dirname(path))
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    @staticmethod
+    def _ensure_private_dir(path: str):
+        """创建仅当前用户可访问的目录（Windows上权限位不生效，依赖用户目录本身的权限）"""
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        try:
+            os.chmod(path, 0o700)
+        except OSError as e:
+            logger.warning(f"无法设置文档缓存目录权限: {path} - {str(e)}")
+    
+    def _prune_disk(self):
+        """磁盘缓存超过上限时删除最久未使用的缓存项"""
+        entries_dir = os.path.join(self.directory, 'entries')
+        entries = []
+        for name in os.listdir(entries_dir):
+            if name.endswith('.json'):
+                path = os.path.join(entries_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        if len(entries) <= self.disk_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def load(self, doc_path: str, parse: Callable[[str, str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        读取文档并返回解析结果，内容未变化时直接使用缓存
+        
+        Args:
+            doc_path: 文档路径或URL
+            parse: 解析函数，参数为(文档内容, 文档路径)，返回解析结果
+        
+        Returns:
+            Dict[str, Any]: 解析结果
+        """
+        if doc_path.startswith('http'):
+            # URL文档经过HTTP缓存获取：未变化时服务端返回304，不需要重新下载
+            doc_content = http_cache.get_text(doc_path)
+        else:
+            if not os.path.exists(doc_path):
+                error = create_error('DOC_NOT_FOUND', f'文档文件不存在: {doc_path}')
+                raise error
+            with open(doc_path, 'r', encoding='utf-8') as f:
+                doc_content = f.read()
+        key = self.content_key(doc_content, doc_path)
+        
+        entry = self.get(key)
+        if entry is not None:
+            logger.info(f"使用文档解析缓存: {doc_path}")
+            return entry
+        
+        entry = parse(doc_content, doc_path)
+        self.put(key, entry)
+        return entry
+
+# 全局文档缓存实例
+doc_cache = DocCache()
@@ -1,8 +1,9 @@
 import requests
-import yaml
 import json
 from typing import Dict, List, Any
 from app.core.exceptions import create_error, DocParseError
+from app.core.http_cache import http_cache
+from app.utils import yaml_io
 
 class DocParser:
     @staticmethod
@@ -12,8 +13,8 @@ class DocParser:
             if url_or_path.startswith('http'):
                 # 从URL获取
                 try:
-                    response = requests.get(url_or_path, timeout=30)
-                    response.raise_for_status()
+                    # 经过HTTP缓存获取：条件请求，未变化时使用磁盘上缓存的内容
+                    doc_content = http_cache.get_text(url_or_path)
                 except requests.exceptions.Timeout:
                     error = create_error('NETWORK_TIMEOUT', f'文档URL请求超时: {url_or_path}')
                     raise error
@@ -27,10 +28,10 @@ class DocParser:
                 # 解析内容
                 try:
                     if url_or_path.endswith('.yaml') or url_or_path.endswith('.yml'):
-                        return yaml.safe_load(response.text)
+                        return yaml_io.safe_load(doc_content)
                     else:
-                        return response.json()
-                except yaml.YAMLError as e:
+                        return json.loads(doc_content)
+                except yaml_io.YAMLError as e:
                     error = create_error('DOC_FORMAT_ERROR', f'YAML格式解析失败: {str(e)}')
                     raise error
                 except json.JSONDecodeError as e:
@@ -42,10 +43,10 @@ class DocParser:
                     with open(url_or_path, 'r', encoding='utf-8') as f:
                         try:
                             if url_or_path.endswith('.yaml') or url_or_path.endswith('.yml'):
-                                return yaml.safe_load(f)
+                                return yaml_io.safe_load(f)
                             else:
                                 return json.load(f)
-                        except yaml.YAMLError as e:
+                        except yaml_io.YAMLError as e:
                             error = create_error('DOC_FORMAT_ERROR', f'YAML格式解析失败: {str(e)}')
                             raise error
                         except json.JSONDecodeError as e:
@@ -0,0 +1,273 @@
+import re
+import json
+import bisect
+import hashlib
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple
+from app.core.exceptions import create_error
+from app.core.ref_resolver import RefResolver
+from app.utils.common_utils import stringify_keys
+
+class EndpointCatalog:
+    """
+    接口目录
+    
+    创建时只遍历paths下的路径和方法，建立 (方法, 路径)、标签、路径前缀索引；接口信息（参数、请求体等）
+    在查询到时才构建并缓存。只处理部分接口（如某个标签或路径前缀）时不会解析文档的其余部分。
+    """
+    
+    # paths中路径项下表示HTTP方法的键，其他键（如parameters、summary）不是接口
+    HTTP_METHODS = ['get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace']
+    
+    # 计算指纹时从JSON文本中查找$ref，比逐层遍历对象快
+    _REF_PATTERN = re.compile(r'"\$ref": ("(?:[^"\\]|\\.)*")')
+    
+    def __init__(self, swagger_doc: Dict[str, Any], resolver: Optional[RefResolver] = None):
+        """
+        初始化接口目录
+        
+        Args:
+            swagger_doc: Swagger文档数据
+            resolver: $ref解析器，默认为该文档新建一个
+        """
+        paths = swagger_doc.get('paths', {})
+        if not paths:
+            error = create_error('DOC_PARSE_FAILED', '文档中未找到paths字段')
+            raise error
+        
+        self.resolver = resolver or RefResolver(swagger_doc)
+        self._operations: Dict[Tuple[str, str], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._by_tag: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_path: Dict[str, List[Tuple[str, str]]] = {}
+        self._order: Dict[Tuple[str, str], int] = {}
+        self._endpoints: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._fingerprints: Dict[Tuple[str, str], str] = {}
+        self._ref_hashes: Dict[str, Tuple[str, List[str]]] = {}
+        
+        for path, path_item in paths.items():
+            path_item = self.resolver.resolve(path_item)
+            for method, details in path_item.items():
+                if method.lower() not in self.HTTP_METHODS or not isinstance(details, dict):
+                    continue
+                key = (method.upper(), path)
+                self._operations[key] = (path_item, details)
+                self._order[key] = len(self._order)
+                self._by_path.setdefault(path, []).append(key)
+                for tag in details.get('tags') or []:
+                    self._by_tag.setdefault(tag, []).append(key)
+        
+        if not self._operations:
+            error = create_error('DOC_PARSE_FAILED', '文档中未找到有效的接口信息')
+            raise error
+        
+        # 路径排序后，同一前缀的路径相邻，可以二分查找
+        self._sorted_paths = sorted(self._by_path)
+    
+    def __len__(self) -> int:
+        return len(self._operations)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """按文档顺序逐个产出接口信息"""
+        for method, path in self._operations:
+            yield self.endpoint(method, path)
+    
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        method, path = key
+        return (method.upper(), path) in self._operations
+    
+    def tags(self) -> List[str]:
+        """文档中出现的所有标签"""
+        return list(self._by_tag)
+    
+    def keys(self) -> List[Tuple[str, str]]:
+        """所有接口的 (方法, 路径)"""
+        return list(self._operations)
+    
+    def endpoint(self, method: str, path: str) -> Optional[Dict[str, Any]]:
+        """
+        获取单个接口信息
+        
+        Args:
+            method: HTTP方法
+            path: 路径
+        
+        Returns:
+            Optional[Dict[str, Any]]: 接口信息，不存在时返回None
+        """
+        key = (method.upper(), path)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            operation = self._operations.get(key)
+            if operation is None:
+                return None
+            endpoint = self._endpoints[key] = self._build_endpoint(key, *operation)
+        return endpoint
+    
+    def query(self, method: Optional[str] = None, path: Optional[str] = None, tag: Optional[str] = None,
+              prefix: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按条件筛选接口，条件之间为“且”的关系，按文档顺序逐个产出
+        
+        Args:
+            method: HTTP方法
+            path: 完整路径
+            tag: 标签
+            prefix: 路径前缀，如 /orders/；以*结尾时去掉*后按前缀匹配
+        
+        Yields:
+            Dict[str, Any]: 接口信息
+        """
+        method = method.upper() if method else None
+        if prefix and prefix.endswith('*'):
+            prefix = prefix[:-1]
+        
+        # 从最有选择性的索引取候选接口
+        if method and path:
+            candidates = [(method, path)] if (method, path) in self._operations else []
+        elif path:
+            candidates = self._by_path.get(path, [])
+        elif tag:
+            candidates = self._by_tag.get(tag, [])
+        elif prefix:
+            candidates = sorted(self._keys_with_prefix(prefix), key=self._order.__getitem__)
+        else:
+            candidates = self._operations
+        
+        for key in candidates:
+            key_method, key_path = key
+            if method and key_method != method:
+                continue
+            if path and key_path != path:
+                continue
+            if prefix and not key_path.startswith(prefix):
+                continue
+            if tag and tag not in (self._operations[key][1].get('tags') or []):
+                continue
+            yield self.endpoint(key_method, key_path)
+    
+    def preload(self, endpoints: Iterable[Dict[str, Any]]):
+        """
+        填充已构建的接口信息（如文档缓存中的），之后查询这些接口时不再重新构建、计算指纹
+        
+        Args:
+            endpoints: 由同一文档提取的接口信息
+        """
+        for endpoint in endpoints:
+            key = (endpoint['method'], endpoint['path'])
+            if key in self._operations:
+                self._endpoints[key] = endpoint
+                if endpoint.get('fingerprint'):
+                    self._fingerprints[key] = endpoint['fingerprint']
+    
+    def fingerprint(self, method: str, path: str) -> Optional[str]:
+        """
+        接口指纹（结果缓存）
+        
+        对接口定义、路径级参数以及它们直接或间接引用的全部组件的原始内容计算哈希，不需要构建接口信息。
+        被引用的组件变化时，所有引用它的接口的指纹都会变化；与组件的遍历顺序无关，不同版本的文档之间可以比较。
+        
+        Args:
+            method: HTTP方法
+            path: 路径
+        
+        Returns:
+            Optional[str]: 指纹，接口不存在时返回None
+        """
+        key = (method.upper(), path)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            operation = self._operations.get(key)
+            if operation is None:
+                return None
+            path_item, details = operation
+            raw = json.dumps(stringify_keys([path_item.get('parameters', []), details]), sort_keys=True, default=str)
+            digest = hashlib.sha1(raw.encode('utf-8'))
+            
+            # 收集传递引用的组件，按引用排序后计入哈希
+            pending = self._collect_refs(raw)
+            seen = set()
+            while pending:
+                ref = pending.pop()
+                if ref in seen:
+                    continue
+                seen.add(ref)
+                pending.extend(self._ref_hash(ref)[1])
+            for ref in sorted(seen):
+                digest.update(f"\0{ref}\0{self._ref_hash(ref)[0]}".encode('utf-8'))
+            fingerprint = self._fingerprints[key] = digest.hexdigest()
+        return fingerprint
+    
+    def fingerprints(self) -> Dict[str, str]:
+        """所有接口的指纹，键为 “方法 路径”"""
+        return {f"{method} {path}": self.fingerprint(method, path) for method, path in self._operations}
+    
+    def _ref_hash(self, ref: str) -> Tuple[str, List[str]]:
+        """被引用组件原始内容的哈希及其直接引用的组件（结果缓存）"""
+        cached = self._ref_hashes.get(ref)
+        if cached is None:
+            target = self.resolver.lookup(ref)
+            raw = json.dumps(stringify_keys(target), sort_keys=True, default=str)
+            cached = self._ref_hashes[ref] = (hashlib.sha1(raw.encode('utf-8')).hexdigest(), self._collect_refs(raw))
+        return cached
+    
+    @staticmethod
+    def _collect_refs(raw: str) -> List[str]:
+        """从JSON文本中收集所有的$ref（不展开）"""
+        return [json.loads(ref) for ref in EndpointCatalog._REF_PATTERN.findall(raw)]
+    
+    @staticmethod
+    def matches(endpoint: Dict[str, Any], method: Optional[str] = None, path: Optional[str] = None,
+                tag: Optional[str] = None, prefix: Optional[str] = None) -> bool:
+        """
+        判断接口信息是否符合筛选条件（条件与query相同），用于筛选流式产出的接口
+        
+        Args:
+            endpoint: 接口信息
+            method: HTTP方法
+            path: 完整路径
+            tag: 标签
+            prefix: 路径前缀
+        
+        Returns:
+            bool: 是否符合
+        """
+        if prefix and prefix.endswith('*'):
+            prefix = prefix[:-1]
+        if method and endpoint['method'] != method.upper():
+            return False
+        if path and endpoint['path'] != path:
+            return False
+        if prefix and not endpoint['path'].startswith(prefix):
+            return False
+        if tag and tag not in endpoint.get('tags', []):
+            return False
+        return True
+    
+    def _keys_with_prefix(self, prefix: str) -> Iterator[Tuple[str, str]]:
+        """二分查找以prefix开头的路径"""
+        index = bisect.bisect_left(self._sorted_paths, prefix)
+        while index < len(self._sorted_paths) and self._sorted_paths[index].startswith(prefix):
+            yield from self._by_path[self._sorted_paths[index]]
+            index += 1
+    
+    def _build_endpoint(self, key: Tuple[str, str], path_item: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
+        """构建接口信息，参数和请求体中的$ref由共享的解析器解析"""
+        method, path = key
+        resolver = self.resolver
+        
+        # 路径级参数对该路径下所有方法生效，方法级同名参数优先
+        parameters = resolver.resolve_parameters(details.get('parameters', []))
+        overridden = {(param.get('name'), param.get('in')) for param in parameters}
+        path_parameters = resolver.resolve_parameters(path_item.get('parameters', []))
+        parameters = [param for param in path_parameters if (param.get('name'), param.get('in')) not in overridden] + parameters
+        
+        return {
+            'path': path,
+            'method': method,
+            'summary': details.get('summary', ''),
+            'description': details.get('description', ''),
+            'tags': details.get('tags') or [],
+            'parameters': parameters,
+            'requestBody': resolver.resolve_request_body(details.get('requestBody', {})),
+            'responses': details.get('responses', {}),
+            'fingerprint': self.fingerprint(method, path)
+        }
@@ -1,21 +1,40 @@
+import os
+import re
 import json
-import yaml
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable, TextIO
+from app.core.config import config
+from app.core.doc_cache import doc_cache
+from app.core.http_cache import http_cache
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.ref_resolver import RefResolver
 from app.core.exceptions import create_error, DocParseError
 from app.utils.logger import logger
 from app.utils.common_utils import get_file_extension
+from app.utils import yaml_io
+from app.utils.json_stream import JsonStreamReader
 
 class EnhancedDocParser:
     """增强版文档解析器，支持多种格式的接口文档"""
     
+    # 前缀扫描的长度：Swagger/OpenAPI文档的版本字段通常位于开头
+    SNIFF_SIZE = 4096
+    
+    # YAML顶层（第0列）的swagger/openapi键
+    _YAML_VERSION_KEY = re.compile(r'^(swagger|openapi)\s*:', re.MULTILINE)
+    # JSON对象的第一个键为swagger/openapi
+    _JSON_VERSION_KEY = re.compile(r'^\s*\{\s*"(swagger|openapi)"\s*:')
+    
     @staticmethod
-    def detect_doc_format(doc_content: str, file_path: Optional[str] = None) -> str:
+    def detect_doc_format(doc_content: str, file_path: Optional[str] = None, data: Any = None) -> str:
         """
         检测文档格式
         
+        先扫描文档开头的顶层键，能确定是Swagger/OpenAPI时不做完整解析；否则根据解析后的内容判断。
+        
         Args:
             doc_content: 文档内容
             file_path: 文件路径（可选）
+            data: 已解析的文档内容（可选），传入时不再重复解析
         
         Returns:
             str: 文档格式，如 'swagger', 'openapi', 'postman', 'rap', 'yapi'
@@ -24,36 +43,63 @@ class EnhancedDocParser:
         if file_path:
             ext = get_file_extension(file_path)
             if ext in ['json', 'yaml', 'yml']:
+                doc_format = EnhancedDocParser._sniff_format(doc_content, ext)
+                if doc_format:
+                    return doc_format
+                
                 # 尝试解析内容
-                try:
-                    if ext in ['yaml', 'yml']:
-                        data = yaml.safe_load(doc_content)
-                    else:
-                        data = json.loads(doc_content)
-                    
-                    # 根据内容特征判断
-                    if isinstance(data, dict):
-                        # Swagger/OpenAPI
-                        if 'swagger' in data:
-                            return 'swagger'
-                        elif 'openapi' in data:
-                            return 'openapi'
-                        # Postman Collection
-                        elif 'info' in data and 'item' in data:
-                            if 'schema' in data and 'https://schema.getpostman.com/' in data['schema']:
-                                return 'postman'
-                        # RAP
-                        elif 'project' in data and 'modules' in data:
-                            return 'rap'
-                        # YAPI
-                        elif 'api' in data or 'cat' in data:
-                            return 'yapi'
-                except Exception:
-                    pass
+                if data is None:
+                    try:
+                        if ext in ['yaml', 'yml']:
+                            data = yaml_io.safe_load(doc_content)
+                        else:
+                            data = json.loads(doc_content)
+                    except Exception:
+                        pass
+                
+                doc_format = EnhancedDocParser._detect_from_data(data)
+                if doc_format:
+                    return doc_format
         
         # 默认返回 swagger
         return 'swagger'
     
+    @staticmethod
+    def _sniff_format(doc_content: str, ext: str) -> Optional[str]:
+        """
+        扫描文档开头，判断是否为Swagger/OpenAPI文档
+        
+        Returns:
+            Optional[str]: 'swagger'、'openapi'，无法确定时返回None
+        """
+        prefix = doc_content[:EnhancedDocParser.SNIFF_SIZE]
+        if ext in ['yaml', 'yml']:
+            match = EnhancedDocParser._YAML_VERSION_KEY.search(prefix)
+        else:
+            match = EnhancedDocParser._JSON_VERSION_KEY.match(prefix)
+        return match.group(1) if match else None
+    
+    @staticmethod
+    def _detect_from_data(data: Any) -> Optional[str]:
+        """根据解析后的内容特征判断文档格式，无法判断时返回None"""
+        if isinstance(data, dict):
+            # Swagger/OpenAPI
+            if 'swagger' in data:
+                return 'swagger'
+            elif 'openapi' in data:
+                return 'openapi'
+            # Postman Collection
+            elif 'info' in data and 'item' in data:
+                if 'schema' in data and 'https://schema.getpostman.com/' in data['schema']:
+                    return 'postman'
+            # RAP
+            elif 'project' in data and 'modules' in data:
+                return 'rap'
+            # YAPI
+            elif 'api' in data or 'cat' in data:
+                return 'yapi'
+        return None
+    
     @staticmethod
     def parse_doc(doc_path: str) -> Dict[str, Any]:
         """
@@ -65,67 +111,315 @@ class EnhancedDocParser:
         Returns:
             Dict[str, Any]: 解析后的文档数据
         """
+        return EnhancedDocParser._load_entry(doc_path)['doc']
+    
+    @staticmethod
+    def load_doc(doc_path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        解析文档并提取接口信息
+        
+        文档内容（URL文档为ETag/Last-Modified）未变化时直接使用缓存的解析结果。
+        
+        Args:
+            doc_path: 文档路径或URL
+        
+        Returns:
+            Tuple[Dict[str, Any], List[Dict[str, Any]]]: (解析后的文档数据, 接口信息列表)
+        """
+        entry = EnhancedDocParser._load_entry(doc_path)
+        if entry['endpoints'] is None:
+            # 解析时提取接口失败，重新提取以抛出原始错误
+            EnhancedDocParser.extract_endpoints(entry['doc'])
+        return entry['doc'], entry['endpoints']
+    
+    @staticmethod
+    def load_catalog(doc_path: str) -> EndpointCatalog:
+        """
+        解析文档并创建接口目录（文档解析结果使用缓存）
+        
+        Args:
+            doc_path: 文档路径或URL
+        
+        Returns:
+            EndpointCatalog: 接口目录，可按方法、路径、标签、路径前缀查询
+        """
+        entry = EnhancedDocParser._load_entry(doc_path)
         try:
-            # 获取文档内容
+            catalog = EndpointCatalog(entry['doc'])
+            # 缓存中已有提取好的接口信息（含指纹），不再重新构建
+            catalog.preload(entry['endpoints'] or [])
+            return catalog
+        except DocParseError:
+            raise
+        except Exception as e:
+            error = create_error('DOC_PARSE_FAILED', f'提取接口信息失败: {str(e)}')
+            raise error
+    
+    @staticmethod
+    def stream_endpoints(doc_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        流式解析JSON文档，逐个产出接口信息
+        
+        不把整个文档读入内存：Swagger/OpenAPI文档逐个读取paths下的路径，每读到一个就提取接口信息，
+        内存占用只与单个接口的大小有关。Postman文档逐个读取item下的请求（文件夹递归读取），RAP文档逐个读取modules下的接口，
+        YAPI文档逐个读取api，逐个转换后只保留转换结果（不含请求体示例等原始内容），读完后再产出接口信息，
+        与普通解析一样，同一方法和路径出现多次时以最后一个为准。URL文档经过HTTP缓存下载到磁盘后再流式读取。
+        
+        YAML文档不支持流式解析，按普通方式解析后逐个产出。流式解析不使用文档缓存。
+        
+        Args:
+            doc_path: 文档路径或URL
+        
+        Yields:
+            Dict[str, Any]: 接口信息
+        """
+        if get_file_extension(doc_path) in ['yaml', 'yml']:
+            yield from EnhancedDocParser.load_catalog(doc_path)
+            return
+        
+        try:
+            fetched = None
             if doc_path.startswith('http'):
-                import requests
-                response = requests.get(doc_path, timeout=30)
-                response.raise_for_status()
-                doc_content = response.text
+                # 响应体由HTTP缓存边下载边写入磁盘，直接从缓存文件流式读取
+                fetched = http_cache.fetch(doc_path)
+                file_path, encoding = fetched['path'], fetched['encoding']
             else:
-                with open(doc_path, 'r', encoding='utf-8') as f:
-                    doc_content = f.read()
+                if not os.path.exists(doc_path):
+                    error = create_error('DOC_NOT_FOUND', f'文档文件不存在: {doc_path}')
+                    raise error
+                file_path, encoding = doc_path, 'utf-8'
             
-            # 检测文档格式
-            doc_format = EnhancedDocParser.detect_doc_format(doc_content, doc_path)
-            logger.info(f"检测到文档格式: {doc_format}")
-            
-            # 根据格式解析
-            if doc_format in ['swagger', 'openapi']:
-                return EnhancedDocParser.parse_swagger(doc_content, doc_path)
-            elif doc_format == 'postman':
-                return EnhancedDocParser.parse_postman(doc_content)
-            elif doc_format == 'rap':
-                return EnhancedDocParser.parse_rap(doc_content)
-            elif doc_format == 'yapi':
-                return EnhancedDocParser.parse_yapi(doc_content)
-            else:
-                error = create_error('DOC_FORMAT_ERROR', f'不支持的文档格式: {doc_format}')
+            count = 0
+            try:
+                for endpoint in EnhancedDocParser._stream_json_endpoints(lambda: open(file_path, 'r', encoding=encoding)):
+                    count += 1
+                    yield endpoint
+            finally:
+                if fetched:
+                    # 未启用HTTP缓存时响应体是临时文件
+                    http_cache.discard(fetched)
+            if not count:
+                error = create_error('DOC_PARSE_FAILED', '文档中未找到有效的接口信息')
                 raise error
-                
         except DocParseError:
             raise
+        except ValueError as e:
+            error = create_error('DOC_FORMAT_ERROR', f'文档内容解析失败: {str(e)}')
+            raise error
         except Exception as e:
             error = create_error('DOC_PARSE_FAILED', f'文档解析失败: {str(e)}')
             raise error
     
     @staticmethod
-    def parse_swagger(doc_content: str, doc_path: Optional[str] = None) -> Dict[str, Any]:
+    def _stream_json_endpoints(open_doc: Callable[[], TextIO]) -> Iterator[Dict[str, Any]]:
         """
-        解析Swagger/OpenAPI文档
+        按顶层键流式读取文档并产出接口信息
+        
+        Swagger/OpenAPI的paths需要解析components/definitions中的$ref，paths出现在它们之前时
+        （常见的导出顺序）第一遍跳过paths、读取其余顶层字段，第二遍再流式读取paths。
+        
+        Args:
+            open_doc: 打开文档的函数，每次调用返回新的文本文件对象
+        """
+        header = {}
+        paths_deferred = False
+        # Postman、RAP、YAPI接口转换后的paths，按与 convert_* 相同的规则合并（同一方法和路径后者覆盖前者）
+        converted_paths = {}
+        with open_doc() as f:
+            reader = JsonStreamReader(f)
+            if reader.peek() != '{':
+                raise ValueError('文档顶层不是JSON对象')
+            for key in reader.iter_object():
+                if key == 'paths':
+                    if 'components' in header or 'definitions' in header:
+                        yield from EnhancedDocParser._stream_paths(reader, RefResolver(header))
+                    else:
+                        reader.skip_value()
+                        paths_deferred = True
+                elif key == 'item' and reader.peek() == '[':
+                    for item, base_path in EnhancedDocParser._stream_postman_items(reader):
+                        EnhancedDocParser._process_postman_items([item], converted_paths, base_path)
+                elif key == 'modules' and reader.peek() == '[':
+                    for _ in reader.iter_array():
+                        if reader.peek() != '{':
+                            reader.skip_value()
+                            continue
+                        for module_key in reader.iter_object():
+                            if module_key != 'interfaces' or reader.peek() != '[':
+                                reader.skip_value()
+                                continue
+                            for interface in reader.iter_values():
+                                rap_data = {'modules': [{'interfaces': [interface]}]}
+                                EnhancedDocParser._merge_paths(converted_paths, EnhancedDocParser.convert_rap(rap_data)['paths'])
+                elif key == 'api' and reader.peek() == '[':
+                    for api in reader.iter_values():
+                        EnhancedDocParser._merge_paths(converted_paths, EnhancedDocParser.convert_yapi({'api': [api]})['paths'])
+                else:
+                    header[key] = reader.read_value()
+        yield from EnhancedDocParser._paths_endpoints(converted_paths)
+        
+        if paths_deferred:
+            resolver = RefResolver(header)
+            with open_doc() as f:
+                reader = JsonStreamReader(f)
+                for key in reader.iter_object():
+                    if key == 'paths':
+                        yield from EnhancedDocParser._stream_paths(reader, resolver)
+                    else:
+                        reader.skip_value()
+    
+    @staticmethod
+    def _merge_paths(paths: Dict[str, Any], new_paths: Dict[str, Any]):
+        """将新的paths合并到paths中，同一路径下的同一方法以后者为准"""
+        for path, path_item in new_paths.items():
+            paths.setdefault(path, {}).update(path_item)
+    
+    @staticmethod
+    def _stream_paths(reader: JsonStreamReader, resolver: RefResolver) -> Iterator[Dict[str, Any]]:
+        """逐个读取paths下的路径项并产出接口信息，$ref由共享的解析器解析"""
+        for path in reader.iter_object():
+            yield from EnhancedDocParser._paths_endpoints({path: reader.read_value()}, resolver)
+    
+    @staticmethod
+    def _stream_postman_items(reader: JsonStreamReader, base_path: str = '') -> Iterator[Tuple[Dict[str, Any], str]]:
+        """逐个读取Postman的item数组，文件夹递归流式读取，产出 (请求项, 基础路径)"""
+        for _ in reader.iter_array():
+            if reader.peek() != '{':
+                reader.skip_value()
+                continue
+            item = {}
+            for key in reader.iter_object():
+                if key == 'item' and reader.peek() == '[':
+                    # 文件夹
+                    folder_name = item.get('name', '')
+                    new_base_path = f"{base_path}/{folder_name}" if folder_name else base_path
+                    yield from EnhancedDocParser._stream_postman_items(reader, new_base_path)
+                    item['item'] = []
+                else:
+                    item[key] = reader.read_value()
+            if 'item' not in item and 'request' in item:
+                yield item, base_path
+    
+    @staticmethod
+    def _paths_endpoints(paths: Dict[str, Any], resolver: Optional[RefResolver] = None) -> Iterator[Dict[str, Any]]:
+        """提取一小段paths中的接口信息，没有接口的路径项直接跳过"""
+        for path, path_item in paths.items():
+            if resolver:
+                path_item = resolver.resolve(path_item)
+            if not isinstance(path_item, dict) or not any(
+                    isinstance(method, str) and method.lower() in EndpointCatalog.HTTP_METHODS for method in path_item):
+                continue
+            yield from EndpointCatalog({'paths': {path: path_item}}, resolver)
+    
+    @staticmethod
+    def _load_entry(doc_path: str, parse: Optional[Callable[[str, str], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        读取并解析文档，返回包含doc和endpoints的缓存项
+        
+        Args:
+            doc_path: 文档路径或URL
+            parse: 解析函数，默认为 _parse_entry（批量导入时替换为提交到进程池解析）
+        """
+        parse = parse or EnhancedDocParser._parse_entry
+        try:
+            if not config.get('DOC_CACHE_ENABLED', True):
+                return parse(EnhancedDocParser._read_doc(doc_path), doc_path)
+            return doc_cache.load(doc_path, parse)
+        except DocParseError:
+            raise
+        except Exception as e:
+            error = create_error('DOC_PARSE_FAILED', f'文档解析失败: {str(e)}')
+            raise error
+    
+    @staticmethod
+    def _read_doc(doc_path: str) -> str:
+        """获取文档内容"""
+        if doc_path.startswith('http'):
+            return http_cache.get_text(doc_path)
+        with open(doc_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    @staticmethod
+    def _parse_entry(doc_content: str, doc_path: str) -> Dict[str, Any]:
+        """解析文档内容并提取接口信息，结果用于缓存"""
+        doc = EnhancedDocParser.parse_content(doc_content, doc_path)
+        try:
+            endpoints = EnhancedDocParser.extract_endpoints(doc)
+        except DocParseError:
+            endpoints = None
+        return {'doc': doc, 'endpoints': endpoints}
+    
+    @staticmethod
+    def parse_content(doc_content: str, doc_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        解析文档内容
         
         Args:
             doc_content: 文档内容
-            doc_path: 文档路径（可选）
+            doc_path: 文档路径或URL（可选，用于判断格式）
         
         Returns:
             Dict[str, Any]: 解析后的文档数据
         """
+        # 只解析一次，格式检测与格式转换共用解析结果
+        data = EnhancedDocParser.load_tree(doc_content, doc_path)
+        
+        # 检测文档格式
+        doc_format = EnhancedDocParser.detect_doc_format(doc_content, doc_path, data)
+        logger.info(f"检测到文档格式: {doc_format}")
+        
+        # 根据格式解析
+        if doc_format in ['swagger', 'openapi']:
+            return data
+        elif doc_format == 'postman':
+            return EnhancedDocParser.convert_postman(data)
+        elif doc_format == 'rap':
+            return EnhancedDocParser.convert_rap(data)
+        elif doc_format == 'yapi':
+            return EnhancedDocParser.convert_yapi(data)
+        else:
+            error = create_error('DOC_FORMAT_ERROR', f'不支持的文档格式: {doc_format}')
+            raise error
+    
+    @staticmethod
+    def load_tree(doc_content: str, doc_path: Optional[str] = None) -> Any:
+        """
+        将文档内容解析为Python对象
+        
+        扩展名为yaml/yml时按YAML解析，否则先按JSON解析，失败后再按YAML解析。
+        
+        Args:
+            doc_content: 文档内容
+            doc_path: 文档路径（可选）
+        
+        Returns:
+            Any: 解析后的对象
+        """
         try:
-            # 根据文件扩展名判断解析方式
-            if doc_path and (doc_path.endswith('.yaml') or doc_path.endswith('.yml')):
-                return yaml.safe_load(doc_content)
-            else:
-                # 尝试JSON解析
-                try:
-                    return json.loads(doc_content)
-                except json.JSONDecodeError:
-                    # 尝试YAML解析
-                    return yaml.safe_load(doc_content)
+            if doc_path and get_file_extension(doc_path) in ['yaml', 'yml']:
+                return yaml_io.safe_load(doc_content)
+            try:
+                return json.loads(doc_content)
+            except json.JSONDecodeError:
+                return yaml_io.safe_load(doc_content)
         except Exception as e:
-            error = create_error('DOC_FORMAT_ERROR', f'Swagger文档解析失败: {str(e)}')
+            error = create_error('DOC_FORMAT_ERROR', f'文档内容解析失败: {str(e)}')
             raise error
     
+    @staticmethod
+    def parse_swagger(doc_content: str, doc_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        解析Swagger/OpenAPI文档
+        
+        Args:
+            doc_content: 文档内容
+            doc_path: 文档路径（可选）
+        
+        Returns:
+            Dict[str, Any]: 解析后的文档数据
+        """
+        return EnhancedDocParser.load_tree(doc_content, doc_path)
+    
     @staticmethod
     def parse_postman(doc_content: str) -> Dict[str, Any]:
         """
@@ -139,7 +433,23 @@ class EnhancedDocParser:
         """
         try:
             postman_data = json.loads(doc_content)
-            
+        except Exception as e:
+            error = create_error('DOC_FORMAT_ERROR', f'Postman文档解析失败: {str(e)}')
+            raise error
+        return EnhancedDocParser.convert_postman(postman_data)
+    
+    @staticmethod
+    def convert_postman(postman_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将已解析的Postman Collection文档转换为Swagger格式
+        
+        Args:
+            postman_data: 已解析的Postman Collection文档
+        
+        Returns:
+            Dict[str, Any]: 转换为Swagger格式的文档数据
+        """
+        try:
             # 转换为Swagger格式
             swagger_data = {
                 'swagger': '2.0',
@@ -245,7 +555,23 @@ class EnhancedDocParser:
         """
         try:
             rap_data = json.loads(doc_content)
-            
+        except Exception as e:
+            error = create_error('DOC_FORMAT_ERROR', f'RAP文档解析失败: {str(e)}')
+            raise error
+        return EnhancedDocParser.convert_rap(rap_data)
+    
+    @staticmethod
+    def convert_rap(rap_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将已解析的RAP文档转换为Swagger格式
+        
+        Args:
+            rap_data: 已解析的RAP文档
+        
+        Returns:
+            Dict[str, Any]: 转换为Swagger格式的文档数据
+        """
+        try:
             # 转换为Swagger格式
             swagger_data = {
                 'swagger': '2.0',
@@ -312,7 +638,23 @@ class EnhancedDocParser:
         """
         try:
             yapi_data = json.loads(doc_content)
-            
+        except Exception as e:
+            error = create_error('DOC_FORMAT_ERROR', f'YAPI文档解析失败: {str(e)}')
+            raise error
+        return EnhancedDocParser.convert_yapi(yapi_data)
+    
+    @staticmethod
+    def convert_yapi(yapi_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将已解析的YAPI文档转换为Swagger格式
+        
+        Args:
+            yapi_data: 已解析的YAPI文档
+        
+        Returns:
+            Dict[str, Any]: 转换为Swagger格式的文档数据
+        """
+        try:
             # 转换为Swagger格式
             swagger_data = {
                 'swagger': '2.0',
@@ -369,6 +711,9 @@ class EnhancedDocParser:
         """
         从Swagger文档中提取接口信息
         
+        参数、请求体中的$ref由同一个RefResolver解析，被多个接口引用的组件只解析一次。
+        只需要部分接口时使用 EndpointCatalog 按条件查询。
+        
         Args:
             swagger_doc: Swagger文档数据
         
@@ -376,31 +721,7 @@ class EnhancedDocParser:
             List[Dict[str, Any]]: 接口信息列表
         """
         try:
-            endpoints = []
-            paths = swagger_doc.get('paths', {})
-            
-            if not paths:
-                error = create_error('DOC_PARSE_FAILED', '文档中未找到paths字段')
-                raise error
-            
-            for path, methods in paths.items():
-                for method, details in methods.items():
-                    endpoint = {
-                        'path': path,
-                        'method': method.upper(),
-                        'summary': details.get('summary', ''),
-                        'description': details.get('description', ''),
-                        'parameters': details.get('parameters', []),
-                        'requestBody': details.get('requestBody', {}),
-                        'responses': details.get('responses', {})
-                    }
-                    endpoints.append(endpoint)
-            
-            if not endpoints:
-                error = create_error('DOC_PARSE_FAILED', '文档中未找到有效的接口信息')
-                raise error
-            
-            return endpoints
+            return list(EndpointCatalog(swagger_doc))
         except DocParseError:
             raise
         except Exception as e:
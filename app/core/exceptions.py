@@ -19,6 +19,10 @@ class APIAutomationError(Exception):
         self.solution = solution
         super().__init__(self.message)
     
+    def __reduce__(self):
+        # 跨进程传递（如进程池中抛出）时保留错误代码、详细信息和解决方案
+        return (self.__class__, (self.message,), self.__dict__)
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Any, Optional, TextIO
+from app.core.config import config
+from app.core.session_pool import SessionPool
+from app.utils.common_utils import ensure_dir_exists
+from app.utils.logger import logger
+
+def _accept_encoding() -> str:
+    """当前环境能解压的编码（安装brotli后包含br）"""
+    from urllib3.util import make_headers
+    return make_headers(accept_encoding=True).get('accept-encoding', 'gzip,deflate')
+
+class HttpCache:
+    """
+    远程文档的HTTP缓存（磁盘）
+    
+    响应体解压后保存到磁盘，同时保存ETag、Last-Modified和Cache-Control过期时间。再次获取时：
+    未过期直接使用磁盘上的内容；否则发送If-None-Match/If-Modified-Since条件请求，服务端返回304时使用磁盘上的内容。
+    请求时声明可接受gzip/deflate压缩（安装brotli后还包括br），下载边接收边写入磁盘，不在内存中保留整个响应体。
+    未启用缓存（HTTP_CACHE_ENABLED）或响应不允许缓存（no-store）时，响应体写入系统临时目录，用完后删除，不写入缓存目录。
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, directory: Optional[str] = None, max_entries: Optional[int] = None):
+        """
+        初始化HTTP缓存
+        
+        Args:
+            directory: 缓存目录，默认读取 HTTP_CACHE_DIR
+            max_entries: 缓存的响应数，超过后删除最久未使用的，默认读取 HTTP_CACHE_MAX_ENTRIES
+        """
+        self.directory = os.path.abspath(directory or config.get('HTTP_CACHE_DIR', '.http_cache'))
+        self.max_entries = max_entries or config.get('HTTP_CACHE_MAX_ENTRIES', 256)
+        # 全局缓存对象被批量导入的线程池反复调用，按线程创建会话会使每个用过的线程都留下一个会话和连接池，
+        # 这里所有线程共用一个会话（连接池线程安全，条件请求不依赖会话状态）
+        self._sessions = SessionPool(pool_size=config.get('BATCH_IMPORT_FETCH_THREADS', 16), per_thread=False)
+        self._lock = threading.Lock()
+        self._accept_encoding = None
+    
+    def _entry_path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + suffix)
+    
+    def _load_meta(self, url: str) -> Dict[str, Any]:
+        """读取缓存元数据，响应体文件已不存在时视为未缓存"""
+        try:
+            with open(self._entry_path(url, '.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if meta.get('url') != url or not os.path.exists(self._entry_path(url, '.body')):
+            return {}
+        return meta
+    
+    def fetch(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        获取URL内容，响应体保存在磁盘上
+        
+        Args:
+            url: URL
+            timeout: 超时时间（秒），默认读取 DEFAULT_TIMEOUT
+        
+        Returns:
+            Dict[str, Any]: path（响应体文件）、encoding、status（200、304，或未发送请求时为None）、from_cache、
+                temporary（为True时响应体未缓存，path为临时文件，由调用方用完后删除）
+        """
+        timeout = timeout or config.get('DEFAULT_TIMEOUT', 30)
+        enabled = config.get('HTTP_CACHE_ENABLED', True)
+        meta = self._load_meta(url) if enabled else {}
+        body_path = self._entry_path(url, '.body')
+        
+        if meta and meta.get('expires', 0) > time.time():
+            logger.info(f"缓存未过期，使用缓存内容: {url}")
+            return self._hit(meta, body_path, None)
+        
+        headers = {'Accept-Encoding': self._get_accept_encoding()}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        
+        session = self._sessions.get_session(url)
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta:
+                logger.info(f"内容未变化（304），使用缓存内容: {url}")
+                meta['expires'] = self._expires(response.headers)
+                self._save_meta(url, meta)
+                return self._hit(meta, body_path, 304)
+            response.raise_for_status()
+            
+            cache_control = response.headers.get('Cache-Control', '').lower()
+            store = enabled and 'no-store' not in cache_control
+            if store:
+                # 先写临时文件再替换，避免并发读取到写了一半的响应体
+                ensure_dir_exists(self.directory)
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            else:
+                fd, tmp_path = tempfile.mkstemp(prefix='api_automation_http_', suffix='.body')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    # iter_content按Content-Encoding自动解压
+                    for chunk in response.iter_content(self.CHUNK_SIZE):
+                        f.write(chunk)
+                if store:
+                    os.replace(tmp_path, body_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'encoding': self._encoding(response),
+                'expires': self._expires(response.headers)
+            }
+        if not store:
+            return {'path': tmp_path, 'encoding': meta['encoding'], 'status': response.status_code, 'from_cache': False,
+                    'temporary': True}
+        self._save_meta(url, meta)
+        self._prune()
+        return {'path': body_path, 'encoding': meta['encoding'], 'status': response.status_code, 'from_cache': False,
+                'temporary': False}
+    
+    def get_text(self, url: str, timeout: Optional[float] = None) -> str:
+        """
+        获取URL内容（文本）
+        
+        Args:
+            url: URL
+            timeout: 超时时间（秒）
+        
+        Returns:
+            str: 响应内容
+        """
+        result = self.fetch(url, timeout)
+        try:
+            with open(result['path'], 'r', encoding=result['encoding'], errors='replace') as f:
+                return f.read()
+        finally:
+            if result['temporary']:
+                self.discard(result)
+    
+    def open(self, url: str, timeout: Optional[float] = None) -> TextIO:
+        """
+        获取URL内容并以文本模式打开缓存的响应体，用于流式解析
+        
+        Args:
+            url: URL
+            timeout: 超时时间（秒）
+        
+        Returns:
+            TextIO: 文件对象，由调用方关闭
+        """
+        result = self.fetch(url, timeout)
+        if not result['temporary']:
+            return open(result['path'], 'r', encoding=result['encoding'], errors='replace')
+        if os.name == 'nt':
+            # Windows不能删除已打开的文件，以O_TEMPORARY打开，关闭时由系统删除
+            fd = os.open(result['path'], os.O_RDONLY | os.O_TEMPORARY)
+            return open(fd, 'r', encoding=result['encoding'], errors='replace')
+        f = open(result['path'], 'r', encoding=result['encoding'], errors='replace')
+        # 已打开的文件删除后仍可读取
+        self.discard(result)
+        return f
+    
+    @staticmethod
+    def discard(result: Dict[str, Any]):
+        """
+        删除 fetch 返回的未缓存的临时响应体文件（缓存中的文件不删除）
+        
+        Args:
+            result: fetch 的返回值
+        """
+        if result.get('temporary'):
+            try:
+                os.remove(result['path'])
+            except OSError:
+                pass
+    
+    def clear(self):
+        """清空缓存"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+    
+    def _get_accept_encoding(self) -> str:
+        if self._accept_encoding is None:
+            self._accept_encoding = _accept_encoding()
+        return self._accept_encoding
+    
+    @staticmethod
+    def _encoding(response) -> str:
+        """响应的文本编码：Content-Type中未声明charset时按UTF-8（requests对text/*默认ISO-8859-1，会导致中文乱码）"""
+        if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+            return response.encoding
+        return 'utf-8'
+    
+    def _hit(self, meta: Dict[str, Any], body_path: str, status: Optional[int]) -> Dict[str, Any]:
+        # 更新修改时间，清理时按最近使用时间淘汰
+        try:
+            os.utime(body_path, None)
+        except OSError:
+            pass
+        return {'path': body_path, 'encoding': meta.get('encoding') or 'utf-8', 'status': status, 'from_cache': True,
+                'temporary': False}
+    
+    @staticmethod
+    def _expires(headers) -> float:
+        """根据Cache-Control的max-age计算过期时间，no-cache/no-store时为0（每次都发送条件请求）"""
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-cache' in cache_control or 'no-store' in cache_control:
+            return 0
+        for directive in cache_control.split(','):
+            name, _, value = directive.strip().partition('=')
+            if name == 'max-age' and value.strip().isdigit():
+                return time.time() + int(value.strip())
+        return 0
+    
+    def _save_meta(self, url: str, meta: Dict[str, Any]):
+        """写入元数据（写入失败时只是下次不能发送条件请求）"""
+        path = self._entry_path(url, '.json')
+        try:
+            ensure_dir_exists(self.directory)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                os.replace(tmp_path, path)
+            except OSError:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"写入HTTP缓存失败: {str(e)}")
+    
+    def _prune(self):
+        """缓存超过上限时删除最久未使用的响应"""
+        with self._lock:
+            bodies = []
+            for name in os.listdir(self.directory):
+                if name.endswith('.body'):
+                    path = os.path.join(self.directory, name)
+                    try:
+                        bodies.append((os.path.getmtime(path), path))
+                    except OSError:
+                        pass
+            if len(bodies) <= self.max_entries:
+                return
+            bodies.sort()
+            for _, path in bodies[:len(bodies) - self.max_entries]:
+                for entry_path in (path, path[:-len('.body')] + '.json'):
+                    try:
+                        os.remove(entry_path)
+                    except OSError:
+                        pass
+
+# 全局HTTP缓存实例
+http_cache = HttpCache()
@@ -0,0 +1,153 @@
+import math
+from typing import Dict, Any, List, Optional
+
+class LatencyHistogram:
+    """
+    延迟直方图（HDR风格的对数-线性分桶）
+    
+    数值以微秒为单位记录。小于 2^(sub_bucket_bits+1) 的数值精确计数，更大的数值按2的幂分组，
+    每组再线性细分为 2^sub_bucket_bits 个桶，相对误差不超过 1/2^sub_bucket_bits。
+    桶数组长度固定，与记录的样本数无关；同参数的直方图可以直接相加合并。
+    """
+    
+    PERCENTILES = [50, 90, 95, 99, 99.9]
+    
+    def __init__(self, sub_bucket_bits: int = 7, max_value: int = 3600 * 1000 * 1000):
+        """
+        初始化直方图
+        
+        Args:
+            sub_bucket_bits: 每组的细分位数，7表示相对误差小于1%
+            max_value: 可区分的最大值（微秒），超过的数值计入最后一个桶，默认1小时
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value = max_value
+        self._sub_bucket_count = 1 << sub_bucket_bits
+        self._counts: List[int] = [0] * (self._index_of(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+    
+    def _index_of(self, value: int) -> int:
+        """计算数值所在的桶"""
+        group = max(value.bit_length() - self.sub_bucket_bits, 1)
+        return self._sub_bucket_count * group + (value >> (group - 1)) - self._sub_bucket_count
+    
+    def _highest_value_of(self, index: int) -> int:
+        """桶内可表示的最大值"""
+        group = max(index // self._sub_bucket_count, 1)
+        lowest = (index - self._sub_bucket_count * group + self._sub_bucket_count) << (group - 1)
+        return lowest + (1 << (group - 1)) - 1
+    
+    def record_value(self, value: int, count: int = 1):
+        """
+        记录数值
+        
+        Args:
+            value: 数值（微秒）
+            count: 次数
+        """
+        value = max(int(value), 0)
+        index = min(self._index_of(min(value, self.max_value)), len(self._counts) - 1)
+        self._counts[index] += count
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+    
+    def record(self, seconds: float, count: int = 1):
+        """记录以秒为单位的延迟"""
+        self.record_value(int(round(seconds * 1000000)), count)
+    
+    def value_at_percentile(self, percentile: float) -> int:
+        """
+        获取百分位数（微秒）
+        
+        Args:
+            percentile: 百分位，0-100
+        
+        Returns:
+            int: 该百分位所在桶的上界（不超过实际最大值）
+        """
+        if self.count == 0:
+            return 0
+        target = max(int(math.ceil(percentile / 100 * self.count)), 1)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._highest_value_of(index), self.max)
+        return self.max
+    
+    @property
+    def mean(self) -> float:
+        """平均值（微秒）"""
+        return self.total / self.count if self.count else 0
+    
+    def summary(self, percentiles: Optional[List[float]] = None) -> Dict[str, float]:
+        """
+        生成摘要，时间单位为秒
+        
+        Returns:
+            Dict[str, float]: count/mean/min/各百分位/max
+        """
+        summary = {
+            'count': self.count,
+            'mean': self.mean / 1000000,
+            'min': self.min / 1000000
+        }
+        for p in percentiles or self.PERCENTILES:
+            summary[f'p{p:g}'] = self.value_at_percentile(p) / 1000000
+        summary['max'] = self.max / 1000000
+        return summary
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """
+        合并另一个直方图（原地修改）
+        
+        Args:
+            other: 参数相同的直方图
+        
+        Returns:
+            LatencyHistogram: self
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits or other.max_value != self.max_value:
+            raise ValueError('只能合并参数相同的直方图')
+        if other.count == 0:
+            return self
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化为字典（只保存非空桶）"""
+        return {
+            'sub_bucket_bits': self.sub_bucket_bits,
+            'max_value': self.max_value,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'counts': {str(index): bucket_count for index, bucket_count in enumerate(self._counts) if bucket_count}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        """从字典恢复直方图"""
+        histogram = cls(data.get('sub_bucket_bits', 7), data.get('max_value', 3600 * 1000 * 1000))
+        for index, bucket_count in data.get('counts', {}).items():
+            histogram._counts[int(index)] = bucket_count
+        histogram.count = data.get('count', 0)
+        histogram.total = data.get('total', 0)
+        histogram.min = data.get('min', 0)
+        histogram.max = data.get('max', 0)
+        return histogram
@@ -0,0 +1,163 @@
+import bisect
+import itertools
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from app.core.config import config
+from app.core.exceptions import create_error
+from app.core.test_executor import TestExecutor
+from app.core.request_template import RequestTemplate
+from app.core.latency_histogram import LatencyHistogram
+from app.utils.logger import logger
+
+class LoadGenerator:
+    """开环压测：按目标RPS在固定时长内回放测试用例的加权组合"""
+    
+    def __init__(self, base_url: str = '', target_rps: Optional[float] = None, duration: Optional[float] = None,
+                 max_workers: Optional[int] = None, seed: Optional[int] = None):
+        """
+        初始化压测生成器
+        
+        Args:
+            base_url: 基础URL
+            target_rps: 目标每秒请求数，默认读取 LOAD_TARGET_RPS
+            duration: 持续时间（秒），默认读取 LOAD_DURATION
+            max_workers: 发送请求的最大线程数，默认读取 LOAD_MAX_WORKERS
+            seed: 随机种子，用于复现用例选择顺序
+        """
+        self.target_rps = target_rps or config.get('LOAD_TARGET_RPS', 10)
+        self.duration = duration or config.get('LOAD_DURATION', 60)
+        self.max_workers = max_workers or config.get('LOAD_MAX_WORKERS', 200)
+        self.random = random.Random(seed)
+        self.logger = logger
+        
+        # 复用TestExecutor.execute_test_case的请求与结果语义；重试会放大负载，默认关闭
+        self.executor = TestExecutor(base_url)
+        self.executor.retry_count = config.get('LOAD_RETRY_COUNT', 0)
+        # 按目标RPS发送时逐个记录INFO日志会淹没日志，单个请求的开始和完成只记录DEBUG日志
+        self.executor.log_each_case = False
+        
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """重置统计数据"""
+        self._latency = LatencyHistogram()
+        self._service_time = LatencyHistogram()
+        self._status_codes: Dict[str, int] = {}
+        self._case_stats: Dict[str, Dict[str, int]] = {}
+        self._completed = 0
+        self._errors = 0
+        self._no_response = 0
+        self._last_finish = 0.0
+    
+    def run(self, test_cases: List[Dict[str, Any]], weights: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        执行压测
+        
+        请求按计划时间发出，不等待前一个请求完成，服务变慢时不会降低施加的负载。
+        延迟从计划发出时间开始计算，包含在本地排队的时间，以修正协调遗漏（coordinated omission）。
+        
+        Args:
+            test_cases: 测试用例列表
+            weights: 各用例权重，默认使用测试用例的weight字段（缺省为1）
+        
+        Returns:
+            Dict[str, Any]: 压测结果摘要
+        """
+        if not test_cases:
+            error = create_error('TEST_CASE_INVALID', '压测需要至少一个测试用例')
+            raise error
+        if weights is None:
+            weights = [test_case.get('weight', 1) for test_case in test_cases]
+        if len(weights) != len(test_cases) or any(w < 0 for w in weights) or sum(weights) <= 0:
+            error = create_error('TEST_CASE_INVALID', '测试用例权重无效：数量需与用例一致，且不能为负数或全部为0')
+            raise error
+        
+        cumulative = list(itertools.accumulate(weights))
+        total_weight = cumulative[-1]
+        interval = 1.0 / self.target_rps
+        total_requests = int(math.ceil(self.duration * self.target_rps))
+        
+        # 每个用例只编译一次请求模板，重复发送时复用
+        templates = [self.executor.compile_request(test_case) for test_case in test_cases]
+        
+        self._reset()
+        self.logger.info(f"开始压测: 目标 {self.target_rps} RPS，持续 {self.duration}s，共计划 {total_requests} 个请求")
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        start = time.perf_counter()
+        try:
+            for n in range(total_requests):
+                intended = start + n * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                index = bisect.bisect_right(cumulative, self.random.random() * total_weight)
+                index = min(index, len(test_cases) - 1)
+                pool.submit(self._fire, test_cases[index], templates[index], intended)
+            schedule_end = time.perf_counter()
+        finally:
+            pool.shutdown(wait=True)
+            self.executor.close()
+        
+        return self._summarize(start, schedule_end, total_requests)
+    
+    def _fire(self, test_case: Dict[str, Any], template: RequestTemplate, intended: float):
+        """发送一个请求并记录延迟"""
+        try:
+            result = self.executor.execute_test_case(test_case, template)
+        except Exception as e:
+            result = self.executor.build_error_result(str(e), 0)
+        finished = time.perf_counter()
+        
+        case_id = test_case.get('id', 'unknown')
+        status_code = str(result['status_code'])
+        with self._lock:
+            self._completed += 1
+            self._last_finish = max(self._last_finish, finished)
+            self._latency.record(finished - intended)
+            if result['status_code']:
+                self._service_time.record(result['response_time'])
+            else:
+                # 连接失败、超时等没有收到响应，响应时间为0，不计入服务端响应时间
+                self._no_response += 1
+            self._status_codes[status_code] = self._status_codes.get(status_code, 0) + 1
+            case_stats = self._case_stats.setdefault(case_id, {'total': 0, 'failed': 0})
+            case_stats['total'] += 1
+            if not result['success']:
+                self._errors += 1
+                case_stats['failed'] += 1
+    
+    def _summarize(self, start: float, schedule_end: float, scheduled: int) -> Dict[str, Any]:
+        """汇总压测结果"""
+        # 最后一个请求在 duration - 1/rps 时发出，时长不足计划时长时按计划时长计算
+        elapsed = max(self._last_finish - start, schedule_end - start, self.duration)
+        schedule_span = max(schedule_end - start, self.duration)
+        summary = {
+            'target_rps': self.target_rps,
+            'duration': self.duration,
+            'scheduled': scheduled,
+            'completed': self._completed,
+            'errors': self._errors,
+            'error_rate': (self._errors / self._completed * 100) if self._completed else 0,
+            # 没有收到响应的请求数（已计入errors）
+            'no_response': self._no_response,
+            'offered_rps': scheduled / schedule_span if schedule_span > 0 else 0,
+            'achieved_rps': self._completed / elapsed if elapsed > 0 else 0,
+            'elapsed': elapsed,
+            # 从计划发出时间计算的延迟（已修正协调遗漏）
+            'latency': self._latency.summary(),
+            # 服务端响应时间（未修正，仅供对比），只统计收到响应的请求
+            'service_time': self._service_time.summary(),
+            # 序列化的直方图，多个压测节点的结果可以合并
+            'latency_histogram': self._latency.to_dict(),
+            'status_codes': self._status_codes,
+            'case_stats': self._case_stats
+        }
+        self.logger.info(f"压测完成: 计划 {scheduled} 个请求，完成 {self._completed} 个，失败 {self._errors} 个，"
+                         f"实际吞吐 {summary['achieved_rps']:.2f} RPS，p99延迟 {summary['latency']['p99']:.3f}s")
+        return summary
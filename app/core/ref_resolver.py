@@ -0,0 +1,196 @@
+from typing import Dict, Any, List, Optional
+from app.core.config import config
+from app.utils.logger import logger
+
+class RefResolver:
+    """
+    OpenAPI/Swagger文档内$ref解析器
+    
+    按JSON Pointer查找被引用的组件，不涉及循环引用的$ref只解析一次并缓存结果，被多个接口引用的schema共享同一个对象，
+    解析总耗时与文档大小成线性关系。循环引用在同一条展开路径上达到最大深度后截断，截断处以
+    x-circular-ref标记；解析后的schema带有x-ref字段，生成用例时可以按引用缓存示例数据。
+    """
+    
+    # 值为子schema或子schema列表的关键字
+    SCHEMA_KEYS = {'items', 'additionalProperties', 'allOf', 'anyOf', 'oneOf', 'not'}
+    # 值为 名称 -> 子schema 映射的关键字
+    SCHEMA_MAP_KEYS = {'properties', 'patternProperties'}
+    
+    def __init__(self, document: Dict[str, Any], max_depth: Optional[int] = None):
+        """
+        初始化解析器
+        
+        Args:
+            document: 已解析的文档
+            max_depth: 同一$ref在一条展开路径上最多展开的次数，默认读取 REF_MAX_DEPTH
+        """
+        self.document = document
+        self.max_depth = max_depth or config.get('REF_MAX_DEPTH', 1)
+        self._targets: Dict[str, Any] = {}
+        # 展开时没有截断循环引用的结果，与从哪里展开无关，任何位置都可以复用
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        # 在最外层展开且截断过循环引用的结果，截断位置取决于展开路径，只在最外层复用
+        self._outer_schemas: Dict[str, Dict[str, Any]] = {}
+        self._expanding: Dict[str, int] = {}
+        # 已截断的次数，展开前后比较即可知道子schema中是否有截断
+        self._cuts = 0
+    
+    def lookup(self, ref: str) -> Any:
+        """
+        查找$ref指向的原始内容（结果缓存）
+        
+        Args:
+            ref: 引用，如 #/components/schemas/Pet
+        
+        Returns:
+            Any: 被引用的内容，无法解析时返回None
+        """
+        if ref in self._targets:
+            return self._targets[ref]
+        
+        target = None
+        if ref.startswith('#'):
+            target = self.document
+            for token in ref[1:].split('/')[1:]:
+                token = token.replace('~1', '/').replace('~0', '~')
+                if isinstance(target, dict) and token in target:
+                    target = target[token]
+                elif isinstance(target, list) and token.isdigit() and int(token) < len(target):
+                    target = target[int(token)]
+                else:
+                    target = None
+                    break
+        if target is None:
+            logger.warning(f"无法解析引用: {ref}")
+        self._targets[ref] = target
+        return target
+    
+    def resolve(self, node: Any) -> Any:
+        """
+        浅解析：沿$ref链找到实际内容（用于参数、请求体、响应等组件）
+        
+        Args:
+            node: 可能包含$ref的节点
+        
+        Returns:
+            Any: 实际内容，无法解析或循环引用时返回空字典
+        """
+        seen = set()
+        while isinstance(node, dict) and '$ref' in node:
+            ref = node['$ref']
+            if ref in seen:
+                logger.warning(f"检测到循环引用: {ref}")
+                return {}
+            seen.add(ref)
+            target = self.lookup(ref)
+            if target is None:
+                return {}
+            node = target
+        return node
+    
+    def resolve_schema(self, schema: Any) -> Any:
+        """
+        深度解析schema中的$ref
+        
+        Args:
+            schema: schema
+        
+        Returns:
+            Any: 解析后的schema，被引用的部分带有x-ref字段
+        """
+        if isinstance(schema, list):
+            return [self.resolve_schema(item) for item in schema]
+        if not isinstance(schema, dict):
+            return schema
+        
+        ref = schema.get('$ref')
+        if isinstance(ref, str):
+            return self._resolve_ref_schema(ref, schema)
+        
+        resolved = {}
+        for key, value in schema.items():
+            if key in self.SCHEMA_MAP_KEYS and isinstance(value, dict):
+                resolved[key] = {name: self.resolve_schema(item) for name, item in value.items()}
+            elif key in self.SCHEMA_KEYS:
+                resolved[key] = self.resolve_schema(value)
+            else:
+                resolved[key] = value
+        return resolved
+    
+    def _resolve_ref_schema(self, ref: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """解析一个$ref schema，结果按引用缓存（见 _schemas、_outer_schemas）"""
+        siblings = {key: value for key, value in schema.items() if key != '$ref'}
+        cached = self._schemas.get(ref)
+        if cached is None and not self._expanding:
+            cached = self._outer_schemas.get(ref)
+        if cached is not None:
+            return dict(cached, **siblings) if siblings else cached
+        
+        depth = self._expanding.get(ref, 0)
+        target = self.lookup(ref)
+        if not isinstance(target, dict):
+            return dict(siblings, **{'x-ref': ref})
+        if depth >= self.max_depth:
+            # 循环引用：截断，只保留类型信息
+            self._cuts += 1
+            return {'type': target.get('type', 'object'), 'x-ref': ref, 'x-circular-ref': ref}
+        
+        cuts = self._cuts
+        self._expanding[ref] = depth + 1
+        try:
+            resolved = self.resolve_schema(target)
+        finally:
+            if depth:
+                self._expanding[ref] = depth
+            else:
+                del self._expanding[ref]
+        
+        if not isinstance(resolved, dict):
+            return resolved
+        resolved = dict(resolved)
+        resolved['x-ref'] = ref
+        if self._cuts == cuts:
+            self._schemas[ref] = resolved
+        elif not self._expanding:
+            self._outer_schemas[ref] = resolved
+        return dict(resolved, **siblings) if siblings else resolved
+    
+    def resolve_parameters(self, parameters: List[Any]) -> List[Dict[str, Any]]:
+        """
+        解析参数列表中的$ref，body参数的schema同时做深度解析
+        
+        Args:
+            parameters: 参数列表
+        
+        Returns:
+            List[Dict[str, Any]]: 解析后的参数列表
+        """
+        resolved = []
+        for param in parameters or []:
+            param = self.resolve(param)
+            if not isinstance(param, dict) or not param:
+                continue
+            if 'schema' in param:
+                param = dict(param, schema=self.resolve_schema(param['schema']))
+            resolved.append(param)
+        return resolved
+    
+    def resolve_request_body(self, request_body: Any) -> Dict[str, Any]:
+        """
+        解析请求体（OpenAPI 3）中的$ref
+        
+        Args:
+            request_body: 请求体定义
+        
+        Returns:
+            Dict[str, Any]: 解析后的请求体，各媒体类型的schema做深度解析
+        """
+        request_body = self.resolve(request_body)
+        if not isinstance(request_body, dict) or 'content' not in request_body:
+            return request_body or {}
+        content = {}
+        for media_type, media in request_body['content'].items():
+            if isinstance(media, dict) and 'schema' in media:
+                media = dict(media, schema=self.resolve_schema(media['schema']))
+            content[media_type] = media
+        return dict(request_body, content=content)
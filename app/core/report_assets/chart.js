@@ -0,0 +1,128 @@
+/* 离线报告图表：兼容报告中用到的Chart.js柱状图配置（labels、datasets、坐标轴标题） */
+(function(global) {
+    'use strict';
+
+    function Chart(ctx, config) {
+        this.ctx = ctx;
+        this.canvas = ctx.canvas;
+        this.config = config;
+        var self = this;
+        this.draw();
+        if (config.options && config.options.responsive !== false) {
+            global.addEventListener('resize', function() { self.draw(); });
+        }
+    }
+
+    Chart.prototype.draw = function() {
+        var canvas = this.canvas;
+        var ctx = this.ctx;
+        var data = this.config.data || {};
+        var labels = data.labels || [];
+        var datasets = data.datasets || [];
+        var scales = (this.config.options && this.config.options.scales) || {};
+        var ratio = global.devicePixelRatio || 1;
+
+        // 按容器大小设置画布
+        var parent = canvas.parentNode;
+        var width = parent.clientWidth || 600;
+        var height = parent.clientHeight || 300;
+        canvas.style.width = width + 'px';
+        canvas.style.height = height + 'px';
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+        ctx.font = '12px sans-serif';
+
+        var max = 0;
+        datasets.forEach(function(dataset) {
+            (dataset.data || []).forEach(function(value) { max = Math.max(max, value); });
+        });
+        var step = niceStep(max);
+        var top = Math.max(step * Math.ceil(max / step), step);
+
+        var left = 60, right = 10, upper = 30, lower = 50;
+        var plotWidth = width - left - right;
+        var plotHeight = height - upper - lower;
+
+        // 图例
+        var x = left;
+        datasets.forEach(function(dataset) {
+            ctx.fillStyle = dataset.backgroundColor;
+            ctx.fillRect(x, 8, 30, 12);
+            ctx.strokeStyle = dataset.borderColor;
+            ctx.strokeRect(x, 8, 30, 12);
+            ctx.fillStyle = '#666';
+            ctx.textAlign = 'left';
+            ctx.textBaseline = 'middle';
+            ctx.fillText(dataset.label || '', x + 36, 14);
+            x += 46 + ctx.measureText(dataset.label || '').width;
+        });
+
+        // Y轴刻度与网格
+        ctx.textAlign = 'right';
+        ctx.textBaseline = 'middle';
+        for (var tick = 0; tick <= top; tick += step) {
+            var y = upper + plotHeight - tick / top * plotHeight;
+            ctx.strokeStyle = '#e5e5e5';
+            ctx.beginPath();
+            ctx.moveTo(left, y);
+            ctx.lineTo(left + plotWidth, y);
+            ctx.stroke();
+            ctx.fillStyle = '#666';
+            ctx.fillText(String(tick), left - 6, y);
+        }
+
+        // 柱形
+        var groupWidth = labels.length ? plotWidth / labels.length : plotWidth;
+        var barWidth = groupWidth * 0.8 / Math.max(datasets.length, 1);
+        labels.forEach(function(label, i) {
+            var groupLeft = left + i * groupWidth + groupWidth * 0.1;
+            datasets.forEach(function(dataset, j) {
+                var value = (dataset.data || [])[i] || 0;
+                var barHeight = value / top * plotHeight;
+                var barLeft = groupLeft + j * barWidth;
+                var barTop = upper + plotHeight - barHeight;
+                ctx.fillStyle = dataset.backgroundColor;
+                ctx.fillRect(barLeft, barTop, barWidth, barHeight);
+                ctx.strokeStyle = dataset.borderColor;
+                ctx.lineWidth = dataset.borderWidth || 1;
+                ctx.strokeRect(barLeft, barTop, barWidth, barHeight);
+            });
+            ctx.fillStyle = '#666';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'top';
+            ctx.fillText(String(label), left + i * groupWidth + groupWidth / 2, upper + plotHeight + 6);
+        });
+
+        // 坐标轴标题
+        ctx.fillStyle = '#666';
+        if (scales.x && scales.x.title && scales.x.title.display) {
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'bottom';
+            ctx.fillText(scales.x.title.text, left + plotWidth / 2, height - 4);
+        }
+        if (scales.y && scales.y.title && scales.y.title.display) {
+            ctx.save();
+            ctx.translate(14, upper + plotHeight / 2);
+            ctx.rotate(-Math.PI / 2);
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            ctx.fillText(scales.y.title.text, 0, 0);
+            ctx.restore();
+        }
+    };
+
+    // 取1、2、5乘以10的幂作为刻度间隔，约5个刻度
+    function niceStep(max) {
+        if (max <= 5) {
+            return 1;
+        }
+        var raw = max / 5;
+        var power = Math.pow(10, Math.floor(Math.log(raw) / Math.LN10));
+        var scaled = raw / power;
+        return (scaled <= 1 ? 1 : scaled <= 2 ? 2 : scaled <= 5 ? 5 : 10) * power;
+    }
+
+    global.Chart = Chart;
+})(window);
@@ -1,52 +1,253 @@
+import io
+import os
 import json
 import html
+import functools
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO
+from app.core.config import config
+from app.core.body_spool import load_response_text
+from app.core.exceptions import create_error
+from app.core.run_statistics import RunStatistics
+from app.utils.common_utils import ensure_dir_exists
+from app.utils import jsonl, binary_records
+
+# 离线报告使用的静态资源目录
+REPORT_ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_assets')
+
+@functools.lru_cache(maxsize=None)
+def load_report_asset(name: str) -> str:
+    """
+    读取报告静态资源，同一进程内只读取一次
+    
+    Args:
+        name: 资源文件名，如 report.css、chart.js
+    
+    Returns:
+        str: 资源内容
+    """
+    with open(os.path.join(REPORT_ASSET_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
 
 class ReportGenerator:
     @staticmethod
-    def generate_html_report(results: List[Dict[str, Any]]) -> str:
-        """生成HTML格式的测试报告（增强版）"""
-        total = len(results)
-        passed = sum(1 for r in results if r['success'])
-        failed = total - passed
+    def generate_html_report(results: Iterable[Dict[str, Any]], statistics: Optional[RunStatistics] = None,
+                             offline: Optional[bool] = None) -> str:
+        """
+        生成HTML格式的测试报告（增强版）
+        
+        Args:
+            results: 测试结果列表
+            statistics: 已累计的运行统计，为空时根据results计算
+            offline: 是否内联静态资源，默认读取 REPORT_OFFLINE_ASSETS
+        """
+        output = io.StringIO()
+        ReportGenerator.write_html_report(results, output, statistics, offline)
+        return output.getvalue()
+    
+    @staticmethod
+    def write_html_report(results: Iterable[Dict[str, Any]], fp: TextIO, statistics: Optional[RunStatistics] = None,
+                          offline: Optional[bool] = None) -> RunStatistics:
+        """
+        将HTML报告逐段写入文件对象
         
-        # 计算成功率
-        success_rate = (passed / total * 100) if total > 0 else 0
+        测试详情逐条写出，同时累计统计；摘要和图表在所有结果写完后追加，页面上通过CSS显示在详情之前。
+        内存占用与结果数量无关，results可以是惰性迭代器（如TestExecutor.iter_test_cases）。
         
-        # 计算平均响应时间
-        avg_response_time = sum(r['response_time'] for r in results if r['response_time'] > 0) / len([r for r in results if r['response_time'] > 0]) if results else 0
+        Args:
+            results: 测试结果
+            fp: 可写的文本文件对象
+            statistics: 已累计的运行统计，为空时在写出过程中计算
+            offline: 是否内联静态资源，默认读取 REPORT_OFFLINE_ASSETS
+        
+        Returns:
+            RunStatistics: 报告使用的运行统计
+        """
+        accumulate = statistics is None
+        if accumulate:
+            statistics = RunStatistics()
         
-        # 按方法统计
-        method_stats = {}
+        fp.write(ReportGenerator._generate_html_head(offline))
+        fp.write("""
+            <!-- 测试详情 -->
+            <div class="report-details bg-white p-4 rounded-lg shadow-sm">
+                <h2 class="text-secondary mb-4">测试详情</h2>
+""")
         for result in results:
+            if accumulate:
+                statistics.add(result)
+            fp.write(ReportGenerator._generate_enhanced_result_row(result))
+        fp.write("""
+            </div>
+""")
+        fp.write(ReportGenerator._generate_html_summary(statistics))
+        fp.write(ReportGenerator._generate_html_tail(statistics.chart_data()))
+        return statistics
+    
+    @staticmethod
+    def write_paged_html_report(results: Iterable[Dict[str, Any]], directory: str, statistics: Optional[RunStatistics] = None,
+                                page_size: Optional[int] = None, offline: Optional[bool] = None) -> str:
+        """
+        生成分页HTML报告目录
+        
+        index.html中只有摘要和一页结果的简表，请求与响应详情按页写入 data/page-N.js，
+        翻页或点击结果时才加载和渲染。数据文件以script标签加载，整个目录可以离线直接打开。
+        
+        Args:
+            results: 测试结果（可以是惰性迭代器）
+            directory: 报告目录
+            statistics: 已累计的运行统计，为空时在写出过程中计算
+            page_size: 每页结果数，默认读取 REPORT_PAGE_SIZE
+            offline: 是否内联静态资源，默认读取 REPORT_OFFLINE_ASSETS
+        
+        Returns:
+            str: index.html路径
+        """
+        page_size = page_size or config.get('REPORT_PAGE_SIZE', 100)
+        accumulate = statistics is None
+        if accumulate:
+            statistics = RunStatistics()
+        
+        data_dir = os.path.join(directory, 'data')
+        ensure_dir_exists(data_dir)
+        
+        # 逐页写出数据文件，内存中只保留当前页
+        page_count = 0
+        page = {'rows': [], 'details': []}
+        for result in results:
+            if accumulate:
+                statistics.add(result)
             test_case = result.get('test_case', {})
-            method = test_case.get('method', 'UNKNOWN')
-            if method not in method_stats:
-                method_stats[method] = {'total': 0, 'passed': 0, 'failed': 0}
-            method_stats[method]['total'] += 1
-            if result['success']:
-                method_stats[method]['passed'] += 1
-            else:
-                method_stats[method]['failed'] += 1
-        
-        # 生成统计图表数据
-        chart_data = {
-            'labels': list(method_stats.keys()),
-            'passed': [method_stats[m]['passed'] for m in method_stats],
-            'failed': [method_stats[m]['failed'] for m in method_stats]
-        }
+            page['rows'].append([
+                test_case.get('id', ''),
+                test_case.get('name', ''),
+                test_case.get('method', ''),
+                test_case.get('path', ''),
+                result.get('status_code', 0),
+                bool(result['success']),
+                result.get('response_time', 0)
+            ])
+            page['details'].append(ReportGenerator._generate_enhanced_result_row(result))
+            if len(page['rows']) >= page_size:
+                ReportGenerator._write_report_page(data_dir, page_count, page)
+                page_count += 1
+                page = {'rows': [], 'details': []}
+        if page['rows']:
+            ReportGenerator._write_report_page(data_dir, page_count, page)
+            page_count += 1
         
-        # 生成报告内容
-        html_content = f"""
+        index_path = os.path.join(directory, 'index.html')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(ReportGenerator._generate_html_head(offline))
+            f.write(ReportGenerator._generate_paged_details())
+            f.write(ReportGenerator._generate_html_summary(statistics))
+            f.write(ReportGenerator._generate_html_tail(statistics.chart_data(), ReportGenerator._generate_paged_script(page_count)))
+        return index_path
+    
+    @staticmethod
+    def _write_report_page(data_dir: str, index: int, page: Dict[str, Any]):
+        """写出一页结果数据（JSONP格式，由index.html中的reportPage函数接收）"""
+        with open(os.path.join(data_dir, f'page-{index}.js'), 'w', encoding='utf-8') as f:
+            f.write(f'reportPage({index}, ')
+            json.dump(page, f, ensure_ascii=False)
+            f.write(');\n')
+    
+    @staticmethod
+    def _generate_paged_details() -> str:
+        """生成分页报告的结果简表与详情区域"""
+        return """
+            <!-- 测试详情 -->
+            <div class="report-details bg-white p-4 rounded-lg shadow-sm">
+                <h2 class="text-secondary mb-4">测试详情</h2>
+                <div class="d-flex align-items-center mb-3">
+                    <button id="prevPage" class="btn btn-sm btn-outline-secondary">上一页</button>
+                    <span id="pageInfo" class="mx-3"></span>
+                    <button id="nextPage" class="btn btn-sm btn-outline-secondary">下一页</button>
+                    <input id="pageInput" type="number" min="1" class="form-control form-control-sm ml-3" style="width: 100px;" placeholder="页码">
+                </div>
+                <table class="table table-sm table-hover">
+                    <thead><tr><th>用例ID</th><th>用例名称</th><th>方法</th><th>路径</th><th>状态码</th><th>结果</th><th>响应时间</th></tr></thead>
+                    <tbody id="resultRows"></tbody>
+                </table>
+                <div id="resultDetail"></div>
+            </div>
+"""
+    
+    @staticmethod
+    def _generate_paged_script(page_count: int) -> str:
+        """生成分页加载脚本"""
+        return f"""
+    <script>
+        // 按页加载结果数据，只保留当前页；点击结果行时渲染详情
+        (function() {{
+            const pageCount = {page_count};
+            const tbody = document.getElementById('resultRows');
+            const pageInfo = document.getElementById('pageInfo');
+            const detail = document.getElementById('resultDetail');
+            let current = 0;
+            let page = null;
+            
+            window.reportPage = function(index, data) {{
+                if (index !== current) return;
+                page = data;
+                render();
+            }};
+            
+            function load(index) {{
+                if (index < 0 || index >= pageCount) return;
+                current = index;
+                page = null;
+                detail.innerHTML = '';
+                pageInfo.textContent = '加载中...';
+                const script = document.createElement('script');
+                script.src = 'data/page-' + index + '.js';
+                script.onload = function() {{ script.remove(); }};
+                script.onerror = function() {{ pageInfo.textContent = '数据文件加载失败: ' + script.src; }};
+                document.body.appendChild(script);
+            }}
+            
+            function render() {{
+                tbody.innerHTML = '';
+                page.rows.forEach(function(row, i) {{
+                    const tr = document.createElement('tr');
+                    tr.className = row[5] ? '' : 'table-danger';
+                    tr.style.cursor = 'pointer';
+                    [row[0], row[1], row[2], row[3], row[4], row[5] ? '通过' : '失败', row[6].toFixed(3) + 's'].forEach(function(value) {{
+                        const td = document.createElement('td');
+                        td.textContent = value;
+                        tr.appendChild(td);
+                    }});
+                    tr.onclick = function() {{ detail.innerHTML = page.details[i]; }};
+                    tbody.appendChild(tr);
+                }});
+                pageInfo.textContent = '第 ' + (current + 1) + ' / ' + pageCount + ' 页';
+            }}
+            
+            document.getElementById('prevPage').onclick = function() {{ load(current - 1); }};
+            document.getElementById('nextPage').onclick = function() {{ load(current + 1); }};
+            document.getElementById('pageInput').onchange = function() {{ load(parseInt(this.value, 10) - 1); }};
+            if (pageCount > 0) {{
+                load(0);
+            }} else {{
+                pageInfo.textContent = '没有测试结果';
+            }}
+        }})();
+    </script>
+"""
+    
+    @staticmethod
+    def _generate_html_head(offline: Optional[bool] = None) -> str:
+        """生成报告头部（样式与标题）"""
+        if offline is None:
+            offline = config.get('REPORT_OFFLINE_ASSETS', False)
+        return f"""
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>接口测试报告</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.3.0/dist/chart.umd.min.js"></script>
+    {ReportGenerator._generate_asset_tags(offline)}
     <style>
         body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; }}
         .report-container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
@@ -66,6 +267,9 @@ class ReportGenerator:
         .timeline {{ position: relative; padding-left: 30px; }}
         .timeline-item {{ margin-bottom: 10px; position: relative; }}
         .timeline-item::before {{ content: ''; position: absolute; left: -15px; top: 5px; width: 10px; height: 10px; border-radius: 50%; background-color: #007bff; }}
+        .report-sections {{ display: flex; flex-direction: column; }}
+        .report-summary {{ order: 1; }}
+        .report-details {{ order: 2; }}
     </style>
 </head>
 <body>
@@ -76,8 +280,36 @@ class ReportGenerator:
             <p class="text-muted">生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         </div>
         
+        <!-- 测试详情先于摘要写出（摘要需要全部结果），通过order显示在摘要之后 -->
+        <div class="report-sections">
+"""
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=2)
+    def _generate_asset_tags(offline: bool) -> str:
+        """生成样式与图表脚本标签：在线模式引用CDN，离线模式内联随包附带的精简资源"""
+        if not offline:
+            return """<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
+    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.3.0/dist/chart.umd.min.js"></script>"""
+        return f"""<style>
+{load_report_asset('report.css')}
+    </style>
+    <script>
+{load_report_asset('chart.js')}
+    </script>"""
+    
+    @staticmethod
+    def _generate_html_summary(statistics: RunStatistics) -> str:
+        """生成摘要卡片、响应时间分布与图表容器"""
+        total = statistics.total
+        passed = statistics.passed
+        failed = statistics.failed
+        success_rate = statistics.success_rate
+        avg_response_time = statistics.avg_response_time
+        
+        return f"""
         <!-- 摘要卡片 -->
-        <div class="summary-card bg-white p-4 mb-5">
+        <div class="report-summary summary-card bg-white p-4 mb-5">
             <div class="row mb-4">
                 <div class="col-md-3">
                     <div class="stat-card success-bg p-3 rounded-lg text-center">
@@ -120,6 +352,14 @@ class ReportGenerator:
                 </div>
             </div>
             
+            <!-- 响应时间分布 -->
+            <div class="row mt-4">
+                <div class="col-md-12">
+                    <h4 class="mb-3">响应时间分布</h4>
+                    {ReportGenerator._generate_latency_table(statistics)}
+                </div>
+            </div>
+            
             <!-- 图表 -->
             <div class="row mt-5">
                 <div class="col-md-12">
@@ -130,12 +370,12 @@ class ReportGenerator:
                 </div>
             </div>
         </div>
-        
-        <!-- 测试详情 -->
-        <div class="bg-white p-4 rounded-lg shadow-sm">
-            <h2 class="text-secondary mb-4">测试详情</h2>
-            
-            {''.join(ReportGenerator._generate_enhanced_result_row(r) for r in results)}
+"""
+    
+    @staticmethod
+    def _generate_html_tail(chart_data: Dict[str, Any], extra_script: str = '') -> str:
+        """生成图表脚本与文档结尾"""
+        return f"""
         </div>
     </div>
     
@@ -183,11 +423,9 @@ class ReportGenerator:
             }}
         }});
     </script>
-</body>
+{extra_script}</body>
 </html>
         """
-        
-        return html_content
     
     @staticmethod
     def _generate_enhanced_result_row(result: Dict[str, Any]) -> str:
@@ -208,6 +446,7 @@ class ReportGenerator:
         status_code = result.get('status_code', 0)
         response_time = result.get('response_time', 0)
         response_text = result.get('response_text', '')
+        body_ref = result.get('response_body_ref')
         error = result.get('error', '')
         retry_count = result.get('retry_count', 0)
         
@@ -268,8 +507,13 @@ class ReportGenerator:
                         ''' if retry_count > 0 else ''}
                         <div class="mb-2">
                             <strong>响应内容:</strong>
-                            <div class="response-content">{html.escape(response_text[:1000])}{'...' if len(response_text) > 1000 else ''}</div>
+                            <div class="response-content">{html.escape(response_text[:1000])}{'...' if len(response_text) > 1000 or body_ref else ''}</div>
+                        </div>
+                        {f'''
+                        <div class="mb-2">
+                            <strong>完整响应体:</strong> {html.escape(body_ref)} ({result.get('response_size', 0)} 字节)
                         </div>
+                        ''' if body_ref else ''}
                         {f'''
                         <div class="mb-2">
                             <strong>错误信息:</strong>
@@ -283,37 +527,187 @@ class ReportGenerator:
         """
     
     @staticmethod
-    def generate_json_report(results: List[Dict[str, Any]]) -> str:
-        """生成JSON格式的测试报告"""
-        total = len(results)
-        passed = sum(1 for r in results if r['success'])
-        failed = total - passed
-        success_rate = (passed / total * 100) if total > 0 else 0
-        avg_response_time = sum(r['response_time'] for r in results if r['response_time'] > 0) / len([r for r in results if r['response_time'] > 0]) if results else 0
-        
-        # 按方法统计
-        method_stats = {}
-        for result in results:
-            test_case = result.get('test_case', {})
-            method = test_case.get('method', 'UNKNOWN')
-            if method not in method_stats:
-                method_stats[method] = {'total': 0, 'passed': 0, 'failed': 0}
-            method_stats[method]['total'] += 1
-            if result['success']:
-                method_stats[method]['passed'] += 1
-            else:
-                method_stats[method]['failed'] += 1
-        
-        report = {
+    def _generate_latency_table(statistics: RunStatistics, max_paths: int = 20) -> str:
+        """生成响应时间百分位表格，路径按p99降序最多显示max_paths个"""
+        rows = [('整体', statistics.latency)]
+        rows += [(f'方法 {key}', h) for key, h in statistics.latency_by_method.items()]
+        rows += [(f'状态码 {key}', h) for key, h in statistics.latency_by_status.items()]
+        slowest_paths = sorted(statistics.latency_by_path.items(), key=lambda item: item[1].value_at_percentile(99), reverse=True)
+        rows += [(f'路径 {key}', h) for key, h in slowest_paths[:max_paths]]
+        
+        body = ''
+        for label, histogram in rows:
+            summary = histogram.summary()
+            cells = ''.join(f'<td>{summary[key]:.3f}</td>' for key in ('p50', 'p90', 'p95', 'p99', 'p99.9', 'max'))
+            body += f'<tr><td>{html.escape(label)}</td><td>{summary["count"]}</td>{cells}</tr>'
+        
+        return f"""
+                    <table class="table table-sm">
+                        <thead><tr><th>分组</th><th>样本数</th><th>p50 (秒)</th><th>p90 (秒)</th><th>p95 (秒)</th><th>p99 (秒)</th><th>p99.9 (秒)</th><th>最大 (秒)</th></tr></thead>
+                        <tbody>{body}</tbody>
+                    </table>
+        """
+    
+    @staticmethod
+    def generate_json_report(results: List[Dict[str, Any]], statistics: Optional[RunStatistics] = None) -> str:
+        """
+        生成JSON格式的测试报告
+        
+        Args:
+            results: 测试结果列表
+            statistics: 已累计的运行统计，为空时根据results计算
+        """
+        report = ReportGenerator._build_report_header(results, statistics)
+        output = io.StringIO()
+        ReportGenerator._write_json_document(report, results, output)
+        return output.getvalue()
+    
+    @staticmethod
+    def _build_report_header(results: List[Dict[str, Any]], statistics: Optional[RunStatistics]) -> Dict[str, Any]:
+        """JSON报告中结果列表之外的部分（生成时间与统计）"""
+        if statistics is None:
+            statistics = RunStatistics.from_results(results)
+        return {
             'generated_at': datetime.now().isoformat(),
-            'summary': {
-                'total': total,
-                'passed': passed,
-                'failed': failed,
-                'success_rate': success_rate,
-                'avg_response_time': avg_response_time
-            },
-            'method_stats': method_stats,
-            'results': results
+            'summary': statistics.summary(),
+            'method_stats': statistics.method_stats,
+            'latency_stats': statistics.latency_summary(),
+            # 序列化的整体直方图，可与其他报告的直方图合并
+            'latency_histogram': statistics.latency.to_dict()
         }
-        return json.dumps(report, ensure_ascii=False, indent=2)
\ No newline at end of file
+    
+    @staticmethod
+    def write_binary_report(results: Iterable[Dict[str, Any]], file_path: str, statistics: Optional[RunStatistics] = None) -> int:
+        """
+        将报告写为紧凑二进制记录文件（.pack/.pack.gz/.pack.zst），内容与JSON报告相同
+        
+        第一条记录为生成时间与统计，之后每条记录一个测试结果，转存到磁盘的响应体写入完整内容。
+        传入statistics时results可以是逐个产出的。
+        
+        Args:
+            results: 测试结果
+            file_path: 报告文件路径，压缩方式由扩展名决定
+            statistics: 已累计的运行统计，为空时根据results计算
+        
+        Returns:
+            int: 写出的结果数
+        """
+        if statistics is None:
+            results = list(results)
+        report = ReportGenerator._build_report_header(results, statistics)
+        
+        def records():
+            yield report
+            for result in results:
+                if result.get('response_body_ref'):
+                    result = dict(result, response_text=load_response_text(result), response_body_ref=None)
+                yield result
+        
+        return binary_records.write_file(file_path, records()) - 1
+    
+    @staticmethod
+    def load_binary_report(file_path: str) -> Dict[str, Any]:
+        """
+        加载 write_binary_report 写出的报告
+        
+        Args:
+            file_path: 报告文件路径
+        
+        Returns:
+            Dict[str, Any]: 与JSON报告结构相同的字典（含results列表）
+        """
+        records = ReportGenerator._iter_binary_report(file_path)
+        report = next(records)
+        report['results'] = list(records)
+        return report
+    
+    @staticmethod
+    def iter_binary_results(file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐条读取 write_binary_report 写出的测试结果（跳过统计部分），适合只需遍历结果的趋势分析
+        
+        Args:
+            file_path: 报告文件路径
+        
+        Yields:
+            Dict[str, Any]: 测试结果
+        """
+        records = ReportGenerator._iter_binary_report(file_path)
+        next(records)
+        yield from records
+    
+    @staticmethod
+    def _iter_binary_report(file_path: str) -> Iterator[Dict[str, Any]]:
+        """依次产出报告的统计部分和各测试结果，并检查记录类型"""
+        for number, record in binary_records.iter_file(file_path):
+            if number == 1:
+                if not isinstance(record, dict) or 'summary' not in record:
+                    error = create_error('VALIDATION_FAILED', f'不是二进制报告文件（缺少统计信息）: {file_path}')
+                    raise error
+            elif not isinstance(record, dict) or 'success' not in record:
+                error = create_error('VALIDATION_FAILED', f'报告文件第 {number} 条记录不是测试结果: {file_path}')
+                raise error
+            yield record
+    
+    @staticmethod
+    def write_jsonl_results(results: Iterable[Dict[str, Any]], fp: TextIO) -> int:
+        """
+        逐条写出测试结果（JSON Lines，每行一个结果），结果可以是执行中逐个产出的
+        
+        转存到磁盘的响应体写入完整内容，结果文件不依赖转存目录。
+        
+        Args:
+            results: 测试结果
+            fp: 以文本模式打开的文件对象（追加时以 'a' 模式打开）
+        
+        Returns:
+            int: 写出的结果数
+        """
+        count = 0
+        for result in results:
+            if result.get('response_body_ref'):
+                result = dict(result, response_text=load_response_text(result), response_body_ref=None)
+            fp.write(jsonl.dumps_line(result))
+            count += 1
+        return count
+    
+    @staticmethod
+    def iter_jsonl_results(file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐行读取 write_jsonl_results 写出的测试结果
+        
+        Args:
+            file_path: 结果文件路径
+        
+        Yields:
+            Dict[str, Any]: 测试结果
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_number, result in jsonl.iter_jsonl(f):
+                if not isinstance(result, dict) or 'success' not in result:
+                    error = create_error('VALIDATION_FAILED', f'结果文件第 {line_number} 行不是测试结果: {file_path}')
+                    raise error
+                yield result
+    
+    @staticmethod
+    def _write_json_document(report: Dict[str, Any], results: List[Dict[str, Any]], fp: TextIO):
+        """
+        逐条写出JSON报告，格式与json.dumps(indent=2)一致
+        
+        转存到磁盘的响应体在写出对应结果时才读取，同一时刻内存中只有一个完整响应体。
+        """
+        def indent(text: str, width: int) -> str:
+            return text.replace('\n', '\n' + ' ' * width)
+        
+        fp.write('{')
+        for key, value in report.items():
+            fp.write(f'\n  {json.dumps(key)}: {indent(json.dumps(value, ensure_ascii=False, indent=2), 2)},')
+        fp.write('\n  "results": [')
+        count = 0
+        for result in results:
+            if result.get('response_body_ref'):
+                result = dict(result, response_text=load_response_text(result))
+            fp.write(',' if count else '')
+            fp.write('\n    ' + indent(json.dumps(result, ensure_ascii=False, indent=2), 4))
+            count += 1
+        fp.write('\n  ]\n}' if count else ']\n}')
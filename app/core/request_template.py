@@ -0,0 +1,147 @@
+import re
+import json
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+# 路径中的参数占位符，如 /users/{id}
+_PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+class RequestTemplate(NamedTuple):
+    """
+    预编译的请求模板（不可变）
+    
+    测试用例编译一次后，重试和压测中的重复发送都直接使用模板：路径参数已替换、查询参数已编码进URL、
+    默认请求头已合并、请求体已编码为字节，发送时不再逐个处理参数和序列化JSON。
+    requests和aiohttp都可以直接使用：session.request(template.method, template.url, **template.kwargs())
+    """
+    
+    method: str
+    url: str
+    # 路径分段：字符串为原样保留的部分，(参数名,) 为占位符
+    segments: Tuple[Union[str, Tuple[str]], ...]
+    path_params: Mapping[str, Any]
+    query_params: Tuple[Tuple[str, str], ...]
+    headers: Mapping[str, str]
+    body: Optional[bytes]
+    
+    @classmethod
+    def compile(cls, test_case: Dict[str, Any], base_url: str = '',
+                default_headers: Optional[Dict[str, str]] = None) -> 'RequestTemplate':
+        """
+        编译测试用例
+        
+        Args:
+            test_case: 测试用例
+            base_url: 基础URL
+            default_headers: 默认请求头，用例中的同名请求头优先
+        
+        Returns:
+            RequestTemplate: 请求模板
+        """
+        path = test_case['path']
+        params = test_case.get('params') or {}
+        segments = cls.parse_path(path)
+        names = {segment[0] for segment in segments if isinstance(segment, tuple)}
+        
+        # 路径中有占位符的参数用于替换路径，其余作为查询参数
+        path_params = {name: value for name, value in params.items() if name in names}
+        query_params = cls._encode_query({name: value for name, value in params.items() if name not in names})
+        
+        headers = dict(default_headers or {})
+        headers.update(test_case.get('headers') or {})
+        body, content_type = cls._encode_body(test_case.get('json'), test_case.get('data'))
+        # 与requests一致：请求头中已有Content-Type时不覆盖
+        if content_type and not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = content_type
+        
+        url = base_url.rstrip('/') + cls.render_path(segments, path_params)
+        if query_params:
+            url += ('&' if '?' in url else '?') + urlencode(query_params)
+        
+        return cls(
+            method=test_case['method'].upper(),
+            url=url,
+            segments=segments,
+            path_params=MappingProxyType(path_params),
+            query_params=query_params,
+            headers=MappingProxyType(headers),
+            body=body
+        )
+    
+    def kwargs(self) -> Dict[str, Any]:
+        """发送请求时的参数（headers/data），requests和aiohttp通用"""
+        kwargs = {'headers': self.headers}
+        if self.body is not None:
+            kwargs['data'] = self.body
+        return kwargs
+    
+    @staticmethod
+    def parse_path(path: str) -> Tuple[Union[str, Tuple[str]], ...]:
+        """
+        将路径拆分为原样保留的部分和参数占位符
+        
+        Args:
+            path: 路径，如 /users/{id}/orders
+        
+        Returns:
+            Tuple: 路径分段，如 ('/users/', ('id',), '/orders')
+        """
+        segments = []
+        last = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(path):
+            if match.start() > last:
+                segments.append(path[last:match.start()])
+            segments.append((match.group(1),))
+            last = match.end()
+        if last < len(path):
+            segments.append(path[last:])
+        return tuple(segments)
+    
+    @staticmethod
+    def render_path(segments: Tuple[Union[str, Tuple[str]], ...], path_params: Mapping[str, Any]) -> str:
+        """按路径分段替换参数，没有提供值的占位符原样保留"""
+        parts = []
+        for segment in segments:
+            if isinstance(segment, tuple):
+                name = segment[0]
+                parts.append(str(path_params[name]) if name in path_params else f"{{{name}}}")
+            else:
+                parts.append(segment)
+        return ''.join(parts)
+    
+    @staticmethod
+    def _encode_query(params: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        """编码查询参数（与requests一致：忽略None，列表展开为重复参数）"""
+        query = []
+        for name, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is not None:
+                    query.append((name, str(item)))
+        return tuple(query)
+    
+    @staticmethod
+    def _encode_body(json_body: Any, data: Any) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        编码请求体，json优先于data
+        
+        Returns:
+            Tuple[Optional[bytes], Optional[str]]: (请求体, 默认的Content-Type)
+        """
+        if json_body:
+            # 与requests的json参数序列化方式相同
+            return json.dumps(json_body, allow_nan=False).encode('utf-8'), 'application/json'
+        if data:
+            if isinstance(data, bytes):
+                return data, None
+            if isinstance(data, str):
+                return data.encode('utf-8'), None
+            # 表单
+            items: List[Tuple[str, Any]] = list(data.items()) if isinstance(data, dict) else list(data)
+            fields = []
+            for name, value in items:
+                values = value if isinstance(value, (list, tuple)) else [value]
+                fields.extend((name, item) for item in values if item is not None)
+            return urlencode(fields).encode('utf-8'), 'application/x-www-form-urlencoded'
+        return None, None
@@ -0,0 +1,173 @@
+from typing import Dict, Any, Iterable, Optional
+from app.core.latency_histogram import LatencyHistogram
+
+class RunStatistics:
+    """测试运行统计，每个结果只更新一次（O(1)），多个分片的统计可以合并"""
+    
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.response_time_sum = 0.0
+        self.response_time_count = 0
+        self.method_stats: Dict[str, Dict[str, int]] = {}
+        self.latency = LatencyHistogram()
+        self.latency_by_method: Dict[str, LatencyHistogram] = {}
+        self.latency_by_path: Dict[str, LatencyHistogram] = {}
+        self.latency_by_status: Dict[str, LatencyHistogram] = {}
+    
+    @classmethod
+    def from_results(cls, results: Iterable[Dict[str, Any]]) -> 'RunStatistics':
+        """根据测试结果生成统计"""
+        statistics = cls()
+        for result in results:
+            statistics.add(result)
+        return statistics
+    
+    def add(self, result: Dict[str, Any]):
+        """
+        累加一个测试结果
+        
+        Args:
+            result: 测试结果
+        """
+        test_case = result.get('test_case', {})
+        method = test_case.get('method', 'UNKNOWN')
+        success = bool(result['success'])
+        
+        self.total += 1
+        if success:
+            self.passed += 1
+        
+        # 按方法统计
+        stats = self.method_stats.get(method)
+        if stats is None:
+            stats = self.method_stats[method] = {'total': 0, 'passed': 0, 'failed': 0}
+        stats['total'] += 1
+        stats['passed' if success else 'failed'] += 1
+        
+        # 响应时间，只统计收到响应的结果
+        response_time = result.get('response_time', 0)
+        if response_time > 0:
+            self.response_time_sum += response_time
+            self.response_time_count += 1
+            self.latency.record(response_time)
+            self._record_group(self.latency_by_method, method, response_time)
+            self._record_group(self.latency_by_path, test_case.get('path', ''), response_time)
+            self._record_group(self.latency_by_status, str(result.get('status_code', 0)), response_time)
+    
+    @staticmethod
+    def _record_group(groups: Dict[str, LatencyHistogram], key: str, response_time: float):
+        """记录分组响应时间"""
+        histogram = groups.get(key)
+        if histogram is None:
+            histogram = groups[key] = LatencyHistogram()
+        histogram.record(response_time)
+    
+    @staticmethod
+    def _merge_groups(target: Dict[str, LatencyHistogram], source: Dict[str, LatencyHistogram]):
+        """合并分组直方图"""
+        for key, histogram in source.items():
+            if key in target:
+                target[key].merge(histogram)
+            else:
+                target[key] = LatencyHistogram().merge(histogram)
+    
+    def merge(self, other: 'RunStatistics') -> 'RunStatistics':
+        """
+        合并另一份统计（原地修改）
+        
+        Args:
+            other: 其他分片或工作进程的统计
+        
+        Returns:
+            RunStatistics: self
+        """
+        self.total += other.total
+        self.passed += other.passed
+        self.response_time_sum += other.response_time_sum
+        self.response_time_count += other.response_time_count
+        for method, stats in other.method_stats.items():
+            target = self.method_stats.setdefault(method, {'total': 0, 'passed': 0, 'failed': 0})
+            for key in ('total', 'passed', 'failed'):
+                target[key] += stats[key]
+        self.latency.merge(other.latency)
+        self._merge_groups(self.latency_by_method, other.latency_by_method)
+        self._merge_groups(self.latency_by_path, other.latency_by_path)
+        self._merge_groups(self.latency_by_status, other.latency_by_status)
+        return self
+    
+    @property
+    def failed(self) -> int:
+        return self.total - self.passed
+    
+    @property
+    def success_rate(self) -> float:
+        return (self.passed / self.total * 100) if self.total > 0 else 0
+    
+    @property
+    def avg_response_time(self) -> float:
+        return (self.response_time_sum / self.response_time_count) if self.response_time_count > 0 else 0
+    
+    def summary(self) -> Dict[str, Any]:
+        """报告摘要"""
+        return {
+            'total': self.total,
+            'passed': self.passed,
+            'failed': self.failed,
+            'success_rate': self.success_rate,
+            'avg_response_time': self.avg_response_time
+        }
+    
+    def chart_data(self) -> Dict[str, Any]:
+        """按方法统计的图表数据"""
+        return {
+            'labels': list(self.method_stats.keys()),
+            'passed': [stats['passed'] for stats in self.method_stats.values()],
+            'failed': [stats['failed'] for stats in self.method_stats.values()]
+        }
+    
+    def latency_summary(self) -> Dict[str, Any]:
+        """响应时间百分位摘要（整体及按方法、路径、状态码分组）"""
+        return {
+            'overall': self.latency.summary(),
+            'by_method': {key: h.summary() for key, h in self.latency_by_method.items()},
+            'by_path': {key: h.summary() for key, h in self.latency_by_path.items()},
+            'by_status': {key: h.summary() for key, h in self.latency_by_status.items()}
+        }
+    
+    def status_text(self) -> str:
+        """状态栏显示的简要统计"""
+        text = f"通过 {self.passed}/{self.total}，成功率 {self.success_rate:.2f}%"
+        if self.latency.count:
+            text += f"，p50 {self.latency.value_at_percentile(50) / 1000:.0f}ms，p99 {self.latency.value_at_percentile(99) / 1000:.0f}ms"
+        return text
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化为字典，用于跨进程或跨节点传递后合并"""
+        return {
+            'total': self.total,
+            'passed': self.passed,
+            'response_time_sum': self.response_time_sum,
+            'response_time_count': self.response_time_count,
+            'method_stats': self.method_stats,
+            'latency': self.latency.to_dict(),
+            'latency_by_method': {key: h.to_dict() for key, h in self.latency_by_method.items()},
+            'latency_by_path': {key: h.to_dict() for key, h in self.latency_by_path.items()},
+            'latency_by_status': {key: h.to_dict() for key, h in self.latency_by_status.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'RunStatistics':
+        """从字典恢复统计"""
+        statistics = cls()
+        if not data:
+            return statistics
+        statistics.total = data.get('total', 0)
+        statistics.passed = data.get('passed', 0)
+        statistics.response_time_sum = data.get('response_time_sum', 0.0)
+        statistics.response_time_count = data.get('response_time_count', 0)
+        statistics.method_stats = {method: dict(stats) for method, stats in data.get('method_stats', {}).items()}
+        statistics.latency = LatencyHistogram.from_dict(data.get('latency', {}))
+        for group in ('latency_by_method', 'latency_by_path', 'latency_by_status'):
+            setattr(statistics, group, {key: LatencyHistogram.from_dict(h) for key, h in data.get(group, {}).items()})
+        return statistics
@@ -0,0 +1,69 @@
+import threading
+from typing import Dict, Tuple, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from app.core.config import config
+from app.utils.logger import logger
+
+class SessionPool:
+    """HTTP会话池，按主机和工作线程复用长连接（线程安全）"""
+    
+    def __init__(self, pool_size: Optional[int] = None, per_thread: bool = True):
+        """
+        初始化会话池
+        
+        Args:
+            pool_size: 每个会话的连接池大小，默认跟随 SESSION_POOL_SIZE 或 TEST_CONCURRENCY
+            per_thread: 是否每个工作线程使用单独的会话；为False时同一主机的请求在所有线程间共用一个会话，
+                会话数不随线程增加（适合长期存在、被临时线程池调用的全局对象）
+        """
+        self.pool_size = pool_size or config.get('SESSION_POOL_SIZE') or config.get('TEST_CONCURRENCY', 5)
+        self.per_thread = per_thread
+        self._sessions: Dict[Tuple[str, Optional[int]], requests.Session] = {}
+        self._lock = threading.Lock()
+    
+    def get_session(self, url: str) -> requests.Session:
+        """
+        获取当前线程访问指定主机所使用的会话
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            requests.Session: 复用的会话对象
+        """
+        parts = urlsplit(url)
+        key = (f"{parts.scheme}://{parts.netloc}", threading.get_ident() if self.per_thread else None)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[key] = session
+        return session
+    
+    def _create_session(self) -> requests.Session:
+        """创建带连接池的会话"""
+        session = requests.Session()
+        # 重试由执行器负责，这里不让适配器自动重试
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self):
+        """关闭所有会话及其连接"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"关闭HTTP会话失败: {str(e)}")
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
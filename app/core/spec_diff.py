@@ -0,0 +1,142 @@
+import copy
+from typing import Dict, List, Any, Tuple
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.test_case_generator import TestCaseGenerator
+from app.models.test_case_collection import TestCaseCollection
+from app.utils.logger import logger
+
+class SpecDiff:
+    """
+    接口文档版本差异与测试用例增量更新
+    
+    比较的是各接口的指纹（见 EndpointCatalog.fingerprint）：旧版本的指纹保存在生成的测试用例的source字段中，
+    新版本的指纹在文档缓存命中时直接取自缓存，因此比较只是字典查找，只有新增和变化的接口才会构建接口信息并生成用例。
+    """
+    
+    @staticmethod
+    def compare(old_fingerprints: Dict[str, str], new_fingerprints: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        比较两个版本的接口指纹
+        
+        Args:
+            old_fingerprints: 旧版本指纹，键为 “方法 路径”
+            new_fingerprints: 新版本指纹
+        
+        Returns:
+            Dict[str, List[str]]: added、changed、removed、unchanged 四类接口
+        """
+        diff = {'added': [], 'changed': [], 'removed': [], 'unchanged': []}
+        for operation, fingerprint in new_fingerprints.items():
+            old = old_fingerprints.get(operation)
+            if old is None:
+                diff['added'].append(operation)
+            elif old != fingerprint:
+                diff['changed'].append(operation)
+            else:
+                diff['unchanged'].append(operation)
+        diff['removed'] = [operation for operation in old_fingerprints if operation not in new_fingerprints]
+        return diff
+    
+    @staticmethod
+    def is_edited(test_case: Dict[str, Any]) -> bool:
+        """生成的测试用例是否在生成后被手工修改过"""
+        source = test_case.get('source') or {}
+        return source.get('checksum') != TestCaseGenerator.content_checksum(test_case)
+    
+    @staticmethod
+    def update_test_cases(test_cases: List[Dict[str, Any]], catalog: EndpointCatalog) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        按新版本文档增量更新测试用例
+        
+        - 未变化的接口：保留原用例
+        - 变化的接口：未修改过的用例重新生成（保留原ID）；修改过的用例保留，source中标记stale并计入conflicts
+        - 删除的接口：未修改过的用例删除；修改过的用例保留并计入orphaned
+        - 同一接口对应多个用例时（如批量导入的多个服务）逐个按上述规则处理
+        - 新增的接口：生成用例追加到末尾
+        - 没有source字段的用例（手工添加或旧版本生成的）原样保留
+        - 生成的用例ID与保留的用例重复时改为 id_2 等新ID，计入renamed
+        
+        Args:
+            test_cases: 当前的测试用例
+            catalog: 新版本文档的接口目录
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Any]]: (更新后的测试用例, 更新报告)
+        """
+        old_fingerprints = {}
+        for test_case in test_cases:
+            source = test_case.get('source')
+            if source and source.get('operation'):
+                old_fingerprints[source['operation']] = source.get('fingerprint')
+        
+        diff = SpecDiff.compare(old_fingerprints, catalog.fingerprints())
+        changed = set(diff['changed'])
+        removed = set(diff['removed'])
+        
+        # 只为新增和变化的接口构建接口信息、生成用例
+        regenerate = diff['changed'] + diff['added']
+        generated = {}
+        for test_case in TestCaseGenerator.generate_test_cases(
+                catalog.endpoint(*operation.split(' ', 1)) for operation in regenerate):
+            generated[test_case['source']['operation']] = test_case
+        
+        report = {
+            'added': diff['added'],
+            'changed': diff['changed'],
+            'removed': diff['removed'],
+            'unchanged': len(diff['unchanged']),
+            'regenerated': [],
+            'conflicts': [],
+            'orphaned': [],
+            'renamed': []
+        }
+        updated = []
+        # 重新生成和新增的用例，最后与保留的用例一起查重
+        new_cases = []
+        regenerated = []
+        # 已有用例的变化接口，不再追加新生成的用例
+        covered = set()
+        for test_case in test_cases:
+            source = test_case.get('source')
+            operation = source.get('operation') if source else None
+            if operation in changed:
+                covered.add(operation)
+                if SpecDiff.is_edited(test_case):
+                    # 保留手工修改，指纹不更新，下次导入时仍会提示
+                    test_case = dict(test_case, source=dict(source, stale=True))
+                    report['conflicts'].append(test_case['id'])
+                elif operation in generated:
+                    # 每个未修改的用例都替换为新生成内容的副本，ID保持不变
+                    test_case = dict(copy.deepcopy(generated[operation]), id=test_case['id'])
+                    test_case['source']['checksum'] = TestCaseGenerator.content_checksum(test_case)
+                    new_cases.append(test_case)
+                    regenerated.append(test_case)
+            elif operation in removed:
+                if not SpecDiff.is_edited(test_case):
+                    continue
+                report['orphaned'].append(test_case['id'])
+            updated.append(test_case)
+        
+        # 新增接口的用例，以及变化接口中原先没有对应用例的
+        for operation in regenerate:
+            if operation in generated and operation not in covered:
+                test_case = generated[operation]
+                new_cases.append(test_case)
+                updated.append(test_case)
+        
+        # 生成的用例ID只在本次生成的用例之间唯一，还需与保留的用例（如手工添加的同名用例）查重。
+        # 索引中放入保留用例的副本，不修改原用例
+        new_ids = {id(test_case) for test_case in new_cases}
+        collection = TestCaseCollection(dict(test_case) for test_case in updated if id(test_case) not in new_ids)
+        for test_case in new_cases:
+            original_id = test_case['id']
+            collection.append(test_case)
+            if test_case['id'] != original_id:
+                # ID属于校验值的内容，改名后重新计算，否则会被误判为手工修改过
+                test_case['source']['checksum'] = TestCaseGenerator.content_checksum(test_case)
+                report['renamed'].append(test_case['id'])
+        report['regenerated'] = [test_case['id'] for test_case in regenerated]
+        
+        logger.info(f"增量更新测试用例: 新增接口 {len(diff['added'])} 个，变化 {len(diff['changed'])} 个，"
+                    f"删除 {len(diff['removed'])} 个，保留手工修改 {len(report['conflicts']) + len(report['orphaned'])} 个")
+        return updated, report
@@ -1,14 +1,22 @@
-from typing import List, Dict, Any
+import copy
+import json
+import hashlib
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from app.models.test_case_collection import TestCaseCollection
+from app.utils.common_utils import stringify_keys
 
 class TestCaseGenerator:
     @staticmethod
-    def generate_test_cases(endpoints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def generate_test_cases(endpoints: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """根据接口信息生成测试用例"""
-        test_cases = []
+        # 同一方法和路径出现多次时（如批量导入的多个服务）ID自动加序号
+        test_cases = TestCaseCollection()
+        # 按$ref缓存示例数据，被多个接口引用的schema只生成一次
+        examples: Dict[str, Any] = {}
         
         for endpoint in endpoints:
             test_case = {
-                'id': f"test_{endpoint['method']}_{endpoint['path'].replace('/', '_').replace('{', '').replace('}', '')}",
+                'id': test_cases.unique_id(TestCaseCollection.make_id(endpoint['method'], endpoint['path'])),
                 'name': f"{endpoint['summary'] or endpoint['path']}",
                 'method': endpoint['method'],
                 'path': endpoint['path'],
@@ -18,7 +26,8 @@ class TestCaseGenerator:
                 'json': {},
                 'expected_status': 200,
                 'expected_response': {},
-                'description': endpoint['description']
+                'description': endpoint['description'],
+                'tags': list(endpoint.get('tags') or [])
             }
             
             # 处理参数
@@ -33,6 +42,11 @@ class TestCaseGenerator:
                 elif param['in'] == 'cookie':
                     # 暂不处理cookie
                     pass
+                elif param['in'] == 'body':
+                    # Swagger 2.0 的请求体参数
+                    test_case['json'] = TestCaseGenerator._extract_schema_example(param.get('schema', {}), examples)
+                elif param['in'] == 'formData':
+                    test_case['data'][param['name']] = ''
             
             # 处理请求体
             request_body = endpoint.get('requestBody', {})
@@ -40,35 +54,106 @@ class TestCaseGenerator:
                 content = request_body.get('content', {})
                 if 'application/json' in content:
                     test_case['json'] = TestCaseGenerator._extract_schema_example(
-                        content['application/json'].get('schema', {})
+                        content['application/json'].get('schema', {}), examples
                     )
                 elif 'application/x-www-form-urlencoded' in content:
                     test_case['data'] = TestCaseGenerator._extract_schema_example(
-                        content['application/x-www-form-urlencoded'].get('schema', {})
+                        content['application/x-www-form-urlencoded'].get('schema', {}), examples
                     )
             
+            if endpoint.get('fingerprint'):
+                # 记录来源接口及生成时的内容校验值，文档更新后据此只重新生成变化的接口并保留手工修改
+                test_case['source'] = {
+                    'operation': f"{endpoint['method']} {endpoint['path']}",
+                    'fingerprint': endpoint['fingerprint'],
+                    'checksum': TestCaseGenerator.content_checksum(test_case)
+                }
+            
             test_cases.append(test_case)
         
-        return test_cases
+        return test_cases.to_list()
+    
+    @staticmethod
+    def content_checksum(test_case: Dict[str, Any]) -> str:
+        """
+        计算测试用例内容的校验值，用于判断用例生成后是否被手工修改
+        
+        不包含source字段，忽略值为空的字段（编辑器保存时会删除未使用的空请求体字段）。
+        
+        Args:
+            test_case: 测试用例
+        
+        Returns:
+            str: 校验值
+        """
+        content = {key: value for key, value in test_case.items()
+                   if key != 'source' and value is not None and value != '' and value != {} and value != []}
+        return hashlib.sha1(json.dumps(stringify_keys(content), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _extract_schema_example(schema: Dict[str, Any], examples: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        从schema中提取示例数据
+        
+        Args:
+            schema: schema（$ref已由RefResolver解析）
+            examples: 按$ref缓存的示例数据
+        """
+        if examples is None:
+            examples = {}
+        return TestCaseGenerator._schema_example(schema, examples)[0]
     
     @staticmethod
-    def _extract_schema_example(schema: Dict[str, Any]) -> Dict[str, Any]:
-        """从schema中提取示例数据"""
+    def _schema_example(schema: Dict[str, Any], examples: Dict[str, Any]) -> Tuple[Any, bool]:
+        """
+        生成示例数据，返回 (示例数据, 其中是否有被截断的循环引用)
+        
+        循环引用的截断位置取决于展开路径，同一个$ref在别处可能是完整展开的，
+        因此含有截断的示例不缓存，只有完整展开的示例按$ref缓存。
+        """
         if 'example' in schema:
-            return schema['example']
-        elif schema.get('type') == 'object':
+            return schema['example'], False
+        if 'x-circular-ref' in schema:
+            return TestCaseGenerator._build_schema_example(schema, examples)[0], True
+        
+        # 被引用的schema按引用生成一次，之后返回副本
+        ref = schema.get('x-ref')
+        if ref and ref in examples:
+            return copy.deepcopy(examples[ref]), False
+        example, cut = TestCaseGenerator._build_schema_example(schema, examples)
+        if ref and not cut:
+            examples[ref] = example
+            return copy.deepcopy(example), False
+        return example, cut
+    
+    @staticmethod
+    def _build_schema_example(schema: Dict[str, Any], examples: Dict[str, Any]) -> Tuple[Any, bool]:
+        """根据schema类型生成示例数据，返回值同 _schema_example"""
+        if 'allOf' in schema:
+            # 合并各组成部分的对象示例
+            example = {}
+            cut = False
+            for part in schema['allOf']:
+                part_example, part_cut = TestCaseGenerator._schema_example(part, examples)
+                cut = cut or part_cut
+                if isinstance(part_example, dict):
+                    example.update(part_example)
+            return example, cut
+        elif schema.get('type') == 'object' or 'properties' in schema:
             example = {}
+            cut = False
             properties = schema.get('properties', {})
             for name, prop in properties.items():
-                example[name] = TestCaseGenerator._extract_schema_example(prop)
-            return example
+                example[name], prop_cut = TestCaseGenerator._schema_example(prop, examples)
+                cut = cut or prop_cut
+            return example, cut
         elif schema.get('type') == 'array':
-            return []
+            return [], False
         elif schema.get('type') == 'string':
-            return ''
-        elif schema.get('type') == 'number':
-            return 0
+            return '', False
+        elif schema.get('type') in ('number', 'integer'):
+            return 0, False
         elif schema.get('type') == 'boolean':
-            return False
+            return False, False
         else:
-            return {}
\ No newline at end of file
+            return {}, False
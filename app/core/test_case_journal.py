@@ -0,0 +1,300 @@
+import os
+import json
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple
+from app.core.config import config
+from app.core.exceptions import create_error
+from app.utils import jsonl
+from app.utils.common_utils import ensure_dir_exists, fsync_dir
+from app.utils.logger import logger
+
+# 用例文件日志的锁，键为日志的绝对路径。读取、追加、压缩和删除日志都在锁内进行，
+# 避免并发编辑（如多线程的API服务）时压缩的“读取→写回→删除日志”或重建日志与追加交错，丢失已确认的操作
+_journal_locks: Dict[str, threading.RLock] = {}
+_journal_locks_guard = threading.Lock()
+
+# 各用例文件当前（重放日志后）的用例id：键同上，值为 (用例文件和日志的状态, id集合)。
+# 修改、删除前据此检查用例是否存在，两者未被其他途径修改时不必重新加载用例文件
+_journal_ids: Dict[str, Tuple[Any, Set[str]]] = {}
+
+def _journal_key(journal_path: str) -> str:
+    return os.path.normcase(os.path.realpath(journal_path))
+
+def _journal_lock(journal_path: str) -> threading.RLock:
+    """获取日志路径对应的锁"""
+    key = _journal_key(journal_path)
+    with _journal_locks_guard:
+        lock = _journal_locks.get(key)
+        if lock is None:
+            lock = _journal_locks[key] = threading.RLock()
+        return lock
+
+class TestCaseJournal:
+    """
+    测试用例文件的预写日志（write-ahead journal）
+    
+    添加、修改、删除单个用例时只把操作追加到 <用例文件>.journal 并刷到磁盘，不重写用例文件，
+    保存的开销与修改的大小相当。加载用例文件时在其内容上重放日志（见 TestCaseManager.load_test_cases）；
+    日志中的操作达到 TEST_CASE_JOURNAL_COMPACT_OPS 条时压缩：将重放后的用例原子地写回用例文件并清空日志。
+    
+    日志第一行记录写入时用例文件的大小和修改时间，用例文件之后被整体保存（或压缩）时与之不再一致，
+    旧日志即被视为已合并而忽略，因此在“写回用例文件”和“删除日志”之间中断也不会重复应用操作。
+    各操作按用例id覆盖，重复应用的结果相同。
+    """
+    
+    SUFFIX = '.journal'
+    
+    def __init__(self, file_path: str, compact_ops: Optional[int] = None):
+        """
+        初始化日志
+        
+        Args:
+            file_path: 用例文件路径（JSON、YAML或JSON Lines）
+            compact_ops: 日志操作数达到该值时压缩，默认读取 TEST_CASE_JOURNAL_COMPACT_OPS
+        """
+        self.file_path = file_path
+        self.journal_path = file_path + self.SUFFIX
+        self.compact_ops = compact_ops or config.get('TEST_CASE_JOURNAL_COMPACT_OPS', 1000)
+        # 同一用例文件的日志在进程内共用一把锁（可重入：压缩时会加载和保存用例文件）
+        self.lock = _journal_lock(self.journal_path)
+    
+    def _base_signature(self) -> Optional[List[int]]:
+        """用例文件的大小和修改时间，文件不存在时为None"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        读取日志中的操作
+        
+        Returns:
+            List[Dict[str, Any]]: 操作列表；日志不存在、或用例文件已在日志之后被整体保存时为空
+        """
+        with self.lock:
+            if not self._is_current():
+                if os.path.exists(self.journal_path):
+                    logger.info(f"用例文件已在日志之后保存，忽略旧日志: {self.journal_path}")
+                return []
+            operations = []
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                f.readline()
+                for line in f:
+                    try:
+                        operations.append(json.loads(line))
+                    except ValueError:
+                        # 追加时中断留下的不完整的行：该操作未完成写入，忽略，其他操作仍然有效
+                        logger.warning(f"用例日志中有不完整的操作，已忽略: {self.journal_path}")
+            return operations
+    
+    def pending(self) -> int:
+        """日志中尚未合并到用例文件的操作数"""
+        with self.lock:
+            if not self._is_current():
+                return 0
+            count = 0
+            with open(self.journal_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    count += chunk.count(b'\n')
+            # 不计第一行（用例文件状态）
+            return max(count - 1, 0)
+    
+    def _state_signature(self) -> Tuple[Optional[List[int]], Optional[List[int]]]:
+        """用例文件和日志的大小与修改时间"""
+        try:
+            stat = os.stat(self.journal_path)
+            journal = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            journal = None
+        return self._base_signature(), journal
+    
+    def _ids(self) -> Set[str]:
+        """当前（重放日志后）的用例id，调用方需持有锁"""
+        key = _journal_key(self.journal_path)
+        signature = self._state_signature()
+        cached = _journal_ids.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        from app.core.test_case_manager import TestCaseManager
+        test_cases = TestCaseManager.load_test_cases(self.file_path) if os.path.exists(self.file_path) \
+            else self.apply([], self.read())
+        ids = {test_case['id'] for test_case in test_cases}
+        _journal_ids[key] = (signature, ids)
+        return ids
+    
+    def _remember_ids(self, ids: Set[str]):
+        """记录操作后的用例id（追加或压缩改变了文件状态），调用方需持有锁"""
+        _journal_ids[_journal_key(self.journal_path)] = (self._state_signature(), ids)
+    
+    def _is_current(self) -> bool:
+        """日志存在且记录的用例文件状态与当前一致"""
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+        except (OSError, ValueError):
+            return False
+        return isinstance(header, dict) and header.get('base') == self._base_signature()
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    
+    @staticmethod
+    def apply(test_cases: List[Dict[str, Any]], operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        在用例列表上重放操作
+        
+        Args:
+            test_cases: 用例文件中的用例
+            operations: 日志中的操作
+        
+        Returns:
+            List[Dict[str, Any]]: 重放后的用例
+        """
+        if not operations:
+            return test_cases
+        index: Dict[str, int] = {test_case['id']: i for i, test_case in enumerate(test_cases)}
+        deleted = False
+        for operation in operations:
+            op = operation.get('op')
+            if op in ('add', 'update'):
+                # 按id覆盖：原id存在时原位替换，否则追加到末尾（只有添加操作）
+                test_case = operation['test_case']
+                old_id = operation.get('id', test_case['id'])
+                if op == 'update' and old_id not in index:
+                    # 记录时已检查用例存在，正常情况下不会出现
+                    logger.warning(f"用例日志中修改的用例不存在，已忽略: {old_id}")
+                    continue
+                position = index.pop(old_id, None)
+                if old_id != test_case['id'] and test_case['id'] in index:
+                    # 改成的id已被其他用例使用时，覆盖该用例
+                    test_cases[index.pop(test_case['id'])] = None
+                    deleted = True
+                if position is None:
+                    position = len(test_cases)
+                    test_cases.append(test_case)
+                else:
+                    test_cases[position] = test_case
+                index[test_case['id']] = position
+            elif op == 'delete':
+                position = index.pop(operation['id'], None)
+                if position is not None:
+                    test_cases[position] = None
+                    deleted = True
+        if deleted:
+            test_cases = [test_case for test_case in test_cases if test_case is not None]
+        return test_cases
+    
+    def _append(self, operation: Dict[str, Any]):
+        """追加一条操作并刷到磁盘，操作数达到阈值时压缩"""
+        with self.lock:
+            ensure_dir_exists(os.path.dirname(os.path.abspath(self.journal_path)))
+            header = None
+            if not self._is_current():
+                # 新日志（或旧日志已失效）：记录当前用例文件的状态
+                header = {'base': self._base_signature()}
+            with open(self.journal_path, 'w' if header else 'a', encoding='utf-8') as f:
+                if header:
+                    f.write(jsonl.dumps_line(header))
+                elif not self._ends_with_newline():
+                    # 上次追加时中断，另起一行，避免新操作与不完整的行连在一起
+                    f.write('\n')
+                f.write(jsonl.dumps_line(operation))
+                f.flush()
+                os.fsync(f.fileno())
+            if header:
+                fsync_dir(os.path.dirname(os.path.abspath(self.journal_path)))
+            elif self.pending() >= self.compact_ops:
+                self.compact()
+    
+    def add(self, test_case: Dict[str, Any]):
+        """
+        记录添加用例（id已存在时覆盖）
+        
+        Args:
+            test_case: 测试用例
+        """
+        from app.core.test_case_manager import TestCaseManager
+        TestCaseManager.validate_test_case(test_case)
+        with self.lock:
+            cached = _journal_ids.get(_journal_key(self.journal_path))
+            ids = cached[1] if cached and cached[0] == self._state_signature() else None
+            self._append({'op': 'add', 'test_case': test_case})
+            if ids is not None:
+                ids.add(test_case['id'])
+                self._remember_ids(ids)
+    
+    def update(self, test_case_id: str, test_case: Dict[str, Any]) -> bool:
+        """
+        记录修改用例，用例的id可以修改，但不能与其他用例重复
+        
+        Args:
+            test_case_id: 原用例id
+            test_case: 修改后的测试用例
+        
+        Returns:
+            bool: 用例是否存在（不存在时不记录）
+        """
+        from app.core.test_case_manager import TestCaseManager
+        TestCaseManager.validate_test_case(test_case)
+        with self.lock:
+            ids = self._ids()
+            if test_case_id not in ids:
+                return False
+            if test_case['id'] != test_case_id and test_case['id'] in ids:
+                error = create_error('VALIDATION_FAILED', f"测试用例ID已存在: {test_case['id']}")
+                raise error
+            self._append({'op': 'update', 'id': test_case_id, 'test_case': test_case})
+            ids.discard(test_case_id)
+            ids.add(test_case['id'])
+            self._remember_ids(ids)
+        return True
+    
+    def delete(self, test_case_id: str) -> bool:
+        """
+        记录删除用例
+        
+        Args:
+            test_case_id: 用例id
+        
+        Returns:
+            bool: 用例是否存在（不存在时不记录）
+        """
+        with self.lock:
+            ids = self._ids()
+            if test_case_id not in ids:
+                return False
+            self._append({'op': 'delete', 'id': test_case_id})
+            ids.discard(test_case_id)
+            self._remember_ids(ids)
+        return True
+    
+    def compact(self) -> Tuple[int, int]:
+        """
+        压缩日志：将重放后的用例原子地写回用例文件并删除日志
+        
+        Returns:
+            Tuple[int, int]: (合并的操作数, 用例数)
+        """
+        from app.core.test_case_manager import TestCaseManager
+        with self.lock:
+            operations = self.read()
+            # load_test_cases已重放日志
+            test_cases = TestCaseManager.load_test_cases(self.file_path) if os.path.exists(self.file_path) \
+                else self.apply([], operations)
+            if not TestCaseManager.save_test_cases(test_cases, self.file_path):
+                error = create_error('VALIDATION_FAILED', f'压缩用例日志失败，无法写回用例文件: {self.file_path}')
+                raise error
+            logger.info(f"用例日志已压缩: 合并 {len(operations)} 个操作，共 {len(test_cases)} 个用例")
+            return len(operations), len(test_cases)
+    
+    def discard(self):
+        """删除日志（用例文件已整体保存后调用）"""
+        with self.lock:
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
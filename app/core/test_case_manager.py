@@ -1,13 +1,19 @@
 import json
-import yaml
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from app.core.exceptions import create_error, ValidationError
+from app.core.test_case_store import TestCaseStore
+from app.core.test_case_journal import TestCaseJournal
+from app.models.test_case_collection import TestCaseCollection
 from app.utils.logger import logger
-from app.utils.common_utils import ensure_dir_exists, get_file_extension
+from app.utils.common_utils import ensure_dir_exists, get_file_extension, is_valid_file, atomic_write
+from app.utils import yaml_io, jsonl, binary_records
 
 class TestCaseManager:
     """测试用例管理类"""
     
+    # SQLite用例库的扩展名（见 TestCaseStore）
+    STORE_EXTENSIONS = ['db', 'sqlite', 'sqlite3']
+    
     @staticmethod
     def save_test_cases(test_cases: List[Dict[str, Any]], file_path: str) -> bool:
         """
@@ -28,12 +34,35 @@ class TestCaseManager:
             
             # 根据文件扩展名选择保存格式
             ext = get_file_extension(file_path)
+            if isinstance(test_cases, TestCaseCollection):
+                test_cases = test_cases.to_list()
+            
+            if ext in TestCaseManager.STORE_EXTENSIONS:
+                # 用例库只写入有变化的用例
+                with TestCaseStore(file_path) as store:
+                    store.import_test_cases(test_cases, replace=True)
+                logger.info(f"测试用例保存成功: {file_path}")
+                return True
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                if ext in ['yaml', 'yml']:
-                    yaml.dump(test_cases, f, ensure_ascii=False, default_flow_style=False)
+            journal = TestCaseJournal(file_path)
+            # 写入用例文件和删除日志之间不允许追加日志，否则新追加的操作会随日志一起被删除
+            with journal.lock:
+                if binary_records.binary_compression(file_path) is not None:
+                    # 紧凑二进制记录文件（.pack/.pack.gz/.pack.zst），每条记录一个用例，同样原子写入
+                    binary_records.write_file(file_path, test_cases)
                 else:
-                    json.dump(test_cases, f, ensure_ascii=False, indent=2)
+                    # 写入临时文件后替换，中断或磁盘已满时原文件保持不变
+                    with atomic_write(file_path) as f:
+                        if ext in ['yaml', 'yml']:
+                            yaml_io.safe_dump(test_cases, f)
+                        elif ext == 'jsonl':
+                            # 每行一个用例
+                            for test_case in test_cases:
+                                f.write(jsonl.dumps_line(test_case))
+                        else:
+                            json.dump(test_cases, f, ensure_ascii=False, indent=2)
+                # 用例文件已包含全部修改，预写日志不再需要
+                journal.discard()
             
             logger.info(f"测试用例保存成功: {file_path}")
             return True
@@ -57,29 +86,22 @@ class TestCaseManager:
             # 根据文件扩展名选择加载格式
             ext = get_file_extension(file_path)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if ext in ['yaml', 'yml']:
-                    test_cases = yaml.safe_load(f)
-                else:
-                    test_cases = json.load(f)
-            
-            # 验证测试用例格式
-            if not isinstance(test_cases, list):
-                error = create_error('VALIDATION_FAILED', '测试用例文件格式错误，应为列表')
-                raise error
-            
-            # 验证每个测试用例
-            for i, test_case in enumerate(test_cases):
-                if not isinstance(test_case, dict):
-                    error = create_error('VALIDATION_FAILED', f'测试用例 {i+1} 格式错误，应为字典')
+            if ext in TestCaseManager.STORE_EXTENSIONS:
+                # 写入用例库时已验证过格式；文件不存在时不创建空库
+                if not is_valid_file(file_path):
+                    error = create_error('VALIDATION_FAILED', f'测试用例文件不存在: {file_path}')
                     raise error
-                
-                # 检查必要字段
-                required_fields = ['id', 'name', 'method', 'path']
-                for field in required_fields:
-                    if field not in test_case:
-                        error = create_error('PARAMETER_MISSING', f'测试用例 {i+1} 缺少必要字段: {field}')
-                        raise error
+                with TestCaseStore(file_path) as store:
+                    test_cases = list(store)
+                logger.info(f"测试用例加载成功: {file_path}")
+                return test_cases
+            
+            journal = TestCaseJournal(file_path)
+            # 读取用例文件和日志期间不允许压缩或保存，否则可能读到压缩前的用例文件和压缩后已删除的日志
+            with journal.lock:
+                test_cases = TestCaseManager._read_test_case_file(file_path, ext)
+                # 重放预写日志中尚未合并到文件的修改
+                test_cases = TestCaseJournal.apply(test_cases, journal.read())
             
             logger.info(f"测试用例加载成功: {file_path}")
             return test_cases
@@ -90,6 +112,137 @@ class TestCaseManager:
             error = create_error('VALIDATION_FAILED', f'测试用例加载失败: {str(e)}')
             raise error
     
+    @staticmethod
+    def _read_test_case_file(file_path: str, ext: str) -> List[Dict[str, Any]]:
+        """读取并验证用例文件本身的内容（不含预写日志）"""
+        if ext == 'jsonl':
+            return list(TestCaseManager._iter_jsonl_test_cases(file_path))
+        if binary_records.binary_compression(file_path) is not None:
+            return list(TestCaseManager._iter_binary_test_cases(file_path))
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if ext in ['yaml', 'yml']:
+                test_cases = yaml_io.safe_load(f)
+            else:
+                test_cases = json.load(f)
+        
+        # 验证测试用例格式
+        if not isinstance(test_cases, list):
+            error = create_error('VALIDATION_FAILED', '测试用例文件格式错误，应为列表')
+            raise error
+        
+        # 验证每个测试用例
+        for i, test_case in enumerate(test_cases):
+            TestCaseManager._check_loaded_test_case(test_case, f'测试用例 {i+1}')
+        return test_cases
+    
+    @staticmethod
+    def iter_test_cases(file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐个加载测试用例
+        
+        JSON Lines（.jsonl）文件逐行读取，每读到一行就验证并产出，不需要先解析整个文件，
+        内存占用与用例总数无关；验证失败时错误信息中给出所在行号。二进制记录文件同样逐条读取，
+        用例库逐批读取，其他格式整体加载后逐个产出。
+        
+        Args:
+            file_path: 文件路径
+        
+        Yields:
+            Dict[str, Any]: 测试用例
+        """
+        ext = get_file_extension(file_path)
+        binary = binary_records.binary_compression(file_path) is not None
+        if not (ext == 'jsonl' or binary) or TestCaseJournal(file_path).pending():
+            # 有预写日志时需要先重放，整体加载
+            if ext in TestCaseManager.STORE_EXTENSIONS and is_valid_file(file_path):
+                with TestCaseStore(file_path) as store:
+                    yield from store
+            else:
+                yield from TestCaseManager.load_test_cases(file_path)
+            return
+        if binary:
+            yield from TestCaseManager._iter_binary_test_cases(file_path)
+        else:
+            yield from TestCaseManager._iter_jsonl_test_cases(file_path)
+    
+    @staticmethod
+    def _iter_jsonl_test_cases(file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐行读取并验证JSON Lines文件中的用例"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line_number, test_case in jsonl.iter_jsonl(f):
+                    TestCaseManager._check_loaded_test_case(test_case, f'测试用例（第 {line_number} 行）')
+                    yield test_case
+        except ValidationError:
+            raise
+        except Exception as e:
+            error = create_error('VALIDATION_FAILED', f'测试用例加载失败: {str(e)}')
+            raise error
+    
+    @staticmethod
+    def _iter_binary_test_cases(file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取并验证二进制记录文件中的用例"""
+        try:
+            for number, test_case in binary_records.iter_file(file_path):
+                TestCaseManager._check_loaded_test_case(test_case, f'测试用例 {number}')
+                yield test_case
+        except ValidationError:
+            raise
+        except Exception as e:
+            error = create_error('VALIDATION_FAILED', f'测试用例加载失败: {str(e)}')
+            raise error
+    
+    @staticmethod
+    def append_test_cases(test_cases: Iterable[Dict[str, Any]], file_path: str) -> int:
+        """
+        将测试用例逐个追加到JSON Lines文件末尾（文件不存在时创建），已有内容不重写
+        
+        Args:
+            test_cases: 测试用例
+            file_path: JSON Lines文件路径
+        
+        Returns:
+            int: 追加的用例数
+        """
+        if get_file_extension(file_path) != 'jsonl':
+            error = create_error('VALIDATION_FAILED', f'只有JSON Lines（.jsonl）文件支持追加用例: {file_path}')
+            raise error
+        journal = TestCaseJournal(file_path)
+        # 判断日志状态和追加期间不允许其他线程记录日志或压缩
+        with journal.lock:
+            if journal.pending():
+                # 追加到文件会使尚未合并的预写日志失效，改为记录到日志中
+                count = 0
+                for test_case in test_cases:
+                    journal.add(test_case)
+                    count += 1
+                logger.info(f"追加测试用例 {count} 个（预写日志）: {file_path}")
+                return count
+            dir_path = file_path.rsplit('/', 1)[0] if '/' in file_path else ''
+            if dir_path:
+                ensure_dir_exists(dir_path)
+            with jsonl.JsonlWriter(file_path, flush_every=None) as writer:
+                for test_case in test_cases:
+                    TestCaseManager.validate_test_case(test_case)
+                    writer.write(test_case)
+            logger.info(f"追加测试用例 {writer.count} 个: {file_path}")
+            return writer.count
+    
+    @staticmethod
+    def _check_loaded_test_case(test_case: Any, label: str):
+        """检查从文件中读取的测试用例是否为字典且包含必要字段，label用于错误信息（如 “测试用例 3”、“测试用例（第 3 行）”）"""
+        if not isinstance(test_case, dict):
+            error = create_error('VALIDATION_FAILED', f'{label} 格式错误，应为字典')
+            raise error
+        
+        # 检查必要字段
+        required_fields = ['id', 'name', 'method', 'path']
+        for field in required_fields:
+            if field not in test_case:
+                error = create_error('PARAMETER_MISSING', f'{label} 缺少必要字段: {field}')
+                raise error
+    
     @staticmethod
     def import_test_cases(file_path: str) -> List[Dict[str, Any]]:
         """
@@ -178,9 +331,7 @@ class TestCaseManager:
         Returns:
             str: 测试用例ID
         """
-        # 移除路径中的特殊字符
-        clean_path = path.replace('/', '_').replace('{', '').replace('}', '')
-        return f"test_{method.lower()}_{clean_path}"
+        return TestCaseCollection.make_id(method, path)
     
     @staticmethod
     def update_test_case(test_cases: List[Dict[str, Any]], index: int, updated_test_case: Dict[str, Any]) -> bool:
@@ -217,8 +368,11 @@ class TestCaseManager:
         """
         添加测试用例
         
+        ID重复时依次改为 id_2、id_3……直到不再重复。test_cases为 TestCaseCollection 时查重和生成新ID都是O(1)，
+        批量添加时应使用 TestCaseCollection 或 merge_test_cases。
+        
         Args:
-            test_cases: 测试用例列表
+            test_cases: 测试用例列表（或 TestCaseCollection）
             test_case: 要添加的测试用例
         
         Returns:
@@ -228,15 +382,22 @@ class TestCaseManager:
             # 验证测试用例格式
             TestCaseManager.validate_test_case(test_case)
             
-            # 检查ID是否重复
-            existing_ids = [tc['id'] for tc in test_cases]
-            if test_case['id'] in existing_ids:
-                # 生成新ID
-                test_case['id'] = f"{test_case['id']}_new"
-                logger.warning(f"测试用例ID重复，已生成新ID: {test_case['id']}")
+            if isinstance(test_cases, TestCaseCollection):
+                original_id = test_case['id']
+                test_cases.append(test_case)
+            else:
+                # 普通列表没有索引，建立一次集合后查重
+                original_id = test_case['id']
+                existing_ids = {tc['id'] for tc in test_cases}
+                if original_id in existing_ids:
+                    suffix = 2
+                    while f"{original_id}_{suffix}" in existing_ids:
+                        suffix += 1
+                    test_case['id'] = f"{original_id}_{suffix}"
+                test_cases.append(test_case)
             
-            # 添加测试用例
-            test_cases.append(test_case)
+            if test_case['id'] != original_id:
+                logger.warning(f"测试用例ID重复，已生成新ID: {test_case['id']}")
             logger.info(f"测试用例添加成功: {test_case['id']}")
             return True
             
@@ -244,6 +405,33 @@ class TestCaseManager:
             logger.error(f"测试用例添加失败: {str(e)}")
             return False
     
+    @staticmethod
+    def merge_test_cases(test_cases: List[Dict[str, Any]], new_test_cases: Iterable[Dict[str, Any]],
+                         on_conflict: str = 'rename') -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        合并测试用例（如导入的用例），耗时与用例数成线性关系
+        
+        Args:
+            test_cases: 已有的测试用例
+            new_test_cases: 要合并的测试用例
+            on_conflict: ID已存在时的处理方式：rename（改为 id_2 等后追加）、replace（原位替换）、skip（忽略）
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, List[str]]]: (合并后的测试用例, 合并报告：added、replaced、renamed、skipped)
+        """
+        def validated():
+            for test_case in new_test_cases:
+                TestCaseManager.validate_test_case(test_case)
+                yield test_case
+        
+        collection = test_cases if isinstance(test_cases, TestCaseCollection) else TestCaseCollection(test_cases)
+        report = collection.merge(validated(), on_conflict)
+        if report['renamed']:
+            logger.warning(f"合并时 {len(report['renamed'])} 个测试用例ID重复，已生成新ID")
+        logger.info(f"测试用例合并完成: 新增 {len(report['added']) + len(report['renamed'])} 个，"
+                    f"替换 {len(report['replaced'])} 个，忽略 {len(report['skipped'])} 个")
+        return collection.to_list(), report
+    
     @staticmethod
     def delete_test_case(test_cases: List[Dict[str, Any]], index: int) -> bool:
         """
@@ -0,0 +1,321 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Iterable, Tuple
+from app.core.exceptions import create_error
+from app.utils.common_utils import ensure_dir_exists
+from app.utils.logger import logger
+
+class TestCaseStore:
+    """
+    基于SQLite的测试用例库
+    
+    每个用例一行，完整内容以JSON保存，id、方法、路径单独成列并建立索引，标签保存在单独的表中；
+    添加、修改、删除单个用例只写入对应的行，不需要重写整个文件。JSON/YAML仍作为导入导出格式
+    （见 TestCaseManager）。
+    
+    用法:
+        with TestCaseStore('suite.db') as store:
+            store.import_test_cases(test_cases)
+            for test_case in store.query(method='GET', prefix='/orders/'):
+                ...
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS test_cases (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            method TEXT NOT NULL,
+            path TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            content TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_test_cases_method ON test_cases (method);
+        CREATE INDEX IF NOT EXISTS idx_test_cases_path ON test_cases (path);
+        CREATE INDEX IF NOT EXISTS idx_test_cases_position ON test_cases (position);
+        CREATE TABLE IF NOT EXISTS test_case_tags (
+            tag TEXT NOT NULL,
+            case_seq INTEGER NOT NULL REFERENCES test_cases (seq) ON DELETE CASCADE,
+            PRIMARY KEY (tag, case_seq)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_test_case_tags_case ON test_case_tags (case_seq);
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        打开（不存在时创建）用例库
+        
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = db_path
+        dir_path = db_path.rsplit('/', 1)[0] if '/' in db_path else ''
+        if dir_path:
+            ensure_dir_exists(dir_path)
+        # 连接在线程间共享，由锁保证同一时间只有一个线程使用
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+            self._conn.execute('PRAGMA foreign_keys = ON')
+            self._conn.executescript(self._SCHEMA)
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM test_cases').fetchone()[0]
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """按顺序逐个产出所有用例"""
+        return self.query()
+    
+    def __contains__(self, test_case_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM test_cases WHERE id = ?', (test_case_id,)).fetchone() is not None
+    
+    def get(self, test_case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        按id获取用例
+        
+        Args:
+            test_case_id: 用例id
+        
+        Returns:
+            Optional[Dict[str, Any]]: 测试用例，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT content FROM test_cases WHERE id = ?', (test_case_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def ids(self) -> List[str]:
+        """所有用例的id（按顺序）"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT id FROM test_cases ORDER BY position, seq')]
+    
+    def tags(self) -> List[str]:
+        """用例中出现的所有标签"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT DISTINCT tag FROM test_case_tags ORDER BY tag')]
+    
+    def query(self, method: Optional[str] = None, path: Optional[str] = None, tag: Optional[str] = None,
+              prefix: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        按条件筛选用例（条件与 EndpointCatalog.query 相同，之间为“且”的关系），按顺序逐个产出
+        
+        Args:
+            method: HTTP方法
+            path: 完整路径
+            tag: 标签
+            prefix: 路径前缀，以*结尾时去掉*后按前缀匹配
+            batch_size: 每次从数据库读取的行数
+        
+        Yields:
+            Dict[str, Any]: 测试用例
+        """
+        conditions, args = self._build_conditions(method, path, tag, prefix)
+        last = (-1, -1)
+        while True:
+            # 按 (position, seq) 分批读取，每批之间释放锁，遍历期间其他线程仍可以读写
+            sql = self._select('c.content, c.position, c.seq', conditions + ['(c.position, c.seq) > (?, ?)'], tag)
+            with self._lock:
+                rows = self._conn.execute(f'{sql} ORDER BY c.position, c.seq LIMIT ?',
+                                          args + list(last) + [batch_size]).fetchall()
+            for row in rows:
+                yield json.loads(row[0])
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][1:]
+    
+    def count(self, method: Optional[str] = None, path: Optional[str] = None, tag: Optional[str] = None,
+              prefix: Optional[str] = None) -> int:
+        """符合条件的用例数"""
+        conditions, args = self._build_conditions(method, path, tag, prefix)
+        with self._lock:
+            return self._conn.execute(self._select('COUNT(*)', conditions, tag), args).fetchone()[0]
+    
+    @staticmethod
+    def _build_conditions(method: Optional[str], path: Optional[str], tag: Optional[str],
+                          prefix: Optional[str]) -> Tuple[List[str], List[Any]]:
+        """构建筛选条件及参数（标签参数在最前，对应 _select 中的JOIN），前缀按范围查询以使用path索引"""
+        conditions = []
+        args: List[Any] = [tag] if tag else []
+        if method:
+            conditions.append('c.method = ?')
+            args.append(method.upper())
+        if path:
+            conditions.append('c.path = ?')
+            args.append(path)
+        if prefix and prefix.endswith('*'):
+            prefix = prefix[:-1]
+        if prefix:
+            conditions.append('c.path >= ? AND c.path < ?')
+            args.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+        return conditions, args
+    
+    @staticmethod
+    def _select(columns: str, conditions: List[str], tag: Optional[str]) -> str:
+        sql = f'SELECT {columns} FROM test_cases c'
+        if tag:
+            sql += ' JOIN test_case_tags t ON t.case_seq = c.seq AND t.tag = ?'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return sql
+    
+    def add(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        添加用例到末尾
+        
+        Args:
+            test_case: 测试用例
+        
+        Returns:
+            Dict[str, Any]: 添加的测试用例
+        """
+        from app.core.test_case_manager import TestCaseManager
+        TestCaseManager.validate_test_case(test_case)
+        with self._transaction() as conn:
+            if conn.execute('SELECT 1 FROM test_cases WHERE id = ?', (test_case['id'],)).fetchone():
+                error = create_error('VALIDATION_FAILED', f"测试用例ID已存在: {test_case['id']}")
+                raise error
+            position = conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM test_cases').fetchone()[0]
+            self._write(conn, test_case, position, True)
+        logger.info(f"测试用例添加成功: {test_case['id']}")
+        return test_case
+    
+    def update(self, test_case_id: str, test_case: Dict[str, Any]) -> bool:
+        """
+        修改用例（只写入该用例所在的行），用例的id可以修改，但不能与其他用例重复
+        
+        Args:
+            test_case_id: 原用例id
+            test_case: 修改后的测试用例
+        
+        Returns:
+            bool: 用例是否存在
+        """
+        from app.core.test_case_manager import TestCaseManager
+        TestCaseManager.validate_test_case(test_case)
+        with self._transaction() as conn:
+            row = conn.execute('SELECT seq, position FROM test_cases WHERE id = ?', (test_case_id,)).fetchone()
+            if row is None:
+                return False
+            seq, position = row
+            if test_case['id'] != test_case_id:
+                if conn.execute('SELECT 1 FROM test_cases WHERE id = ?', (test_case['id'],)).fetchone():
+                    error = create_error('VALIDATION_FAILED', f"测试用例ID已存在: {test_case['id']}")
+                    raise error
+                conn.execute('UPDATE test_cases SET id = ? WHERE seq = ?', (test_case['id'], seq))
+            self._write(conn, test_case, position)
+        logger.info(f"测试用例更新成功: {test_case['id']}")
+        return True
+    
+    def delete(self, test_case_id: str) -> bool:
+        """
+        删除用例
+        
+        Args:
+            test_case_id: 用例id
+        
+        Returns:
+            bool: 用例是否存在
+        """
+        with self._transaction() as conn:
+            deleted = conn.execute('DELETE FROM test_cases WHERE id = ?', (test_case_id,)).rowcount > 0
+        if deleted:
+            logger.info(f"测试用例删除成功: {test_case_id}")
+        return deleted
+    
+    def import_test_cases(self, test_cases: Iterable[Dict[str, Any]], replace: bool = False) -> Dict[str, int]:
+        """
+        批量导入用例（单个事务，任何一个用例无效或导入的用例之间id重复时全部回滚）
+        
+        id已存在的用例被覆盖（内容未变化时不写入），其余追加到末尾。
+        
+        Args:
+            test_cases: 测试用例
+            replace: 是否替换整个用例库：未出现在test_cases中的用例被删除，顺序与test_cases一致
+        
+        Returns:
+            Dict[str, int]: written（实际写入的用例数）、deleted、total
+        """
+        from app.core.test_case_manager import TestCaseManager
+        written = 0
+        deleted = 0
+        imported_ids = set()
+        with self._transaction() as conn:
+            positions = dict(conn.execute('SELECT id, position FROM test_cases'))
+            stale = set(positions) if replace else set()
+            position = 0 if replace else max(positions.values(), default=-1) + 1
+            for test_case in test_cases:
+                TestCaseManager.validate_test_case(test_case)
+                if test_case['id'] in imported_ids:
+                    # 同一id只能保存一行，不能静默地只保留最后一个
+                    error = create_error('VALIDATION_FAILED', f"导入的测试用例ID重复: {test_case['id']}")
+                    raise error
+                imported_ids.add(test_case['id'])
+                existing = positions.get(test_case['id'])
+                if existing is not None and not replace:
+                    # 覆盖已有用例时保留其位置
+                    case_position = existing
+                else:
+                    case_position = position
+                    position += 1
+                stale.discard(test_case['id'])
+                positions[test_case['id']] = case_position
+                if self._write(conn, test_case, case_position, existing is None):
+                    written += 1
+            if stale:
+                deleted = len(stale)
+                conn.executemany('DELETE FROM test_cases WHERE id = ?', [(test_case_id,) for test_case_id in stale])
+            total = conn.execute('SELECT COUNT(*) FROM test_cases').fetchone()[0]
+        logger.info(f"测试用例导入完成: 写入 {written} 个，删除 {deleted} 个，共 {total} 个")
+        return {'written': written, 'deleted': deleted, 'total': total}
+    
+    def _write(self, conn: sqlite3.Connection, test_case: Dict[str, Any], position: int, new: bool = False) -> bool:
+        """写入单个用例及其标签，内容和位置都未变化时不写入，返回是否写入；new为True时表示确定是新用例"""
+        # 保持字段顺序，加载后与保存前一致
+        content = json.dumps(test_case, ensure_ascii=False)
+        values = (test_case['method'].upper(), test_case['path'], position, content)
+        # 先查询再插入或更新，不使用UPSERT/RETURNING（需要较新的SQLite，部分Python自带的版本不支持）
+        row = None if new else conn.execute('SELECT seq, position, content FROM test_cases WHERE id = ?',
+                                            (test_case['id'],)).fetchone()
+        if row is None:
+            seq = conn.execute('INSERT INTO test_cases (method, path, position, content, id) VALUES (?, ?, ?, ?, ?)',
+                               values + (test_case['id'],)).lastrowid
+        else:
+            seq, old_position, old_content = row
+            # 内容和位置都未变化的用例不产生写操作
+            if old_position == position and old_content == content:
+                return False
+            conn.execute('UPDATE test_cases SET method = ?, path = ?, position = ?, content = ? WHERE seq = ?',
+                         values + (seq,))
+            conn.execute('DELETE FROM test_case_tags WHERE case_seq = ?', (seq,))
+        tags = test_case.get('tags') or []
+        if tags:
+            conn.executemany('INSERT OR IGNORE INTO test_case_tags (tag, case_seq) VALUES (?, ?)',
+                             [(str(tag), seq) for tag in tags])
+        return True
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """在锁内开启事务，正常结束时提交，出错时回滚"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
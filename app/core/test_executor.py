@@ -1,8 +1,9 @@
-import requests
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from app.core.config import config
-from app.utils.common_utils import replace_path_params
+from app.core.session_pool import SessionPool
+from app.core.body_spool import BodySpool, SpoolWriter
+from app.core.request_template import RequestTemplate
 from app.utils.logger import logger
 
 class TestExecutor:
@@ -13,129 +14,256 @@ class TestExecutor:
         self.default_headers = config.get('DEFAULT_HEADERS')
         self.logger = logger
         self.concurrency = config.get('TEST_CONCURRENCY', 5)
+        self.engine = config.get('EXECUTION_ENGINE', 'thread')
+        self.session_pool = SessionPool()
+        self.body_spool = BodySpool()
+        # 为False时每个用例的开始和完成只记录DEBUG日志（如压测时）
+        self.log_each_case = True
     
-    def execute_test_case(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
-        """执行单个测试用例"""
+    def close(self):
+        """关闭执行器持有的HTTP会话"""
+        self.session_pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def compile_request(self, test_case: Dict[str, Any]) -> RequestTemplate:
+        """
+        将测试用例编译为请求模板，重试和重复发送时复用
+        
+        Args:
+            test_case: 测试用例
+        
+        Returns:
+            RequestTemplate: 请求模板
+        """
+        return RequestTemplate.compile(test_case, self.base_url, self.default_headers)
+    
+    def build_request(self, test_case: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        构建请求
+        
+        Args:
+            test_case: 测试用例
+        
+        Returns:
+            Tuple[str, str, Dict[str, Any]]: 请求方法、完整URL（含查询参数）和请求参数（headers/data）
+        """
+        template = self.compile_request(test_case)
+        return template.method, template.url, template.kwargs()
+    
+    def build_result(self, test_case: Dict[str, Any], status_code: int, response_time: float,
+                     response_text: str, response_json: Any, retry_count: int,
+                     body_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        构建成功收到响应时的测试结果
+        
+        body_info 为 read_body 返回的响应体信息（大小、转存文件路径、编码）；
+        响应体被转存时 response_text 只是预览，完整内容通过 load_response_text 读取。
+        """
+        result = {
+            'success': status_code == test_case['expected_status'],
+            'status_code': status_code,
+            'response_time': response_time,
+            'response_text': response_text,
+            'response_json': response_json,
+            'error': '',
+            'retry_count': retry_count,
+            'response_size': len(response_text),
+            'response_body_ref': None,
+            'response_encoding': None
+        }
+        if body_info:
+            result.update(body_info)
+        return result
+    
+    def read_body(self, chunks: Iterable[bytes], encoding: Optional[str]) -> Tuple[Optional[bytes], str, Dict[str, Any]]:
+        """
+        分块读取响应体，超过 RESPONSE_BODY_LIMIT 时转存到磁盘
+        
+        Args:
+            chunks: 响应体分块
+            encoding: 响应声明的编码
+        
+        Returns:
+            Tuple[Optional[bytes], str, Dict[str, Any]]: (未转存时的完整响应体, 转存时的预览文本, 响应体信息)
+        """
+        writer = self.body_spool.writer()
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except Exception:
+            writer.abort()
+            raise
+        return self.finish_body(writer, encoding)
+    
+    def finish_body(self, writer: SpoolWriter, encoding: Optional[str]) -> Tuple[Optional[bytes], str, Dict[str, Any]]:
+        """结束响应体写入，返回值同 read_body"""
+        body, body_ref = writer.finish()
+        body_info = {'response_size': writer.size, 'response_body_ref': body_ref, 'response_encoding': encoding}
+        if body_ref is None:
+            return body, '', body_info
+        
+        body_info['response_encoding'] = encoding or 'utf-8'
+        return None, self.body_spool.decode_preview(body, encoding), body_info
+    
+    @staticmethod
+    def build_error_result(error: str, retry_count: int) -> Dict[str, Any]:
+        """构建请求失败时的测试结果"""
+        return {
+            'success': False,
+            'status_code': 0,
+            'response_time': 0,
+            'response_text': '',
+            'response_json': {},
+            'error': error,
+            'retry_count': retry_count,
+            'response_size': 0,
+            'response_body_ref': None,
+            'response_encoding': None
+        }
+    
+    def execute_test_case(self, test_case: Dict[str, Any], template: Optional[RequestTemplate] = None) -> Dict[str, Any]:
+        """
+        执行单个测试用例
+        
+        Args:
+            test_case: 测试用例
+            template: 已编译的请求模板，为空时编译一次，重试时复用
+        
+        Returns:
+            Dict[str, Any]: 测试结果
+        """
         retry_count = self.retry_count
         last_error = None
         test_case_id = test_case.get('id', 'unknown')
+        log_case = self.logger.info if self.log_each_case else self.logger.debug
         
-        self.logger.info(f"开始执行测试用例: {test_case_id} - {test_case.get('name')}")
+        log_case(f"开始执行测试用例: {test_case_id} - {test_case.get('name')}")
         
         while retry_count >= 0:
             try:
-                # 构建完整URL
-                path = test_case['path']
-                # 处理路径参数
-                processed_path = replace_path_params(path, test_case['params'])
-                url = self.base_url.rstrip('/') + processed_path
+                if template is None:
+                    template = self.compile_request(test_case)
                 
-                self.logger.debug(f"请求URL: {test_case['method']} {url}")
+                self.logger.debug(f"请求URL: {template.method} {template.url}")
                 
-                # 构建请求参数
-                headers = self.default_headers.copy()
-                headers.update(test_case['headers'])
+                # 发送请求，响应体以流的方式读取
+                session = self.session_pool.get_session(template.url)
+                with session.request(template.method, template.url, timeout=self.timeout, stream=True,
+                                     **template.kwargs()) as response:
+                    body, response_text, body_info = self.read_body(response.iter_content(BodySpool.CHUNK_SIZE), response.encoding)
                 
-                kwargs = {
-                    'headers': headers,
-                    'params': {k: v for k, v in test_case['params'].items() if f'{{{k}}}' not in test_case['path']},
-                    'timeout': self.timeout
-                }
+                response_json = {}
+                if body is not None:
+                    # 响应体在内存中，交还给requests按原有规则解码文本和解析JSON
+                    response._content = body
+                    response_text = response.text
+                    try:
+                        response_json = response.json()
+                    except:
+                        pass
                 
-                if test_case['json']:
-                    kwargs['json'] = test_case['json']
-                elif test_case['data']:
-                    kwargs['data'] = test_case['data']
-                
-                # 发送请求
-                method = test_case['method'].lower()
-                response = getattr(requests, method)(url, **kwargs)
-            
                 # 构建结果
-                result = {
-                    'success': response.status_code == test_case['expected_status'],
-                    'status_code': response.status_code,
-                    'response_time': response.elapsed.total_seconds(),
-                    'response_text': response.text,
-                    'response_json': {},
-                    'error': '',
-                    'retry_count': self.retry_count - retry_count
-                }
-                
-                try:
-                    result['response_json'] = response.json()
-                except:
-                    pass
+                result = self.build_result(test_case, response.status_code, response.elapsed.total_seconds(),
+                                           response_text, response_json, self.retry_count - retry_count, body_info)
                 
-                self.logger.info(f"测试用例执行完成: {test_case_id} - 状态码: {result['status_code']} - 耗时: {result['response_time']:.3f}s - 结果: {'成功' if result['success'] else '失败'}")
+                log_case(f"测试用例执行完成: {test_case_id} - 状态码: {result['status_code']} - 耗时: {result['response_time']:.3f}s - 结果: {'成功' if result['success'] else '失败'}")
                 
                 return result
-                
+            
             except Exception as e:
                 last_error = e
                 self.logger.warning(f"测试用例执行失败 (重试 {self.retry_count - retry_count}/{self.retry_count}): {test_case_id} - {str(e)}")
                 retry_count -= 1
                 if retry_count < 0:
-                    result = {
-                        'success': False,
-                        'status_code': 0,
-                        'response_time': 0,
-                        'response_text': '',
-                        'response_json': {},
-                        'error': str(last_error),
-                        'retry_count': self.retry_count
-                    }
                     self.logger.error(f"测试用例执行最终失败: {test_case_id} - {str(last_error)}")
-                    return result
+                    return self.build_error_result(str(last_error), self.retry_count)
         
         # 理论上不会执行到这里
         self.logger.error(f"测试用例执行异常: {test_case_id} - Unknown error")
-        return {
-            'success': False,
-            'status_code': 0,
-            'response_time': 0,
-            'response_text': '',
-            'response_json': {},
-            'error': 'Unknown error',
-            'retry_count': self.retry_count
-        }
+        return self.build_error_result('Unknown error', self.retry_count)
     
     def execute_test_cases(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """执行多个测试用例（支持并发）"""
-        results = []
-        total = len(test_cases)
-        self.logger.info(f"开始执行测试用例，共 {total} 个，并发数: {self.concurrency}")
-        
-        # 使用线程池并发执行
-        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-            # 提交所有任务
-            future_to_test_case = {executor.submit(self.execute_test_case, test_case): test_case for test_case in test_cases}
+        results = list(self.iter_test_cases(test_cases))
+        self.logger.info(f"测试用例执行完成，共 {len(results)} 个，成功 {sum(1 for r in results if r['success'])} 个")
+        return results
+    
+    def iter_test_cases(self, test_cases: Iterable[Dict[str, Any]], max_in_flight: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        执行多个测试用例，按完成顺序逐个产出结果
+        
+        测试用例按需从test_cases中取出，同时在途（已提交但结果未被取走）的用例数不超过max_in_flight，
+        因此内存占用与用例总数无关。
+        
+        Args:
+            test_cases: 测试用例（可以是列表或惰性迭代器）
+            max_in_flight: 最大在途用例数，默认读取 MAX_IN_FLIGHT，未配置时为并发数的2倍
+        
+        Yields:
+            Dict[str, Any]: 测试结果（包含test_case字段）
+        """
+        total = len(test_cases) if hasattr(test_cases, '__len__') else None
+        
+        try:
+            if self.engine == 'async':
+                # 异步引擎：单个事件循环内并发执行大量请求
+                from app.core.async_engine import AsyncEngine
+                self.logger.info(f"开始执行测试用例，共 {total if total is not None else '未知'} 个，执行引擎: async")
+                yield from AsyncEngine(self).iter_test_cases(test_cases, max_in_flight)
+            else:
+                # 使用线程池并发执行
+                max_in_flight = max_in_flight or config.get('MAX_IN_FLIGHT') or self.concurrency * 2
+                self.logger.info(f"开始执行测试用例，共 {total if total is not None else '未知'} 个，并发数: {self.concurrency}")
+                yield from self._iter_thread_pool(test_cases, max_in_flight, total)
+        finally:
+            # 结束后关闭会话池
+            self.close()
+    
+    def _iter_thread_pool(self, test_cases: Iterable[Dict[str, Any]], max_in_flight: int, total: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """在线程池中执行测试用例，按完成顺序产出结果"""
+        pending = iter(test_cases)
+        in_flight = {}
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        
+        def submit_next() -> bool:
+            test_case = next(pending, None)
+            if test_case is None:
+                return False
+            in_flight[executor.submit(self.execute_test_case, test_case)] = test_case
+            return True
+        
+        try:
+            # 提交首批任务
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
             
-            # 收集结果
-            for i, future in enumerate(as_completed(future_to_test_case), 1):
-                test_case = future_to_test_case[future]
-                try:
-                    result = future.result()
+            # 收集结果，每完成一个补充一个
+            completed = 0
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    test_case = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"测试用例执行异常: {test_case.get('id', 'unknown')} - {str(e)}")
+                        result = self.build_error_result(str(e), 0)
                     result['test_case'] = test_case
-                    results.append(result)
                     
                     # 记录进度
-                    if i % 10 == 0 or i == total:
-                        self.logger.info(f"测试执行进度: {i}/{total}")
-                        
-                except Exception as e:
-                    self.logger.error(f"测试用例执行异常: {test_case.get('id', 'unknown')} - {str(e)}")
-                    result = {
-                        'success': False,
-                        'status_code': 0,
-                        'response_time': 0,
-                        'response_text': '',
-                        'response_json': {},
-                        'error': str(e),
-                        'retry_count': 0,
-                        'test_case': test_case
-                    }
-                    results.append(result)
-        
-        self.logger.info(f"测试用例执行完成，共 {total} 个，成功 {sum(1 for r in results if r['success'])} 个")
-        return results
\ No newline at end of file
+                    completed += 1
+                    if completed % 10 == 0 or completed == total:
+                        self.logger.info(f"测试执行进度: {completed}/{total if total is not None else '?'}")
+                    
+                    submit_next()
+                    yield result
+        finally:
+            # 调用方提前停止迭代时，取消尚未开始的任务
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
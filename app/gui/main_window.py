@@ -1,14 +1,19 @@
-from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTextEdit, QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, QLabel, QSplitter, QProgressBar, QStatusBar, QApplication
+from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTextEdit, QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, QLabel, QSplitter, QProgressBar, QStatusBar, QApplication, QComboBox
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QColor, QPalette
 from app.core.enhanced_doc_parser import EnhancedDocParser
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.spec_diff import SpecDiff
+from app.core.batch_importer import BatchImporter, BatchImportResult
 from app.core.test_case_generator import TestCaseGenerator
 from app.core.test_executor import TestExecutor
 from app.core.report_generator import ReportGenerator
+from app.core.run_statistics import RunStatistics
 from app.core.test_case_manager import TestCaseManager
 from app.core.plugin_system import plugin_manager
 from app.api.api_server import api_server
 from app.gui.test_case_editor import TestCaseEditor
+from app.utils import binary_records
 import json
 import os
 
@@ -24,8 +29,10 @@ class MainWindow(QMainWindow):
         # 初始化数据
         self.swagger_doc = None
         self.endpoints = []
+        self.endpoint_catalog = None
         self.test_cases = []
         self.test_results = []
+        self.test_statistics = RunStatistics()
         self.base_url = ''
         
         # 创建主布局
@@ -204,21 +211,42 @@ class MainWindow(QMainWindow):
         # 创建输入区域
         input_layout = QHBoxLayout()
         self.doc_path_edit = QLineEdit()
-        self.doc_path_edit.setPlaceholderText("输入Swagger文档URL或本地文件路径")
+        self.doc_path_edit.setPlaceholderText("输入Swagger文档URL或本地文件路径（批量导入多个文档时以;分隔）")
         browse_btn = QPushButton("浏览")
         browse_btn.clicked.connect(self.browse_doc_file)
         parse_btn = QPushButton("解析文档")
         parse_btn.clicked.connect(self.parse_doc)
+        batch_btn = QPushButton("批量导入")
+        batch_btn.clicked.connect(self.batch_import_docs)
         
         input_layout.addWidget(self.doc_path_edit)
         input_layout.addWidget(browse_btn)
         input_layout.addWidget(parse_btn)
+        input_layout.addWidget(batch_btn)
+        
+        # 创建接口筛选区域
+        filter_layout = QHBoxLayout()
+        self.method_filter_combo = QComboBox()
+        self.method_filter_combo.addItems(["全部方法", "GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"])
+        self.tag_filter_edit = QLineEdit()
+        self.tag_filter_edit.setPlaceholderText("标签")
+        self.prefix_filter_edit = QLineEdit()
+        self.prefix_filter_edit.setPlaceholderText("路径前缀，如 /orders/*")
+        filter_btn = QPushButton("筛选接口")
+        filter_btn.clicked.connect(self.filter_endpoints)
+        
+        filter_layout.addWidget(QLabel("筛选:"))
+        filter_layout.addWidget(self.method_filter_combo)
+        filter_layout.addWidget(self.tag_filter_edit)
+        filter_layout.addWidget(self.prefix_filter_edit)
+        filter_layout.addWidget(filter_btn)
         
         # 创建结果显示区域
         self.doc_result_edit = QTextEdit()
         self.doc_result_edit.setReadOnly(True)
         
         layout.addLayout(input_layout)
+        layout.addLayout(filter_layout)
         layout.addWidget(QLabel("解析结果:"))
         layout.addWidget(self.doc_result_edit)
         
@@ -237,6 +265,11 @@ class MainWindow(QMainWindow):
         generate_btn.clicked.connect(self.generate_test_cases)
         button_layout.addWidget(generate_btn)
         
+        # 增量更新按钮
+        update_btn = QPushButton("按文档更新用例")
+        update_btn.clicked.connect(self.update_test_cases_from_doc)
+        button_layout.addWidget(update_btn)
+        
         # 导入按钮
         import_btn = QPushButton("导入测试用例")
         import_btn.clicked.connect(self.import_test_cases)
@@ -300,9 +333,12 @@ class MainWindow(QMainWindow):
         generate_html_btn.clicked.connect(lambda: self.generate_report('html'))
         generate_json_btn = QPushButton("生成JSON报告")
         generate_json_btn.clicked.connect(lambda: self.generate_report('json'))
+        generate_paged_btn = QPushButton("生成分页HTML报告")
+        generate_paged_btn.clicked.connect(lambda: self.generate_report('paged'))
         
         report_layout.addWidget(generate_html_btn)
         report_layout.addWidget(generate_json_btn)
+        report_layout.addWidget(generate_paged_btn)
         layout.addLayout(report_layout)
         
         # 创建报告显示区域
@@ -328,18 +364,12 @@ class MainWindow(QMainWindow):
             
             # 解析文档
             self.swagger_doc = EnhancedDocParser.parse_doc(path)
-            self.endpoints = EnhancedDocParser.extract_endpoints(self.swagger_doc)
+            self.endpoint_catalog = EndpointCatalog(self.swagger_doc)
+            self.endpoints = list(self.endpoint_catalog.query(**self.get_endpoint_filters()))
             
             # 显示结果
-            result = f"成功解析文档！\n"
-            result += f"接口数量: {len(self.endpoints)}\n\n"
-            for i, endpoint in enumerate(self.endpoints[:10]):
-                result += f"{i+1}. {endpoint['method']} {endpoint['path']} - {endpoint['summary']}\n"
-            if len(self.endpoints) > 10:
-                result += f"... 还有 {len(self.endpoints) - 10} 个接口未显示"
-            
-            self.doc_result_edit.setText(result)
-            QMessageBox.information(self, "成功", f"文档解析成功，共发现 {len(self.endpoints)} 个接口")
+            self.show_endpoints()
+            QMessageBox.information(self, "成功", f"文档解析成功，共发现 {len(self.endpoint_catalog)} 个接口")
             
         except Exception as e:
             # 检查是否是自定义错误
@@ -349,6 +379,82 @@ class MainWindow(QMainWindow):
                 error_message = f"解析文档失败: {str(e)}"
             QMessageBox.critical(self, "错误", error_message)
     
+    def batch_import_docs(self):
+        """批量导入多个文档：并发下载、多进程解析，合并为一个接口目录"""
+        try:
+            text = self.doc_path_edit.text().strip()
+            if ';' in text:
+                sources = [path.strip() for path in text.split(';') if path.strip()]
+            else:
+                sources, _ = QFileDialog.getOpenFileNames(self, "选择接口文档", "", "文档文件 (*.json *.yaml *.yml)")
+            if not sources:
+                return
+            
+            self.status_label.setText("正在批量导入文档...")
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setRange(0, len(sources))
+            
+            # 逐个接收导入结果并更新进度
+            result = BatchImportResult()
+            for i, document in enumerate(BatchImporter.iter_import(sources), 1):
+                result.add(document)
+                self.progress_bar.setValue(i)
+                self.status_label.setText(f"已导入 {i}/{len(sources)} 个文档: {document['service']}")
+                QApplication.processEvents()
+            
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("就绪")
+            
+            if result.catalogs:
+                self.swagger_doc = None
+                self.endpoint_catalog = result
+                self.endpoints = list(result.query(**self.get_endpoint_filters()))
+                self.show_endpoints()
+            
+            message = f"成功导入 {len(result.catalogs)} 个文档，共 {len(result)} 个接口"
+            if result.errors:
+                message += "\n\n导入失败的文档:\n" + "\n".join(f"{error['source']}: {error['error']}" for error in result.errors)
+                QMessageBox.warning(self, "批量导入完成", message)
+            else:
+                QMessageBox.information(self, "成功", message)
+            
+        except Exception as e:
+            self.progress_bar.setVisible(False)
+            self.status_label.setText("就绪")
+            QMessageBox.critical(self, "错误", f"批量导入文档失败: {str(e)}")
+    
+    def get_endpoint_filters(self):
+        """获取接口筛选条件"""
+        filters = {}
+        if self.method_filter_combo.currentIndex() > 0:
+            filters['method'] = self.method_filter_combo.currentText()
+        if self.tag_filter_edit.text().strip():
+            filters['tag'] = self.tag_filter_edit.text().strip()
+        if self.prefix_filter_edit.text().strip():
+            filters['prefix'] = self.prefix_filter_edit.text().strip()
+        return filters
+    
+    def filter_endpoints(self):
+        """按条件筛选接口，生成测试用例时只使用筛选后的接口"""
+        if not self.endpoint_catalog:
+            QMessageBox.warning(self, "警告", "请先解析接口文档")
+            return
+        self.endpoints = list(self.endpoint_catalog.query(**self.get_endpoint_filters()))
+        self.show_endpoints()
+    
+    def show_endpoints(self):
+        """显示接口列表"""
+        result = f"成功解析文档！\n"
+        result += f"接口数量: {len(self.endpoint_catalog)}，符合筛选条件: {len(self.endpoints)}\n"
+        if self.endpoint_catalog.tags():
+            result += f"标签: {', '.join(self.endpoint_catalog.tags())}\n"
+        result += "\n"
+        for i, endpoint in enumerate(self.endpoints[:10]):
+            result += f"{i+1}. {endpoint['method']} {endpoint['path']} - {endpoint['summary']}\n"
+        if len(self.endpoints) > 10:
+            result += f"... 还有 {len(self.endpoints) - 10} 个接口未显示"
+        self.doc_result_edit.setText(result)
+    
     def generate_test_cases(self):
         """生成测试用例"""
         try:
@@ -367,6 +473,33 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"生成测试用例失败: {str(e)}")
     
+    def update_test_cases_from_doc(self):
+        """按当前解析的文档增量更新测试用例：只重新生成变化的接口，保留手工修改过的用例"""
+        try:
+            if not self.endpoint_catalog:
+                QMessageBox.warning(self, "警告", "请先解析接口文档")
+                return
+            if not isinstance(self.endpoint_catalog, EndpointCatalog):
+                QMessageBox.warning(self, "警告", "批量导入的多个文档不支持增量更新，请单独解析要更新的文档")
+                return
+            
+            self.test_cases, report = SpecDiff.update_test_cases(self.test_cases, self.endpoint_catalog)
+            self.update_test_cases_table()
+            
+            message = (f"新增接口 {len(report['added'])} 个，变化 {len(report['changed'])} 个，"
+                       f"删除 {len(report['removed'])} 个，未变化 {report['unchanged']} 个\n"
+                       f"重新生成用例 {len(report['regenerated'])} 个")
+            if report['conflicts']:
+                message += f"\n接口已变化但用例被手工修改过（已保留）: {', '.join(report['conflicts'])}"
+            if report['orphaned']:
+                message += f"\n接口已删除但用例被手工修改过（已保留）: {', '.join(report['orphaned'])}"
+            if report['renamed']:
+                message += f"\n生成的用例ID与已有用例重复，已重命名为: {', '.join(report['renamed'])}"
+            QMessageBox.information(self, "成功", message)
+            
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"更新测试用例失败: {str(e)}")
+    
     def update_test_cases_table(self):
         """更新测试用例表格"""
         self.test_cases_table.setRowCount(len(self.test_cases))
@@ -398,12 +531,16 @@ class MainWindow(QMainWindow):
     def import_test_cases(self):
         """导入测试用例"""
         try:
-            file_path, _ = QFileDialog.getOpenFileName(self, "选择测试用例文件", "", "JSON/YAML文件 (*.json *.yaml *.yml)")
+            file_path, _ = QFileDialog.getOpenFileName(self, "选择测试用例文件", "", "测试用例文件 (*.json *.jsonl *.yaml *.yml *.db *.pack *.pack.gz *.pack.zst)")
             if file_path:
                 imported_test_cases = TestCaseManager.load_test_cases(file_path)
-                self.test_cases.extend(imported_test_cases)
+                # 与已有用例ID重复的用例改为 id_2 等新ID
+                self.test_cases, report = TestCaseManager.merge_test_cases(self.test_cases, imported_test_cases)
                 self.update_test_cases_table()
-                QMessageBox.information(self, "成功", f"导入测试用例成功，共导入 {len(imported_test_cases)} 个用例")
+                message = f"导入测试用例成功，共导入 {len(imported_test_cases)} 个用例"
+                if report['renamed']:
+                    message += f"，其中 {len(report['renamed'])} 个用例ID重复，已自动重命名"
+                QMessageBox.information(self, "成功", message)
         except Exception as e:
             # 检查是否是自定义错误
             if hasattr(e, 'solution') and e.solution:
@@ -419,7 +556,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", "没有测试用例可导出")
                 return
             
-            file_path, _ = QFileDialog.getSaveFileName(self, "保存测试用例文件", "test_cases.json", "JSON文件 (*.json);;YAML文件 (*.yaml *.yml)")
+            file_path, _ = QFileDialog.getSaveFileName(self, "保存测试用例文件", "test_cases.json", "JSON文件 (*.json);;JSON Lines文件 (*.jsonl);;YAML文件 (*.yaml *.yml);;SQLite用例库 (*.db);;紧凑二进制文件 (*.pack *.pack.gz *.pack.zst)")
             if file_path:
                 if TestCaseManager.export_test_cases(self.test_cases, file_path):
                     QMessageBox.information(self, "成功", "测试用例导出成功")
@@ -435,7 +572,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", "没有测试用例可保存")
                 return
             
-            file_path, _ = QFileDialog.getSaveFileName(self, "保存测试用例文件", "test_cases.json", "JSON文件 (*.json);;YAML文件 (*.yaml *.yml)")
+            file_path, _ = QFileDialog.getSaveFileName(self, "保存测试用例文件", "test_cases.json", "JSON文件 (*.json);;JSON Lines文件 (*.jsonl);;YAML文件 (*.yaml *.yml);;SQLite用例库 (*.db);;紧凑二进制文件 (*.pack *.pack.gz *.pack.zst)")
             if file_path:
                 if TestCaseManager.save_test_cases(self.test_cases, file_path):
                     QMessageBox.information(self, "成功", "测试用例保存成功")
@@ -465,13 +602,15 @@ class MainWindow(QMainWindow):
             # 创建执行器
             executor = TestExecutor(self.base_url)
             
-            # 执行测试
-            self.test_results = executor.execute_test_cases(self.test_cases)
-            
-            # 模拟进度更新
-            for i in range(len(self.test_cases) + 1):
+            # 执行测试，逐个接收结果并更新进度
+            self.test_results = []
+            self.test_statistics = RunStatistics()
+            total = len(self.test_cases)
+            for i, result in enumerate(executor.iter_test_cases(self.test_cases), 1):
+                self.test_results.append(result)
+                self.test_statistics.add(result)
                 self.progress_bar.setValue(i)
-                self.status_label.setText(f"执行测试用例 {i}/{len(self.test_cases)}")
+                self.status_label.setText(f"执行测试用例 {i}/{total}，通过 {self.test_statistics.passed}")
                 # 处理事件循环，确保UI更新
                 QApplication.processEvents()
             
@@ -480,7 +619,7 @@ class MainWindow(QMainWindow):
             
             # 重置状态
             self.progress_bar.setVisible(False)
-            self.status_label.setText("测试执行完成")
+            self.status_label.setText(f"测试执行完成: {self.test_statistics.status_text()}")
             
             QMessageBox.information(self, "成功", "测试执行完成")
             
@@ -514,7 +653,7 @@ class MainWindow(QMainWindow):
                 return
             
             if format_type == 'html':
-                report = ReportGenerator.generate_html_report(self.test_results)
+                report = ReportGenerator.generate_html_report(self.test_results, self.test_statistics)
                 # 保存为文件
                 file_path, _ = QFileDialog.getSaveFileName(self, "保存HTML报告", "report.html", "HTML文件 (*.html)")
                 if file_path:
@@ -524,15 +663,34 @@ class MainWindow(QMainWindow):
                     self.report_edit.setHtml(report)
             
             elif format_type == 'json':
-                report = ReportGenerator.generate_json_report(self.test_results)
                 # 保存为文件
-                file_path, _ = QFileDialog.getSaveFileName(self, "保存JSON报告", "report.json", "JSON文件 (*.json)")
-                if file_path:
+                file_path, _ = QFileDialog.getSaveFileName(self, "保存JSON报告", "report.json", "JSON文件 (*.json);;JSON Lines结果文件 (*.jsonl);;紧凑二进制报告 (*.pack.gz *.pack *.pack.zst)")
+                if file_path and binary_records.binary_compression(file_path) is not None:
+                    # 内容与JSON报告相同，体积小得多，用 ReportGenerator.load_binary_report 读回
+                    count = ReportGenerator.write_binary_report(self.test_results, file_path, self.test_statistics)
+                    QMessageBox.information(self, "成功", f"二进制报告已保存到: {file_path}")
+                    self.report_edit.setText(f"二进制报告: {file_path}（{count} 个结果）\n{self.test_statistics.status_text()}")
+                elif file_path and file_path.lower().endswith('.jsonl'):
+                    # 每行一个测试结果，可以逐行读取
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        count = ReportGenerator.write_jsonl_results(self.test_results, f)
+                    QMessageBox.information(self, "成功", f"测试结果已保存到: {file_path}")
+                    self.report_edit.setText(f"JSON Lines结果文件: {file_path}（{count} 个结果）\n{self.test_statistics.status_text()}")
+                elif file_path:
+                    report = ReportGenerator.generate_json_report(self.test_results, self.test_statistics)
                     with open(file_path, 'w', encoding='utf-8') as f:
                         f.write(report)
                     QMessageBox.information(self, "成功", f"JSON报告已保存到: {file_path}")
                     self.report_edit.setText(report)
             
+            elif format_type == 'paged':
+                # 分页报告为一个目录，详情按页存放，适合结果较多的情况
+                directory = QFileDialog.getExistingDirectory(self, "选择报告目录")
+                if directory:
+                    index_path = ReportGenerator.write_paged_html_report(self.test_results, directory, self.test_statistics)
+                    QMessageBox.information(self, "成功", f"分页HTML报告已保存到: {index_path}")
+                    self.report_edit.setText(f"分页HTML报告: {index_path}\n{self.test_statistics.status_text()}")
+            
         except Exception as e:
             QMessageBox.critical(self, "错误", f"生成报告失败: {str(e)}")
     
@@ -542,4 +700,4 @@ class MainWindow(QMainWindow):
     
     def generate_json_report(self):
         """生成JSON报告"""
-        self.generate_report('json')
\ No newline at end of file
+        self.generate_report('json')
@@ -0,0 +1,185 @@
+from collections.abc import MutableSequence
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Union
+from app.core.exceptions import create_error
+
+class TestCaseCollection(MutableSequence):
+    """
+    带id索引的测试用例集合
+    
+    可以像列表一样按位置访问和修改，同时维护 id -> 位置 的哈希索引：按id查找、判断重复都是O(1)，
+    在末尾添加用例不需要扫描已有用例，批量添加、合并的耗时与用例数成线性关系。
+    在中间插入或删除时，其后的用例位置整体移动，索引随之更新（与列表的代价相同）。
+    
+    集合中的id始终唯一：添加的用例id已存在时，自动改为 id_2、id_3……（见 unique_id）。
+    """
+    
+    def __init__(self, test_cases: Iterable[Dict[str, Any]] = ()):
+        """
+        初始化集合
+        
+        Args:
+            test_cases: 初始用例，重复的id按 unique_id 规则改名
+        """
+        self._cases: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        # 各基础id下一个尝试的序号，使生成唯一id不需要从头逐个尝试
+        self._next_suffix: Dict[str, int] = {}
+        self.extend(test_cases)
+    
+    @staticmethod
+    def make_id(method: str, path: str) -> str:
+        """
+        根据方法和路径生成用例id（生成器和 TestCaseManager.generate_test_case_id 共用）
+        
+        Args:
+            method: HTTP方法
+            path: 路径
+        
+        Returns:
+            str: 用例id，如 test_get__users_id
+        """
+        # 移除路径中的特殊字符
+        clean_path = path.replace('/', '_').replace('{', '').replace('}', '')
+        return f"test_{method.lower()}_{clean_path}"
+    
+    def unique_id(self, base_id: str) -> str:
+        """
+        返回集合中尚未使用的id：base_id未被使用时直接返回，否则依次尝试 base_id_2、base_id_3……
+        
+        同一基础id的序号只增不减，重复调用的均摊时间为O(1)。
+        
+        Args:
+            base_id: 基础id
+        
+        Returns:
+            str: 唯一的id
+        """
+        if base_id not in self._index:
+            return base_id
+        suffix = self._next_suffix.get(base_id, 2)
+        while f"{base_id}_{suffix}" in self._index:
+            suffix += 1
+        self._next_suffix[base_id] = suffix + 1
+        return f"{base_id}_{suffix}"
+    
+    def __len__(self) -> int:
+        return len(self._cases)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._cases)
+    
+    def __contains__(self, item: Union[str, Dict[str, Any]]) -> bool:
+        """判断用例id（或用例）是否在集合中"""
+        if isinstance(item, str):
+            return item in self._index
+        return isinstance(item, dict) and self.get(item.get('id')) == item
+    
+    def __getitem__(self, index):
+        return self._cases[index]
+    
+    def __setitem__(self, index: int, test_case: Dict[str, Any]):
+        """替换指定位置的用例，新id与其他用例重复时报错"""
+        if isinstance(index, slice):
+            raise TypeError('TestCaseCollection不支持按切片赋值')
+        index = range(len(self._cases))[index]
+        old_id = self._cases[index]['id']
+        new_id = test_case['id']
+        if new_id != old_id:
+            if new_id in self._index:
+                error = create_error('VALIDATION_FAILED', f"测试用例ID已存在: {new_id}")
+                raise error
+            del self._index[old_id]
+            self._index[new_id] = index
+        self._cases[index] = test_case
+    
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            del self._cases[index]
+            self._index = {}
+            self._reindex(0)
+            return
+        index = range(len(self._cases))[index]
+        del self._index[self._cases[index]['id']]
+        del self._cases[index]
+        self._reindex(index)
+    
+    def insert(self, index: int, test_case: Dict[str, Any]):
+        """在指定位置插入用例，id重复时改名（直接修改传入的用例）"""
+        test_case['id'] = self.unique_id(test_case['id'])
+        index = min(max(index + len(self._cases) if index < 0 else index, 0), len(self._cases))
+        self._cases.insert(index, test_case)
+        if index == len(self._cases) - 1:
+            self._index[test_case['id']] = index
+        else:
+            self._reindex(index)
+    
+    def append(self, test_case: Dict[str, Any]):
+        """在末尾添加用例（O(1)），id重复时改名（直接修改传入的用例）"""
+        test_case['id'] = self.unique_id(test_case['id'])
+        self._index[test_case['id']] = len(self._cases)
+        self._cases.append(test_case)
+    
+    def extend(self, test_cases: Iterable[Dict[str, Any]]):
+        """在末尾批量添加用例，id重复时改名"""
+        for test_case in test_cases:
+            self.append(test_case)
+    
+    def _reindex(self, start: int):
+        """更新从start开始的位置索引（中间插入、删除后）"""
+        for position in range(start, len(self._cases)):
+            self._index[self._cases[position]['id']] = position
+    
+    def get(self, test_case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        按id获取用例
+        
+        Args:
+            test_case_id: 用例id
+        
+        Returns:
+            Optional[Dict[str, Any]]: 测试用例，不存在时返回None
+        """
+        position = self._index.get(test_case_id)
+        return self._cases[position] if position is not None else None
+    
+    def position(self, test_case_id: str) -> Optional[int]:
+        """用例的位置，不存在时返回None"""
+        return self._index.get(test_case_id)
+    
+    def ids(self) -> List[str]:
+        """所有用例的id（按顺序）"""
+        return [test_case['id'] for test_case in self._cases]
+    
+    def merge(self, test_cases: Iterable[Dict[str, Any]], on_conflict: str = 'rename') -> Dict[str, List[str]]:
+        """
+        合并用例，耗时与用例数成线性关系
+        
+        Args:
+            test_cases: 要合并的用例
+            on_conflict: id已存在时的处理方式：rename（改名后追加）、replace（原位替换）、skip（忽略）
+        
+        Returns:
+            Dict[str, List[str]]: added、replaced、renamed（改名后的id）、skipped
+        """
+        if on_conflict not in ('rename', 'replace', 'skip'):
+            error = create_error('VALIDATION_FAILED', f"不支持的冲突处理方式: {on_conflict}，应为 rename、replace 或 skip")
+            raise error
+        report = {'added': [], 'replaced': [], 'renamed': [], 'skipped': []}
+        for test_case in test_cases:
+            position = self._index.get(test_case['id'])
+            if position is None:
+                self.append(test_case)
+                report['added'].append(test_case['id'])
+            elif on_conflict == 'replace':
+                self._cases[position] = test_case
+                report['replaced'].append(test_case['id'])
+            elif on_conflict == 'skip':
+                report['skipped'].append(test_case['id'])
+            else:
+                self.append(test_case)
+                report['renamed'].append(test_case['id'])
+        return report
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """转换为列表（用于JSON序列化）"""
+        return list(self._cases)
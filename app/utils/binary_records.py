@@ -0,0 +1,198 @@
+import io
+import os
+import gzip
+import json
+import zlib
+import struct
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Tuple
+from app.utils.common_utils import atomic_write
+
+# 紧凑二进制记录文件：文件头（魔数 + 格式版本 + 编码方式）之后是逐条记录，每条记录为4字节大端长度 + 编码后的内容。
+# 记录可以逐条写出、逐条读取，不需要把整个文件读入内存；整个文件可以再用gzip或zstd压缩。
+MAGIC = b'ATPK'
+VERSION = 1
+_HEADER = struct.Struct('>4sBB')
+_LENGTH = struct.Struct('>I')
+
+# 编码方式：msgpack（可选依赖，编码和解码都更快）；未安装时使用紧凑JSON（UTF-8，无缩进）
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+# 扩展名 -> 压缩方式
+BINARY_EXTENSIONS = {'pack': '', 'pack.gz': 'gzip', 'pack.zst': 'zstd'}
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+def binary_compression(file_path: str) -> Optional[str]:
+    """
+    根据扩展名判断是否为二进制记录文件
+    
+    Args:
+        file_path: 文件路径
+    
+    Returns:
+        Optional[str]: 压缩方式：''（不压缩，.pack）、'gzip'（.pack.gz）、'zstd'（.pack.zst）；不是二进制记录文件时为None
+    """
+    name = os.path.basename(file_path).lower()
+    for extension, compression in BINARY_EXTENSIONS.items():
+        if name.endswith('.' + extension):
+            return compression
+    return None
+
+def _import_zstandard():
+    """导入zstandard（可选依赖）"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise ImportError('读写 .pack.zst 文件需要安装zstandard: pip install zstandard，或改用 .pack.gz') from None
+
+@contextmanager
+def _compressed_writer(fp: BinaryIO, compression: str) -> Iterator[BinaryIO]:
+    """在fp上包装压缩流，退出时写完压缩数据（不关闭fp）"""
+    if not compression:
+        yield fp
+        return
+    if compression == 'gzip':
+        # mtime固定为0，内容相同时输出的文件也相同
+        writer = gzip.GzipFile(fileobj=fp, mode='wb', compresslevel=6, mtime=0)
+    else:
+        writer = _import_zstandard().ZstdCompressor(level=3).stream_writer(fp, closefd=False)
+    with writer:
+        yield writer
+
+def _compressed_reader(fp: BinaryIO, compression: str) -> BinaryIO:
+    """在fp上包装解压流"""
+    if not compression:
+        return fp
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=fp, mode='rb')
+    return io.BufferedReader(_import_zstandard().ZstdDecompressor().stream_reader(fp, closefd=False))
+
+def _encoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        return msgpack.Packer(use_bin_type=True).pack
+    return lambda record: json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _decoder(codec: int):
+    if codec == CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ImportError('该文件使用msgpack编码，读取需要安装msgpack: pip install msgpack')
+        return lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if codec == CODEC_JSON:
+        # 直接解码UTF-8文本，省去json.loads对字节串的编码检测
+        decode = json.JSONDecoder().decode
+        return lambda data: decode(data.decode('utf-8'))
+    raise ValueError(f'不支持的记录编码方式: {codec}')
+
+def write_records(fp: BinaryIO, records: Iterable[Any], compression: str = '', codec: Optional[int] = None) -> int:
+    """
+    逐条写出记录
+    
+    Args:
+        fp: 以二进制模式打开的文件对象
+        records: 记录（可由JSON表示的对象），可以是逐个产出的
+        compression: 压缩方式：''、'gzip' 或 'zstd'
+        codec: 编码方式，默认安装了msgpack时使用msgpack，否则使用JSON
+    
+    Returns:
+        int: 写出的记录数
+    """
+    if codec is None:
+        codec = CODEC_MSGPACK if MSGPACK_AVAILABLE else CODEC_JSON
+    encode = _encoder(codec)
+    pack_length = _LENGTH.pack
+    count = 0
+    with _compressed_writer(fp, compression) as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, codec))
+        for record in records:
+            data = encode(record)
+            out.write(pack_length(len(data)))
+            out.write(data)
+            count += 1
+    return count
+
+def iter_records(fp: BinaryIO, compression: str = '') -> Iterator[Tuple[int, Any]]:
+    """
+    逐条读取 write_records 写出的记录
+    
+    Args:
+        fp: 以二进制模式打开的文件对象
+        compression: 压缩方式：''、'gzip' 或 'zstd'
+    
+    Yields:
+        Tuple[int, Any]: (记录序号（从1开始）, 解码后的记录)
+    
+    Raises:
+        ValueError: 文件不是二进制记录文件，或记录不完整（文件被截断、损坏），错误信息中包含记录序号
+    """
+    reader = _compressed_reader(fp, compression)
+    number = 0
+    try:
+        header = reader.read(_HEADER.size)
+        if len(header) != _HEADER.size or header[:4] != MAGIC:
+            raise ValueError('不是二进制记录文件（文件头不匹配）')
+        _, version, codec = _HEADER.unpack(header)
+        if version > VERSION:
+            raise ValueError(f'二进制记录文件的格式版本 {version} 高于当前支持的版本 {VERSION}')
+        decode = _decoder(codec)
+        unpack_length = _LENGTH.unpack
+        read = reader.read
+        while True:
+            prefix = read(4)
+            if not prefix:
+                return
+            number += 1
+            if len(prefix) != 4:
+                raise ValueError(f'第 {number} 条记录不完整（文件被截断）')
+            length, = unpack_length(prefix)
+            data = read(length)
+            if len(data) != length:
+                raise ValueError(f'第 {number} 条记录不完整（文件被截断）')
+            try:
+                record = decode(data)
+            except Exception as e:
+                raise ValueError(f'第 {number} 条记录无法解码: {e}') from None
+            yield number, record
+    except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+        raise ValueError(f'第 {number + 1} 条记录附近的压缩数据损坏: {e}') from None
+
+def write_file(file_path: str, records: Iterable[Any], codec: Optional[int] = None) -> int:
+    """
+    将记录原子地写入文件，压缩方式由扩展名决定（.pack / .pack.gz / .pack.zst）
+    
+    Args:
+        file_path: 文件路径
+        records: 记录
+        codec: 编码方式，默认安装了msgpack时使用msgpack，否则使用JSON
+    
+    Returns:
+        int: 写出的记录数
+    """
+    compression = binary_compression(file_path)
+    if compression is None:
+        raise ValueError(f'不是二进制记录文件的扩展名（应为 .pack、.pack.gz 或 .pack.zst）: {file_path}')
+    with atomic_write(file_path, 'wb') as f:
+        return write_records(f, records, compression, codec)
+
+def iter_file(file_path: str) -> Iterator[Tuple[int, Any]]:
+    """
+    逐条读取二进制记录文件，压缩方式由扩展名决定
+    
+    Args:
+        file_path: 文件路径
+    
+    Yields:
+        Tuple[int, Any]: (记录序号（从1开始）, 解码后的记录)
+    """
+    compression = binary_compression(file_path)
+    if compression is None:
+        raise ValueError(f'不是二进制记录文件的扩展名（应为 .pack、.pack.gz 或 .pack.zst）: {file_path}')
+    with open(file_path, 'rb') as f:
+        yield from iter_records(f, compression)
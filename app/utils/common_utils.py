@@ -1,7 +1,9 @@
 import os
 import time
 import logging
-from typing import Dict, Any, List, Optional
+import secrets
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, IO, Iterator
 from datetime import datetime
 
 # 路径参数处理
@@ -34,6 +36,71 @@ def ensure_dir_exists(dir_path: str):
     if not os.path.exists(dir_path):
         os.makedirs(dir_path, exist_ok=True)
 
+@contextmanager
+def atomic_write(file_path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> Iterator[IO]:
+    """
+    原子写入文件：先写入同目录下的临时文件并刷到磁盘，再重命名为目标文件
+    
+    写入过程中出错（或进程中断、磁盘已满）时目标文件保持原样，不会留下写了一半的文件。
+    
+    Args:
+        file_path: 目标文件路径
+        mode: 打开模式，'w' 或 'wb'
+        encoding: 文本模式下的编码
+    
+    Yields:
+        IO: 临时文件对象
+    """
+    dir_path = os.path.dirname(os.path.abspath(file_path))
+    ensure_dir_exists(dir_path)
+    fd, tmp_path = _create_temp_file(dir_path, f'.{os.path.basename(file_path)}.')
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # 覆盖已有文件时保持其权限；新建文件的权限与直接创建时相同（由umask决定）
+        try:
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    fsync_dir(dir_path)
+
+def _create_temp_file(dir_path: str, prefix: str):
+    """
+    在目录中创建临时文件，返回 (文件描述符, 路径)
+    
+    与open()新建文件一样以0o666创建、由系统按umask去掉相应权限（mkstemp固定为0o600，
+    之后再设置权限需要读取umask，而读取umask会短暂修改进程的umask，多线程下不安全）。
+    """
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = os.path.join(dir_path, f'{prefix}{secrets.token_hex(8)}.tmp')
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+def fsync_dir(dir_path: str):
+    """将目录项刷到磁盘，使重命名、新建的文件在断电后仍然存在（Windows不支持，忽略）"""
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 def get_file_extension(file_path: str) -> str:
     """
     获取文件扩展名
@@ -129,6 +196,25 @@ def str_to_dict(data_str: str) -> Dict[str, Any]:
     except json.JSONDecodeError:
         return {}
 
+def stringify_keys(data: Any) -> Any:
+    """
+    递归地将字典的键转换为字符串
+    
+    YAML中未加引号的键可能是整数、日期等（如响应码 200），与字符串键混在同一个字典里时
+    json.dumps(sort_keys=True) 无法排序；计算哈希、校验值前先统一转换为字符串。
+    
+    Args:
+        data: 数据
+    
+    Returns:
+        Any: 键均为字符串的数据（列表、字典为新对象，其他值原样返回）
+    """
+    if isinstance(data, dict):
+        return {key if isinstance(key, str) else str(key): stringify_keys(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [stringify_keys(item) for item in data]
+    return data
+
 # 列表操作
 def chunk_list(lst: List[Any], size: int) -> List[List[Any]]:
     """
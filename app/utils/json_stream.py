@@ -0,0 +1,181 @@
+import json
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+
+class JsonStreamReader:
+    """
+    增量JSON读取器（拉取式）
+    
+    按块读取文件，只在缓冲区中保留尚未消费的部分。对象和数组可以逐个成员遍历，
+    成员的值由调用方决定是完整读取（read_value）、继续逐个遍历还是跳过（skip_value），
+    因此处理超大文档时内存占用只与单个成员的大小有关。
+    
+    用法:
+        reader = JsonStreamReader(f)
+        for key in reader.iter_object():
+            if key == 'paths':
+                for path in reader.iter_object():
+                    path_item = reader.read_value()
+            else:
+                reader.skip_value()
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, fp: TextIO, chunk_size: Optional[int] = None):
+        """
+        初始化读取器
+        
+        Args:
+            fp: 以文本模式打开的文件对象
+            chunk_size: 每次读取的字符数
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        # 已丢弃的字符数，用于在错误信息中给出在整个文档中的位置
+        self._offset = 0
+        self._decoder = json.JSONDecoder()
+    
+    @property
+    def position(self) -> int:
+        """当前读取位置（字符偏移）"""
+        return self._offset + self._pos
+    
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """读取下一块内容，已到文件末尾时返回False"""
+        if self._eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos > self.chunk_size:
+            # 丢弃已消费的部分
+            self._offset += self._pos
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += chunk
+        return True
+    
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message}（位置 {self.position}）")
+    
+    def peek(self) -> str:
+        """跳过空白，返回下一个字符（不消费），已到末尾时返回空字符串"""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ''
+    
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"应为 '{char}'")
+        self._pos += 1
+    
+    def read_value(self) -> Any:
+        """
+        完整读取下一个值
+        
+        Returns:
+            Any: 解析后的值
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # 值跨越了缓冲区末尾，读取更多内容后重试；读取量倍增，避免超大值的重试次数过多
+                if not self._fill(size):
+                    raise self._error(f"JSON格式错误: {e.msg}") from None
+                size *= 2
+                continue
+            if (isinstance(value, (int, float)) and len(self._buffer) - end <= 2
+                    and self._buffer[end:].strip(_NUMBER_CHARS) == '' and self._fill(size)):
+                # 数字可能在缓冲区末尾被截断（如 12|34、1.5|e3），读取更多内容后重新解析
+                continue
+            self._pos = end
+            return value
+    
+    def skip_value(self):
+        """跳过下一个值；对象和数组逐个成员读取后丢弃，不构建完整的对象"""
+        char = self.peek()
+        if char == '{':
+            for _ in self.iter_object():
+                self.read_value()
+        elif char == '[':
+            for _ in self.iter_array():
+                self.read_value()
+        else:
+            self.read_value()
+        
+    def iter_object(self) -> Iterator[str]:
+        """
+        逐个遍历对象的键
+        
+        每产出一个键后，调用方必须消费对应的值（read_value、skip_value或继续遍历）。
+        
+        Yields:
+            str: 键
+        """
+        self._expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("应为对象的键")
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self._error("应为 ',' 或 '}'")
+    
+    def iter_array(self) -> Iterator[int]:
+        """
+        逐个遍历数组的元素
+        
+        每产出一个下标后，调用方必须消费对应的元素。
+        
+        Yields:
+            int: 元素下标
+        """
+        self._expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self._error("应为 ',' 或 ']'")
+    
+    def iter_values(self) -> Iterator[Any]:
+        """逐个读取数组中的元素"""
+        for _ in self.iter_array():
+            yield self.read_value()
+    
+    def iter_items(self) -> Iterator[Tuple[str, Any]]:
+        """逐个读取对象中的 (键, 值)"""
+        for key in self.iter_object():
+            yield key, self.read_value()
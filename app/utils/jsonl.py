@@ -0,0 +1,81 @@
+import json
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+def iter_jsonl(fp: TextIO) -> Iterator[Tuple[int, Any]]:
+    """
+    逐行读取JSON Lines，跳过空行
+    
+    Args:
+        fp: 以文本模式打开的文件对象
+    
+    Yields:
+        Tuple[int, Any]: (行号（从1开始）, 解析后的记录)
+    
+    Raises:
+        ValueError: 某一行不是有效的JSON，错误信息中包含行号
+    """
+    decoder = json.JSONDecoder()
+    for line_number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record, end = decoder.raw_decode(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"第 {line_number} 行不是有效的JSON: {e.msg}（第 {e.colno} 列）") from None
+        if end != len(line):
+            raise ValueError(f"第 {line_number} 行包含多个JSON值（第 {end + 1} 列）")
+        yield line_number, record
+
+def dumps_line(record: Any) -> str:
+    """将记录序列化为一行JSON（含换行符），保留中文字符"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+class JsonlWriter:
+    """
+    JSON Lines写入器，每次写入一条记录
+    
+    用法:
+        with JsonlWriter('results.jsonl') as writer:
+            for result in results:
+                writer.write(result)
+    """
+    
+    def __init__(self, file_path: str, append: bool = True, flush_every: Optional[int] = 1):
+        """
+        打开文件
+        
+        Args:
+            file_path: 文件路径
+            append: 是否追加到已有内容之后，否则覆盖
+            flush_every: 每写入多少条记录刷新一次缓冲区，为空时只在关闭时刷新
+        """
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.count = 0
+        self._fp = open(file_path, 'a' if append else 'w', encoding='utf-8')
+        if append and self._fp.tell() > 0 and not self._ends_with_newline(file_path):
+            # 上次写入的最后一行不完整（如进程中断），另起一行，避免与新记录连在一起
+            self._fp.write('\n')
+    
+    @staticmethod
+    def _ends_with_newline(file_path: str) -> bool:
+        with open(file_path, 'rb') as f:
+            f.seek(-1, 2)
+            return f.read(1) == b'\n'
+    
+    def write(self, record: Any):
+        """写入一条记录"""
+        self._fp.write(dumps_line(record))
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self._fp.flush()
+    
+    def close(self):
+        self._fp.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
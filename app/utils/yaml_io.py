@@ -0,0 +1,43 @@
+from typing import Any, Optional, TextIO, Union
+import yaml
+
+# 优先使用libyaml的C实现，未安装libyaml时回退到纯Python实现，两者的解析结果一致
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
+YAMLError = yaml.YAMLError
+
+def safe_load(stream: Union[str, bytes, TextIO]) -> Any:
+    """
+    安全加载YAML（等价于yaml.safe_load）
+    
+    Args:
+        stream: YAML字符串或文件对象
+    
+    Returns:
+        Any: 解析后的对象
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+def safe_dump(data: Any, stream: Optional[TextIO] = None, **kwargs) -> Optional[str]:
+    """
+    安全输出YAML（等价于yaml.safe_dump）
+    
+    默认保留中文字符、使用块格式并保持字典的键顺序。
+    
+    Args:
+        data: 要输出的对象
+        stream: 文件对象，为空时返回字符串
+        **kwargs: 传给yaml.dump的其他参数
+    
+    Returns:
+        Optional[str]: stream为空时返回YAML字符串
+    """
+    kwargs.setdefault('allow_unicode', True)
+    kwargs.setdefault('default_flow_style', False)
+    kwargs.setdefault('sort_keys', False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
@@ -0,0 +1,105 @@
+# 二进制记录文件的基准测试：对比JSON（indent=2）与 .pack / .pack.gz / .pack.zst 的大小、写入和加载耗时
+import os
+import sys
+import importlib.util
+import json
+import time
+import tempfile
+from typing import Any, Dict, List
+from app.utils.binary_records import MSGPACK_AVAILABLE, write_file, iter_file
+
+def sample_results(count: int) -> List[Dict[str, Any]]:
+    """生成与测试结果结构相同的样本数据"""
+    return [{
+        'test_case_id': f'test_get__api_users_{i}',
+        'test_case_name': f'查询用户 {i}',
+        'method': 'GET',
+        'url': f'http://localhost:8080/api/users/{i}?page=1&size=20',
+        'status_code': 200,
+        'expected_status': 200,
+        'success': i % 7 != 0,
+        'response_time': 0.01 + (i % 100) / 1000,
+        'response_headers': {'Content-Type': 'application/json', 'Content-Length': '180'},
+        'response_text': json.dumps({'id': i, 'name': f'用户{i}', 'email': f'user{i}@example.com', 'roles': ['admin', 'user']}, ensure_ascii=False),
+        'error': None if i % 7 else '状态码不匹配',
+        'timestamp': '2024-01-01T00:00:00'
+    } for i in range(count)]
+
+def sample_test_cases(count: int) -> List[Dict[str, Any]]:
+    """生成与测试用例结构相同的样本数据"""
+    return [{
+        'id': f'test_post__api_orders_{i}',
+        'name': f'创建订单 {i}',
+        'method': 'POST',
+        'path': '/api/orders',
+        'description': '创建一个新订单',
+        'params': {'trace': f'{i:08d}'},
+        'headers': {'Content-Type': 'application/json'},
+        'json': {'user_id': i, 'items': [{'sku': f'SKU-{i % 50}', 'quantity': 1 + i % 3}], 'remark': '加急'},
+        'data': None,
+        'expected_status': 201,
+        'tags': ['orders']
+    } for i in range(count)]
+
+def benchmark(case_count: int = 20000, result_count: int = 50000, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    对比JSON（indent=2，当前的保存格式）与二进制记录文件的大小、写入和加载耗时，并校验往返结果一致
+    
+    Args:
+        case_count: 测试用例数
+        result_count: 测试结果数
+        repeat: 加载的重复次数，取最短耗时
+    
+    Returns:
+        List[Dict[str, Any]]: 每项包含数据集、格式、文件大小（字节）、写入耗时和加载耗时（秒）
+    """
+    formats = ['json', 'pack', 'pack.gz']
+    if importlib.util.find_spec('zstandard'):
+        formats.append('pack.zst')
+    
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for dataset, data in (('test_cases', sample_test_cases(case_count)), ('results', sample_results(result_count))):
+            for extension in formats:
+                file_path = os.path.join(directory, f'{dataset}.{extension}')
+                start = time.perf_counter()
+                if extension == 'json':
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                else:
+                    write_file(file_path, data)
+                write_seconds = time.perf_counter() - start
+                
+                # 取多次加载的最短耗时，减少偶然因素（如垃圾回收）的影响
+                load_seconds = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    if extension == 'json':
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            loaded = json.load(f)
+                    else:
+                        loaded = [record for _, record in iter_file(file_path)]
+                    elapsed = time.perf_counter() - start
+                    load_seconds = elapsed if load_seconds is None else min(load_seconds, elapsed)
+                if loaded != data:
+                    raise ValueError(f'{dataset}.{extension} 往返结果与原数据不一致')
+                
+                rows.append({
+                    'dataset': dataset,
+                    'format': extension,
+                    'size': os.path.getsize(file_path),
+                    'write': write_seconds,
+                    'load': load_seconds
+                })
+    return rows
+
+if __name__ == '__main__':
+    # 用法（在项目根目录下）: python -m benchmarks.bench_binary_records [测试用例数] [测试结果数] [加载重复次数]
+    args = [int(arg) for arg in sys.argv[1:4]]
+    print(f"记录编码: {'msgpack' if MSGPACK_AVAILABLE else 'json'}")
+    baseline = {}
+    for row in benchmark(*args):
+        baseline.setdefault(row['dataset'], row)
+        base = baseline[row['dataset']]
+        print(f"{row['dataset']:<10} {row['format']:<9} {row['size'] / 1024 / 1024:7.2f}MB ({row['size'] / base['size']:5.1%})"
+              f"  写入 {row['write']:6.3f}s  加载 {row['load']:6.3f}s ({base['load'] / row['load']:4.1f}x)")
@@ -0,0 +1,91 @@
+# YAML加载和输出的基准测试：对比纯Python实现与libyaml实现
+import io
+import sys
+import time
+from typing import Any, Dict, List
+import yaml
+from app.utils.yaml_io import LIBYAML_AVAILABLE, SafeLoader, SafeDumper
+
+def sample_spec(path_count: int) -> Dict[str, Any]:
+    """生成基准测试用的OpenAPI文档"""
+    paths = {}
+    for i in range(path_count):
+        paths[f'/api/v1/resource{i}/{{id}}'] = {
+            'get': {
+                'summary': f'获取资源{i}',
+                'parameters': [
+                    {'name': 'id', 'in': 'path', 'required': True, 'type': 'integer'},
+                    {'name': 'fields', 'in': 'query', 'required': False, 'type': 'string'}
+                ],
+                'responses': {'200': {'description': '成功', 'schema': {'type': 'object', 'properties': {'id': {'type': 'integer'}, 'name': {'type': 'string'}}}}}
+            },
+            'post': {
+                'summary': f'更新资源{i}',
+                'parameters': [{'name': 'body', 'in': 'body', 'schema': {'type': 'object'}}],
+                'responses': {'201': {'description': '已创建'}}
+            }
+        }
+    return {'swagger': '2.0', 'info': {'title': '基准测试', 'version': '1.0.0'}, 'paths': paths}
+
+def sample_test_cases(case_count: int) -> List[Dict[str, Any]]:
+    """生成基准测试用的测试用例"""
+    return [{
+        'id': f'TC_{i:06d}',
+        'name': f'测试用例{i}',
+        'method': 'POST' if i % 2 else 'GET',
+        'path': f'/api/v1/resource{i % 500}',
+        'headers': {'Content-Type': 'application/json'},
+        'params': {'page': 1, 'size': 20},
+        'json': {'name': f'名称{i}', 'tags': ['a', 'b']},
+        'expected_status': 200
+    } for i in range(case_count)]
+
+def benchmark(path_count: int = 2000, case_count: int = 10000) -> List[Dict[str, Any]]:
+    """
+    对比纯Python实现与libyaml实现的加载和输出耗时
+    
+    Args:
+        path_count: 生成的文档路径数
+        case_count: 生成的测试用例数
+    
+    Returns:
+        List[Dict[str, Any]]: 每项包含数据集、操作、纯Python耗时、libyaml耗时（秒）
+    """
+    implementations = [('pure', yaml.SafeLoader, yaml.SafeDumper)]
+    if LIBYAML_AVAILABLE:
+        implementations.append(('libyaml', SafeLoader, SafeDumper))
+    
+    results = []
+    for dataset, data in (('spec', sample_spec(path_count)), ('test_cases', sample_test_cases(case_count))):
+        text = yaml.dump(data, Dumper=SafeDumper if LIBYAML_AVAILABLE else yaml.SafeDumper, allow_unicode=True, sort_keys=False)
+        timings = {'dump': {}, 'load': {}}
+        for name, loader, dumper in implementations:
+            start = time.perf_counter()
+            yaml.dump(data, io.StringIO(), Dumper=dumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            timings['dump'][name] = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            loaded = yaml.load(text, Loader=loader)
+            timings['load'][name] = time.perf_counter() - start
+            if loaded != data:
+                raise ValueError(f'{name} 解析结果与原数据不一致')
+        
+        for operation in ('load', 'dump'):
+            results.append({
+                'dataset': dataset,
+                'size': len(text.encode('utf-8')),
+                'operation': operation,
+                'pure': timings[operation]['pure'],
+                'libyaml': timings[operation].get('libyaml')
+            })
+    return results
+
+if __name__ == '__main__':
+    # 用法（在项目根目录下）: python -m benchmarks.bench_yaml_io [文档路径数] [测试用例数]
+    args = [int(arg) for arg in sys.argv[1:3]]
+    print(f"libyaml可用: {LIBYAML_AVAILABLE}")
+    for row in benchmark(*args):
+        line = f"{row['dataset']:<10} {row['size'] / 1024 / 1024:6.2f}MB {row['operation']:<4}  纯Python {row['pure']:7.3f}s"
+        if row['libyaml'] is not None:
+            line += f"  libyaml {row['libyaml']:7.3f}s  加速 {row['pure'] / row['libyaml']:5.1f}x"
+        print(line)
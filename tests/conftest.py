@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# 直接运行 pytest 时也能导入 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 测试日志不写入项目目录下的 api_automation.log
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), 'api_automation_test.log'))
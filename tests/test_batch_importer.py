@@ -0,0 +1,54 @@
+import json
+import threading
+import functools
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+import pytest
+from app.core.config import config
+from app.core.http_cache import http_cache
+from app.core.batch_importer import BatchImporter
+
+def _spec(path: str) -> dict:
+    return {'openapi': '3.0.0', 'info': {'title': path, 'version': '1'},
+            'paths': {path: {'get': {'summary': path}, 'post': {'summary': path}}}}
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    # 工作进程以spawn方式启动，配置取自环境变量
+    monkeypatch.setenv('DOC_CACHE_ENABLED', '0')
+    monkeypatch.setitem(config._config, 'DOC_CACHE_ENABLED', False)
+    monkeypatch.setattr(http_cache, 'directory', str(tmp_path / 'http_cache'))
+
+@pytest.fixture
+def server(tmp_path):
+    docs = tmp_path / 'served'
+    docs.mkdir()
+    for name in ('orders', 'users'):
+        (docs / f'{name}.json').write_text(json.dumps(_spec(f'/{name}')), encoding='utf-8')
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(docs))
+    handler.log_message = lambda *args: None
+    httpd = HTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_import_local_documents(tmp_path):
+    (tmp_path / 'users.json').write_text(json.dumps(_spec('/users')), encoding='utf-8')
+    (tmp_path / 'orders.yaml').write_text('openapi: 3.0.0\npaths:\n  /orders:\n    get:\n      responses:\n        200:\n          description: ok\n',
+                                          encoding='utf-8')
+    (tmp_path / 'broken.json').write_text('{', encoding='utf-8')
+    
+    result = BatchImporter.import_documents([str(tmp_path / name) for name in ('users.json', 'orders.yaml', 'broken.json')], processes=2)
+    
+    assert sorted(result.services()) == ['orders', 'users']
+    assert [error['service'] for error in result.errors] == ['broken']
+    assert len(result) == 3
+    assert {endpoint['service'] for endpoint in result.query(path='/users')} == {'users'}
+
+def test_import_remote_documents_only(server):
+    result = BatchImporter.import_documents({'users': f'{server}/users.json', 'orders': f'{server}/orders.json'}, processes=2)
+    
+    assert not result.errors
+    assert sorted((endpoint['service'], endpoint['method'], endpoint['path']) for endpoint in result) == [
+        ('orders', 'GET', '/orders'), ('orders', 'POST', '/orders'), ('users', 'GET', '/users'), ('users', 'POST', '/users')]
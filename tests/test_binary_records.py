@@ -0,0 +1,144 @@
+import io
+import json
+import struct
+import pytest
+from app.core.report_generator import ReportGenerator
+from app.core.test_case_manager import TestCaseManager
+from app.core.exceptions import ValidationError
+from app.utils import binary_records
+from app.utils.binary_records import CODEC_JSON, CODEC_MSGPACK, MAGIC, VERSION
+
+TEST_CASES = [{
+    'id': f'test_post__api_orders_{i}',
+    'name': f'创建订单 {i}',
+    'method': 'POST',
+    'path': '/api/orders',
+    'params': {'trace': f'{i:08d}'},
+    'headers': {'Content-Type': 'application/json'},
+    'json': {'user_id': i, 'items': [{'sku': f'SKU-{i % 5}', 'quantity': 1 + i % 3}], 'remark': '加急'},
+    'data': None,
+    'expected_status': 201,
+    'tags': ['orders']
+} for i in range(50)]
+
+RESULTS = [{
+    'test_case_id': f'test_get__api_users_{i}',
+    'test_case_name': f'查询用户 {i}',
+    'method': 'GET',
+    'url': f'http://localhost:8080/api/users/{i}',
+    'status_code': 200,
+    'expected_status': 200,
+    'success': i % 7 != 0,
+    'response_time': 0.01 + i / 1000,
+    'response_headers': {'Content-Type': 'application/json'},
+    'response_text': json.dumps({'id': i, 'name': f'用户{i}'}, ensure_ascii=False),
+    'error': None if i % 7 else '状态码不匹配',
+    'timestamp': '2024-01-01T00:00:00'
+} for i in range(30)]
+
+CODECS = [
+    CODEC_JSON,
+    pytest.param(CODEC_MSGPACK, marks=pytest.mark.skipif(not binary_records.MSGPACK_AVAILABLE, reason='未安装msgpack'))
+]
+
+def _pack(records, codec=CODEC_JSON) -> bytes:
+    """在内存中写出不压缩的记录"""
+    buffer = io.BytesIO()
+    binary_records.write_records(buffer, records, codec=codec)
+    return buffer.getvalue()
+
+def _read(data: bytes):
+    return [record for _, record in binary_records.iter_records(io.BytesIO(data))]
+
+@pytest.mark.parametrize('codec', CODECS)
+@pytest.mark.parametrize('extension', ['pack', 'pack.gz'])
+def test_file_round_trip(tmp_path, extension, codec):
+    file_path = str(tmp_path / f'cases.{extension}')
+    assert binary_records.write_file(file_path, TEST_CASES, codec=codec) == len(TEST_CASES)
+    records = list(binary_records.iter_file(file_path))
+    assert [number for number, _ in records] == list(range(1, len(TEST_CASES) + 1))
+    assert [record for _, record in records] == TEST_CASES
+
+def test_gzip_is_smaller_than_json(tmp_path):
+    file_path = str(tmp_path / 'results.pack.gz')
+    binary_records.write_file(file_path, RESULTS)
+    assert (tmp_path / 'results.pack.gz').stat().st_size < len(json.dumps(RESULTS, ensure_ascii=False, indent=2).encode('utf-8'))
+
+def test_empty_file_round_trip():
+    assert _read(_pack([])) == []
+
+def test_binary_compression_by_extension():
+    assert binary_records.binary_compression('a/cases.pack') == ''
+    assert binary_records.binary_compression('cases.PACK.GZ') == 'gzip'
+    assert binary_records.binary_compression('cases.pack.zst') == 'zstd'
+    assert binary_records.binary_compression('cases.json') is None
+    assert binary_records.binary_compression('cases.gz') is None
+
+def test_truncated_length_prefix():
+    data = _pack([{'a': 1}, {'b': 2}])
+    # 第2条记录的长度只剩2个字节
+    truncated = data[:len(_pack([{'a': 1}])) + 2]
+    with pytest.raises(ValueError, match='第 2 条记录不完整'):
+        _read(truncated)
+
+def test_truncated_payload():
+    data = _pack([{'a': 1}, {'b': 2}, {'c': 3}])
+    with pytest.raises(ValueError, match='第 3 条记录不完整'):
+        _read(data[:-1])
+
+def test_truncated_gzip(tmp_path):
+    file_path = tmp_path / 'cases.pack.gz'
+    binary_records.write_file(str(file_path), TEST_CASES)
+    file_path.write_bytes(file_path.read_bytes()[:-20])
+    with pytest.raises(ValueError, match='条记录'):
+        list(binary_records.iter_file(str(file_path)))
+
+def test_wrong_magic():
+    data = b'XXXX' + _pack([{'a': 1}])[4:]
+    with pytest.raises(ValueError, match='文件头不匹配'):
+        _read(data)
+
+def test_newer_version():
+    data = struct.pack('>4sBB', MAGIC, VERSION + 1, CODEC_JSON) + _pack([{'a': 1}])[6:]
+    with pytest.raises(ValueError, match='高于当前支持的版本'):
+        _read(data)
+
+def test_wrong_extension(tmp_path):
+    with pytest.raises(ValueError, match='扩展名'):
+        binary_records.write_file(str(tmp_path / 'cases.bin'), TEST_CASES)
+
+@pytest.mark.parametrize('extension', ['pack', 'pack.gz', 'json'])
+def test_test_case_manager_round_trip(tmp_path, extension):
+    file_path = str(tmp_path / f'cases.{extension}')
+    assert TestCaseManager.save_test_cases(TEST_CASES, file_path)
+    assert TestCaseManager.load_test_cases(file_path) == TEST_CASES
+    assert list(TestCaseManager.iter_test_cases(file_path)) == TEST_CASES
+
+def test_test_case_manager_saves_binary_by_extension(tmp_path):
+    file_path = tmp_path / 'cases.pack.gz'
+    assert TestCaseManager.save_test_cases(TEST_CASES, str(file_path))
+    # gzip魔数
+    assert file_path.read_bytes()[:2] == b'\x1f\x8b'
+
+def test_test_case_manager_rejects_invalid_record(tmp_path):
+    file_path = str(tmp_path / 'cases.pack')
+    binary_records.write_file(file_path, [TEST_CASES[0], ['不是用例']])
+    with pytest.raises(ValidationError, match='测试用例 2'):
+        TestCaseManager.load_test_cases(file_path)
+
+@pytest.mark.parametrize('extension', ['pack', 'pack.gz'])
+def test_binary_report_matches_json_report(tmp_path, extension):
+    file_path = str(tmp_path / f'report.{extension}')
+    assert ReportGenerator.write_binary_report(RESULTS, file_path) == len(RESULTS)
+    report = ReportGenerator.load_binary_report(file_path)
+    json_report = json.loads(ReportGenerator.generate_json_report(RESULTS))
+    report.pop('generated_at')
+    json_report.pop('generated_at')
+    assert report == json_report
+    assert list(ReportGenerator.iter_binary_results(file_path)) == RESULTS
+
+def test_load_binary_report_rejects_test_cases(tmp_path):
+    file_path = str(tmp_path / 'cases.pack')
+    binary_records.write_file(file_path, TEST_CASES)
+    with pytest.raises(ValidationError, match='不是二进制报告文件'):
+        ReportGenerator.load_binary_report(file_path)
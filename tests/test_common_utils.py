@@ -0,0 +1,40 @@
+import os
+import stat
+import pytest
+from app.utils.common_utils import atomic_write
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='权限位只在POSIX系统上生效')
+
+def _mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+def test_new_file_respects_umask(tmp_path):
+    old_umask = os.umask(0o077)
+    try:
+        with atomic_write(str(tmp_path / 'private.json')) as f:
+            f.write('{}')
+        with atomic_write(str(tmp_path / 'default.json')) as f:
+            f.write('{}')
+    finally:
+        os.umask(old_umask)
+    assert _mode(tmp_path / 'private.json') == 0o600
+    assert _mode(tmp_path / 'default.json') == 0o600
+
+def test_existing_file_keeps_its_mode(tmp_path):
+    path = tmp_path / 'cases.json'
+    path.write_text('[]')
+    os.chmod(path, 0o640)
+    with atomic_write(str(path)) as f:
+        f.write('[1]')
+    assert path.read_text() == '[1]'
+    assert _mode(path) == 0o640
+
+def test_failed_write_keeps_original(tmp_path):
+    path = tmp_path / 'cases.json'
+    path.write_text('[]')
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write('[1')
+            raise RuntimeError('中断')
+    assert path.read_text() == '[]'
+    assert os.listdir(tmp_path) == ['cases.json']
@@ -0,0 +1,41 @@
+import os
+import stat
+import datetime
+from app.core.doc_cache import DocCache
+
+ENTRY = {
+    'doc': {
+        'openapi': '3.0.0',
+        'info': {'title': '示例', 'x-released': datetime.date(2024, 1, 2)},
+        'paths': {'/users': {'get': {'responses': {200: {'description': 'ok'}, 'default': {'description': 'error'}}}}}
+    },
+    'endpoints': [{'method': 'GET', 'path': '/users', 'parameters': []}]
+}
+
+def test_entry_round_trips_through_disk(tmp_path):
+    DocCache(str(tmp_path)).put('key', ENTRY)
+    # 新实例没有进程内缓存，从磁盘读取
+    assert DocCache(str(tmp_path)).get('key') == ENTRY
+
+def test_entries_are_json_in_private_directory(tmp_path):
+    cache = DocCache(str(tmp_path / 'cache'))
+    cache.put('key', ENTRY)
+    entries_dir = tmp_path / 'cache' / 'entries'
+    assert os.listdir(entries_dir) == ['key.json']
+    assert (entries_dir / 'key.json').read_bytes().startswith(b'{')
+    if os.name == 'posix':
+        assert stat.S_IMODE(entries_dir.stat().st_mode) == 0o700
+        assert stat.S_IMODE((entries_dir / 'key.json').stat().st_mode) & 0o077 == 0
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    cache = DocCache(str(tmp_path))
+    cache.put('key', ENTRY)
+    (tmp_path / 'entries' / 'key.json').write_bytes(b'\x80\x04not json')
+    assert DocCache(str(tmp_path)).get('key') is None
+    assert not (tmp_path / 'entries' / 'key.json').exists()
+
+def test_returned_entry_is_a_copy(tmp_path):
+    cache = DocCache(str(tmp_path))
+    cache.put('key', ENTRY)
+    cache.get('key')['doc']['paths'].clear()
+    assert cache.get('key') == ENTRY
@@ -0,0 +1,100 @@
+import json
+import pytest
+from app.core.config import config
+from app.core.enhanced_doc_parser import EnhancedDocParser
+from app.core.test_case_generator import TestCaseGenerator
+
+# 响应码未加引号，YAML解析为整数，与字符串键default混在同一个字典里
+YAML_SPEC = '''openapi: 3.0.0
+info:
+  title: 示例
+  version: '1.0'
+paths:
+  /users:
+    get:
+      summary: 查询用户
+      responses:
+        200:
+          description: ok
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/User'
+        default:
+          description: error
+components:
+  schemas:
+    User:
+      type: object
+      properties:
+        id:
+          type: integer
+      x-codes:
+        404: 未找到
+        other: 其他
+'''
+
+@pytest.fixture(autouse=True)
+def no_doc_cache(monkeypatch):
+    monkeypatch.setitem(config._config, 'DOC_CACHE_ENABLED', False)
+
+def test_yaml_spec_with_integer_response_codes(tmp_path):
+    doc_path = tmp_path / 'spec.yaml'
+    doc_path.write_text(YAML_SPEC, encoding='utf-8')
+    
+    _, endpoints = EnhancedDocParser.load_doc(str(doc_path))
+    assert [(endpoint['method'], endpoint['path']) for endpoint in endpoints] == [('GET', '/users')]
+    assert endpoints[0]['fingerprint']
+    
+    catalog = EnhancedDocParser.load_catalog(str(doc_path))
+    assert catalog.fingerprint('GET', '/users') == endpoints[0]['fingerprint']
+    
+    test_cases = TestCaseGenerator.generate_test_cases(endpoints)
+    test_cases[0]['expected_response'] = {200: 'ok', 'default': 'error'}
+    assert TestCaseGenerator.content_checksum(test_cases[0])
+
+def _postman_request(name, method, path, query=()):
+    return {'name': name, 'request': {'method': method, 'url': {'path': path.split('/'), 'query': [{'key': key, 'value': ''} for key in query]}}}
+
+POSTMAN_DOC = {
+    'info': {'name': '示例'},
+    'schema': 'https://schema.getpostman.com/json/collection/v2.1.0/collection.json',
+    'item': [
+        _postman_request('查询用户（旧）', 'GET', 'users', ['page']),
+        {'name': 'orders', 'item': [_postman_request('查询订单', 'GET', 'list')]},
+        _postman_request('创建用户', 'POST', 'users'),
+        _postman_request('查询用户', 'GET', 'users', ['page', 'size'])
+    ]
+}
+
+RAP_DOC = {
+    'project': {'name': '示例'},
+    'modules': [
+        {'interfaces': [{'name': '查询用户（旧）', 'url': '/users', 'method': 'GET'},
+                        {'name': '查询订单', 'url': '/orders', 'method': 'GET'}]},
+        {'interfaces': [{'name': '查询用户', 'url': 'users', 'method': 'GET',
+                         'requestParameters': [{'name': 'page', 'type': 'query'}]}]}
+    ]
+}
+
+YAPI_DOC = {
+    'project': {'name': '示例'},
+    'api': [
+        {'title': '查询用户（旧）', 'path': '/users', 'method': 'GET'},
+        {'title': '查询订单', 'path': '/orders', 'method': 'GET'},
+        {'title': '查询用户', 'path': '/users', 'method': 'GET', 'req_params': [{'name': 'page'}]}
+    ]
+}
+
+@pytest.mark.parametrize('doc', [POSTMAN_DOC, RAP_DOC, YAPI_DOC], ids=['postman', 'rap', 'yapi'])
+def test_stream_endpoints_matches_load_doc(tmp_path, doc):
+    doc_path = tmp_path / 'doc.json'
+    doc_path.write_text(json.dumps(doc, ensure_ascii=False), encoding='utf-8')
+    
+    _, endpoints = EnhancedDocParser.load_doc(str(doc_path))
+    streamed = list(EnhancedDocParser.stream_endpoints(str(doc_path)))
+    
+    assert streamed == endpoints
+    # 同一方法和路径出现多次时以最后一个为准
+    users = [endpoint for endpoint in streamed if endpoint['method'] == 'GET' and endpoint['path'] == '/users']
+    assert [endpoint['summary'] for endpoint in users] == ['查询用户']
@@ -0,0 +1,79 @@
+import os
+import json
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import pytest
+from app.core.config import config
+from app.core.http_cache import HttpCache
+from app.core import enhanced_doc_parser
+
+SPEC = json.dumps({'openapi': '3.0.0', 'paths': {'/users': {'get': {'summary': '查询用户'}}}}).encode('utf-8')
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        if self.path.startswith('/no-store'):
+            self.send_header('Cache-Control', 'no-store')
+        self.send_header('Content-Length', str(len(SPEC)))
+        self.end_headers()
+        self.wfile.write(SPEC)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    httpd = HTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def temp_bodies():
+    """系统临时目录中未缓存的响应体文件"""
+    def list_bodies():
+        return {name for name in os.listdir(tempfile.gettempdir()) if name.startswith('api_automation_http_')}
+    before = list_bodies()
+    return lambda: list_bodies() - before
+
+def test_enabled_cache_revalidates(tmp_path, base_url):
+    cache = HttpCache(str(tmp_path / 'cache'))
+    first = cache.fetch(f'{base_url}/spec.json')
+    assert first['status'] == 200 and not first['temporary']
+    second = cache.fetch(f'{base_url}/spec.json')
+    assert second['status'] == 304 and second['from_cache']
+    assert cache.get_text(f'{base_url}/spec.json') == SPEC.decode('utf-8')
+
+def test_disabled_cache_writes_nothing(tmp_path, base_url, monkeypatch, temp_bodies):
+    monkeypatch.setitem(config._config, 'HTTP_CACHE_ENABLED', False)
+    cache = HttpCache(str(tmp_path / 'cache'))
+    assert cache.get_text(f'{base_url}/spec.json') == SPEC.decode('utf-8')
+    with cache.open(f'{base_url}/spec.json') as f:
+        assert f.read() == SPEC.decode('utf-8')
+    assert not (tmp_path / 'cache').exists()
+    assert not temp_bodies()
+
+def test_no_store_response_is_not_cached(tmp_path, base_url, temp_bodies):
+    cache = HttpCache(str(tmp_path / 'cache'))
+    result = cache.fetch(f'{base_url}/no-store.json')
+    assert result['temporary']
+    cache.discard(result)
+    assert not (tmp_path / 'cache').exists()
+    assert not temp_bodies()
+
+def test_stream_endpoints_removes_uncached_body(tmp_path, base_url, monkeypatch, temp_bodies):
+    monkeypatch.setitem(config._config, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(enhanced_doc_parser, 'http_cache', HttpCache(str(tmp_path / 'cache')))
+    endpoints = list(enhanced_doc_parser.EnhancedDocParser.stream_endpoints(f'{base_url}/spec.json'))
+    assert [(endpoint['method'], endpoint['path']) for endpoint in endpoints] == [('GET', '/users')]
+    assert not (tmp_path / 'cache').exists()
+    assert not temp_bodies()
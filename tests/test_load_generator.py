@@ -0,0 +1,55 @@
+import socket
+import logging
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import pytest
+from app.core.load_generator import LoadGenerator
+
+TEST_CASE = {'id': 'test_get__ok', 'name': '查询', 'method': 'GET', 'path': '/ok', 'expected_status': 200}
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    httpd = HTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def test_service_time_only_counts_responses(base_url):
+    summary = LoadGenerator(base_url, target_rps=50, duration=0.2, seed=1).run([TEST_CASE])
+    assert summary['completed'] == summary['scheduled'] == 10
+    assert summary['errors'] == summary['no_response'] == 0
+    assert summary['service_time']['count'] == 10
+    assert summary['service_time']['min'] > 0
+
+def test_failed_requests_are_counted_separately():
+    summary = LoadGenerator(f'http://127.0.0.1:{_closed_port()}', target_rps=50, duration=0.2).run([TEST_CASE])
+    assert summary['errors'] == summary['no_response'] == 10
+    assert summary['error_rate'] == 100
+    assert summary['service_time']['count'] == 0
+    assert summary['latency']['count'] == 10
+
+def test_requests_are_not_logged_at_info(base_url, caplog):
+    with caplog.at_level(logging.INFO):
+        LoadGenerator(base_url, target_rps=50, duration=0.1).run([TEST_CASE])
+    messages = [record.getMessage() for record in caplog.records if record.levelno >= logging.INFO]
+    assert not [message for message in messages if '测试用例执行' in message or '开始执行测试用例' in message]
+    assert any(message.startswith('压测完成') for message in messages)
@@ -0,0 +1,36 @@
+from app.core.ref_resolver import RefResolver
+
+DOCUMENT = {
+    'components': {
+        'schemas': {
+            'A': {'type': 'object', 'properties': {'b': {'$ref': '#/components/schemas/B'}}},
+            'B': {'type': 'object', 'properties': {'a': {'$ref': '#/components/schemas/A'},
+                                                   'leaf': {'$ref': '#/components/schemas/Leaf'}}},
+            'Leaf': {'type': 'object', 'properties': {'name': {'type': 'string'}}}
+        }
+    }
+}
+
+def _resolve(resolver: RefResolver, name: str):
+    return resolver.resolve_schema({'$ref': f'#/components/schemas/{name}'})
+
+def test_mutual_cycle_does_not_depend_on_resolution_order():
+    fresh = _resolve(RefResolver(DOCUMENT, max_depth=1), 'B')
+    resolver = RefResolver(DOCUMENT, max_depth=1)
+    _resolve(resolver, 'A')
+    assert _resolve(resolver, 'B') == fresh
+    # B -> A -> B 在第二次遇到B时截断
+    assert fresh['properties']['a']['properties']['b']['x-circular-ref'] == '#/components/schemas/B'
+
+def test_max_depth_applies_inside_other_schemas():
+    resolver = RefResolver(DOCUMENT, max_depth=1)
+    _resolve(resolver, 'B')
+    a = _resolve(resolver, 'A')
+    # A -> B -> A 在第二次遇到A时截断，不复用从B开始展开的结果
+    assert a['properties']['b']['properties']['a']['x-circular-ref'] == '#/components/schemas/A'
+
+def test_acyclic_schema_is_shared():
+    resolver = RefResolver(DOCUMENT, max_depth=1)
+    a = _resolve(resolver, 'A')
+    leaf = _resolve(resolver, 'Leaf')
+    assert a['properties']['b']['properties']['leaf'] is leaf
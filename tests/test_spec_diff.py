@@ -0,0 +1,63 @@
+import copy
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.spec_diff import SpecDiff
+from app.core.test_case_generator import TestCaseGenerator
+
+SPEC = {
+    'openapi': '3.0.0',
+    'paths': {
+        '/users': {
+            'get': {'summary': '查询用户', 'parameters': [{'name': 'page', 'in': 'query'}]},
+            'post': {'summary': '创建用户'}
+        },
+        '/orders': {'get': {'summary': '查询订单'}}
+    }
+}
+
+def _generate(spec):
+    """同一文档导入两次（如批量导入的两个服务），每个接口对应两个用例"""
+    endpoints = list(EndpointCatalog(spec))
+    return TestCaseGenerator.generate_test_cases(endpoints + endpoints)
+
+def _changed_spec():
+    spec = copy.deepcopy(SPEC)
+    spec['paths']['/users']['get']['parameters'].append({'name': 'size', 'in': 'query'})
+    del spec['paths']['/orders']
+    return spec
+
+def test_two_unedited_cases_on_one_operation():
+    test_cases = _generate(SPEC)
+    assert [test_case['id'] for test_case in test_cases if test_case['path'] == '/users' and test_case['method'] == 'GET'] == \
+        ['test_get__users', 'test_get__users_2']
+    
+    updated, report = SpecDiff.update_test_cases(test_cases, EndpointCatalog(_changed_spec()))
+    
+    users = [test_case for test_case in updated if test_case['source']['operation'] == 'GET /users']
+    assert [test_case['id'] for test_case in users] == ['test_get__users', 'test_get__users_2']
+    for test_case in users:
+        assert test_case['params'] == {'page': '', 'size': ''}
+        assert not SpecDiff.is_edited(test_case)
+    assert sorted(report['regenerated']) == ['test_get__users', 'test_get__users_2']
+    # 删除的接口的两个用例都被删除
+    assert not [test_case for test_case in updated if test_case['path'] == '/orders']
+    assert len(updated) == 4
+    assert report['renamed'] == []
+
+def test_edited_case_kept_while_sibling_is_regenerated():
+    test_cases = _generate(SPEC)
+    edited = next(test_case for test_case in test_cases if test_case['id'] == 'test_get__users')
+    edited['params']['page'] = '1'
+    orders = next(test_case for test_case in test_cases if test_case['id'] == 'test_get__orders_2')
+    orders['expected_status'] = 404
+    
+    updated, report = SpecDiff.update_test_cases(test_cases, EndpointCatalog(_changed_spec()))
+    by_id = {test_case['id']: test_case for test_case in updated}
+    
+    assert by_id['test_get__users']['params'] == {'page': '1'}
+    assert by_id['test_get__users']['source']['stale']
+    assert by_id['test_get__users_2']['params'] == {'page': '', 'size': ''}
+    assert report['conflicts'] == ['test_get__users']
+    assert report['regenerated'] == ['test_get__users_2']
+    assert report['orphaned'] == ['test_get__orders_2']
+    assert 'test_get__orders' not in by_id
+    assert len(updated) == 5
@@ -0,0 +1,39 @@
+from app.core.endpoint_catalog import EndpointCatalog
+from app.core.test_case_generator import TestCaseGenerator
+
+def _body(name: str) -> dict:
+    return {'content': {'application/json': {'schema': {'$ref': f'#/components/schemas/{name}'}}}}
+
+DOCUMENT = {
+    'openapi': '3.0.0',
+    'paths': {
+        '/a': {'post': {'requestBody': _body('A')}},
+        '/b': {'post': {'requestBody': _body('B')}}
+    },
+    'components': {
+        'schemas': {
+            'A': {'type': 'object', 'properties': {'b': {'$ref': '#/components/schemas/B'}, 'name': {'type': 'string'}}},
+            'B': {'type': 'object', 'properties': {'a': {'$ref': '#/components/schemas/A'},
+                                                   'leaf': {'$ref': '#/components/schemas/Leaf'}}},
+            'Leaf': {'type': 'object', 'properties': {'id': {'type': 'integer'}}}
+        }
+    }
+}
+
+def _bodies(paths):
+    endpoints = [endpoint for path in paths for endpoint in EndpointCatalog(DOCUMENT).query(path=path)]
+    return [test_case['json'] for test_case in TestCaseGenerator.generate_test_cases(endpoints)]
+
+def test_truncated_example_is_not_reused_on_other_paths():
+    # 单独生成时：B -> A -> B（截断）
+    expected_b = _bodies(['/b'])[0]
+    assert expected_b == {'a': {'b': {}, 'name': ''}, 'leaf': {'id': 0}}
+    # 先生成A时，A -> B -> A（截断）中的B不能交给之后完整展开的B
+    body_a, body_b = _bodies(['/a', '/b'])
+    assert body_a == {'b': {'a': {}, 'leaf': {'id': 0}}, 'name': ''}
+    assert body_b == expected_b
+
+def test_examples_are_copies():
+    body_a, body_b = _bodies(['/a', '/b'])
+    body_a['b']['leaf']['id'] = 1
+    assert body_b['leaf'] == {'id': 0}
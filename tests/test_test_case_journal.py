@@ -0,0 +1,57 @@
+import threading
+import pytest
+from app.core.exceptions import ValidationError
+from app.core import test_case_journal
+from app.core.test_case_manager import TestCaseManager
+
+def _test_case(i: int):
+    return {'id': f'test_get__items_{i}', 'name': f'用例 {i}', 'method': 'GET', 'path': f'/items/{i}', 'expected_status': 200}
+
+def test_concurrent_edits_are_not_lost(tmp_path):
+    file_path = str(tmp_path / 'cases.json')
+    assert TestCaseManager.save_test_cases([], file_path)
+    threads = 4
+    per_thread = 50
+    
+    def edit(start: int):
+        # 压缩阈值很小，追加与压缩频繁交错
+        journal = test_case_journal.TestCaseJournal(file_path, compact_ops=7)
+        for i in range(start, start + per_thread):
+            journal.add(_test_case(i))
+    
+    workers = [threading.Thread(target=edit, args=(n * per_thread,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    ids = {test_case['id'] for test_case in TestCaseManager.load_test_cases(file_path)}
+    assert ids == {_test_case(i)['id'] for i in range(threads * per_thread)}
+
+def test_journal_replayed_on_load(tmp_path):
+    file_path = str(tmp_path / 'cases.jsonl')
+    assert TestCaseManager.save_test_cases([_test_case(1), _test_case(2)], file_path)
+    journal = test_case_journal.TestCaseJournal(file_path)
+    journal.update('test_get__items_1', dict(_test_case(1), name='修改'))
+    journal.delete('test_get__items_2')
+    assert TestCaseManager.load_test_cases(file_path) == [dict(_test_case(1), name='修改')]
+
+def test_update_and_delete_missing_id(tmp_path):
+    file_path = str(tmp_path / 'cases.json')
+    assert TestCaseManager.save_test_cases([_test_case(1)], file_path)
+    journal = test_case_journal.TestCaseJournal(file_path)
+    assert not journal.update('test_get__missing', _test_case(2))
+    assert not journal.delete('test_get__missing')
+    assert journal.pending() == 0
+    assert journal.update('test_get__items_1', _test_case(2))
+    # 改名后原id不再存在
+    assert not journal.delete('test_get__items_1')
+    assert journal.delete('test_get__items_2')
+    assert TestCaseManager.load_test_cases(file_path) == []
+
+def test_update_rejects_duplicate_id(tmp_path):
+    file_path = str(tmp_path / 'cases.json')
+    assert TestCaseManager.save_test_cases([_test_case(1), _test_case(2)], file_path)
+    journal = test_case_journal.TestCaseJournal(file_path)
+    with pytest.raises(ValidationError, match='已存在'):
+        journal.update('test_get__items_1', _test_case(2))
@@ -0,0 +1,47 @@
+import pytest
+from app.core import test_case_store
+from app.core.exceptions import ValidationError
+from app.core.test_case_manager import TestCaseManager
+
+def _test_case(i: int, **fields):
+    test_case = {'name': f'用例 {i}', 'id': f'test_get__items_{i}', 'method': 'GET', 'path': f'/items/{i}',
+                 'expected_status': 200, 'tags': ['items']}
+    test_case.update(fields)
+    return test_case
+
+def test_round_trip_keeps_order_and_field_order(tmp_path):
+    file_path = str(tmp_path / 'cases.db')
+    test_cases = [_test_case(i) for i in (3, 1, 2)]
+    assert TestCaseManager.save_test_cases(test_cases, file_path)
+    loaded = TestCaseManager.load_test_cases(file_path)
+    assert loaded == test_cases
+    assert [list(test_case) for test_case in loaded] == [list(test_case) for test_case in test_cases]
+
+def test_resave_writes_only_changed_cases(tmp_path):
+    with test_case_store.TestCaseStore(str(tmp_path / 'cases.db')) as store:
+        store.import_test_cases([_test_case(i) for i in range(5)])
+        report = store.import_test_cases([_test_case(i, name='修改' if i == 2 else f'用例 {i}') for i in range(4)], replace=True)
+        assert report == {'written': 1, 'deleted': 1, 'total': 4}
+        assert store.get('test_get__items_2')['name'] == '修改'
+        assert store.ids() == [f'test_get__items_{i}' for i in range(4)]
+
+def test_import_rejects_duplicate_ids(tmp_path):
+    file_path = str(tmp_path / 'cases.db')
+    assert TestCaseManager.save_test_cases([_test_case(1)], file_path)
+    with test_case_store.TestCaseStore(file_path) as store:
+        with pytest.raises(ValidationError, match='重复'):
+            store.import_test_cases([_test_case(2), _test_case(2, name='重复')], replace=True)
+        # 整个导入回滚
+        assert store.ids() == ['test_get__items_1']
+    assert not TestCaseManager.save_test_cases([_test_case(2), _test_case(2)], file_path)
+
+def test_update_delete_and_tags(tmp_path):
+    with test_case_store.TestCaseStore(str(tmp_path / 'cases.db')) as store:
+        store.import_test_cases([_test_case(1), _test_case(2)])
+        assert store.update('test_get__items_1', _test_case(3, tags=['renamed']))
+        assert not store.update('test_get__missing', _test_case(4))
+        assert [test_case['id'] for test_case in store.query(tag='renamed')] == ['test_get__items_3']
+        assert [test_case['id'] for test_case in store.query(tag='items')] == ['test_get__items_2']
+        assert store.delete('test_get__items_2')
+        assert not store.delete('test_get__items_2')
+        assert store.ids() == ['test_get__items_3']